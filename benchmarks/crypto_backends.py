@@ -0,0 +1,48 @@
+"""Microbenchmark for the crypto backends in plasma_core.utils.crypto.
+
+Usage:
+    python benchmarks/crypto_backends.py [iterations]
+"""
+
+import os
+import sys
+import timeit
+from plasma_core.constants import ACCOUNTS
+from plasma_core.utils.crypto import BACKENDS
+
+
+def benchmark(backend, iterations):
+    key = ACCOUNTS[0]['key']
+    message = os.urandom(32)
+    sig = backend.sign(message, key)
+    return {
+        'sign': timeit.timeit(lambda: backend.sign(message, key), number=iterations),
+        'recover': timeit.timeit(lambda: backend.recover(message, sig), number=iterations),
+        'sha3': timeit.timeit(lambda: backend.sha3(message), number=iterations * 10),
+    }
+
+
+def main(iterations):
+    results = {}
+    for name, backend_class in BACKENDS.items():
+        try:
+            results[name] = benchmark(backend_class(), iterations)
+        except ImportError as e:
+            print('skipping {0}: {1}'.format(name, e))
+
+    print('{0:<10} {1:>12} {2:>12} {3:>12}'.format('backend', 'sign/s', 'recover/s', 'sha3/s'))
+    for name, timings in results.items():
+        print('{0:<10} {1:>12.0f} {2:>12.0f} {3:>12.0f}'.format(
+            name,
+            iterations / timings['sign'],
+            iterations / timings['recover'],
+            iterations * 10 / timings['sha3']))
+
+    if 'native' in results and 'ethereum' in results:
+        for operation in ['sign', 'recover', 'sha3']:
+            speedup = results['ethereum'][operation] / results['native'][operation]
+            print('native {0} speedup: {1:.1f}x'.format(operation, speedup))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
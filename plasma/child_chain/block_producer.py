@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from plasma_core.block import Block
+
+
+logger = logging.getLogger(__name__)
+
+
+class BlockProducer(object):
+    """Seals, signs and submits the current block of a child chain.
+
+    A block is cut as soon as it holds `max_block_transactions` of the child
+    chain, which is at most 2^16, or once `max_delay` milliseconds have
+    passed since its first transaction was added. Smaller blocks and shorter
+    delays mean lower latency, bigger blocks mean fewer root chain
+    submissions. A background thread retries blocks whose submission
+    failed and applies the time trigger.
+
+    Args:
+        child_chain (ChildChain): Child chain to produce blocks for.
+        key (bytes): Operator key to sign blocks with.
+        max_delay (int): Milliseconds a transaction may wait for its block, or None to only cut full blocks.
+        clock (function): Returns the current time in seconds.
+    """
+
+    def __init__(self, child_chain, key, max_delay=None, clock=time.time):
+        if max_delay is not None and max_delay <= 0:
+            raise ValueError('max_delay should be positive')
+        self.child_chain = child_chain
+        self.key = key
+        self.max_delay = max_delay
+        self.clock = clock
+        self.pending_block = None
+        self.first_pending = None
+        self.producing = False
+        self.running = False
+        self.thread = None
+
+    def notify(self):
+        """Called after transactions are added to the current block.
+
+        The transactions are already in the block, so a failed submission
+        is logged rather than raised and the block is retried on the next poll.
+        """
+
+        # Blocks refilled while producing are handled by the loop in `produce`.
+        if self.producing:
+            return
+        self._track_pending()
+        if self._is_full():
+            try:
+                self.produce()
+            except Exception:
+                logger.exception('Failed to submit block %d, retrying', self.child_chain.current_block.number)
+
+    def poll(self):
+        """Produces a block if it is full or the oldest pending transaction has waited long enough.
+
+        Returns:
+            bool: Whether a block was produced.
+        """
+
+        self._track_pending()
+        if self._is_full():
+            self.produce()
+            return True
+        if self.max_delay is None or self.first_pending is None:
+            return False
+        if (self.clock() - self.first_pending) * 1000 < self.max_delay:
+            return False
+        self.produce()
+        return True
+
+    def produce(self):
+        """Signs and submits the current block, if it holds any transactions."""
+
+        self.producing = True
+        try:
+            while self.child_chain.current_block.transaction_set:
+                # A copy is signed, so the current block stays open if the submission fails.
+                current_block = self.child_chain.current_block
+                block = Block(list(current_block.transaction_set), number=current_block.number)
+                block.sign(self.key)
+                self.child_chain.submit_block(block)
+
+                # Submitting drains the mempool into the next block, which may already be full.
+                if not self._is_full():
+                    break
+        finally:
+            self.producing = False
+        self._track_pending()
+
+    def start(self):
+        """Starts a background thread that retries failed blocks and applies the time trigger."""
+
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        interval = min(max(self.max_delay / 4000, 0.001), 0.1) if self.max_delay is not None else 0.1
+        while self.running:
+            # A failed submission is retried on the next poll.
+            try:
+                self.child_chain.writer.call(self.poll)
+            except Exception:
+                logger.exception('Failed to submit block %d, retrying', self.child_chain.current_block.number)
+            time.sleep(interval)
+
+    def _is_full(self):
+        return len(self.child_chain.current_block.transaction_set) >= self.child_chain.max_block_transactions
+
+    def _track_pending(self):
+        # Blocks can also be submitted from outside, so the wait is tied to a block number.
+        block = self.child_chain.current_block
+        if not block.transaction_set:
+            self.first_pending = None
+        elif block.number != self.pending_block or self.first_pending is None:
+            self.first_pending = self.clock()
+        self.pending_block = block.number
@@ -1,26 +1,108 @@
-from plasma_core.block import Block
+from plasma_core.block import Block, MAX_TRANSACTIONS
 from plasma_core.chain import Chain
-from plasma_core.utils.transactions import get_deposit_tx, encode_utxo_id
+from plasma_core.constants import NULL_SIGNATURE, MAX_BLOCK_SPAN, MAX_BLOCK_FILTER_SPAN
+from plasma_core.exceptions import (InvalidTxSignatureException,
+                                    TxAlreadySpentException,
+                                    TxAmountMismatchException)
+from .exceptions import InternalErrorException, MempoolFullException
+from plasma_core.utils.transactions import get_deposit_tx, decode_utxo_id, encode_utxo_id
+from .block_producer import BlockProducer
+from .mempool import Mempool
 from .root_event_listener import RootEventListener
+from .writer import Writer
+
+
+class ChildChainState(object):
+    """Read-only view of the child chain, published after every change.
+
+    The current block only ever grows until it is submitted, so the view
+    keeps a reference to its transaction list and how much of it belongs to
+    this version instead of copying it. Blocks are numbered in order, so
+    the stored blocks that belong to this version are the ones numbered
+    below `next_deposit_block`.
+    """
+
+    def __init__(self, version, current_block_number, next_deposit_block, transaction_set, transaction_count):
+        self.version = version
+        self.current_block_number = current_block_number
+        self.next_deposit_block = next_deposit_block
+        self.transaction_set = transaction_set
+        self.transaction_count = transaction_count
+
+    def get_current_block(self):
+        return Block(list(self.transaction_set[:self.transaction_count]), number=self.current_block_number)
+
+    def get_transactions_since(self, index):
+        return list(self.transaction_set[index:self.transaction_count])
 
 
 class ChildChain(object):
 
-    def __init__(self, operator, root_chain):
+    def __init__(self, operator, root_chain, block_store=None, snapshot_store=None, exit_journal=None, mempool=None,
+                 operator_key=None, max_block_transactions=MAX_TRANSACTIONS, max_block_delay=None,
+                 root_chain_submitter=None, validation_workers=1, validation_batch_size=256):
         self.operator = operator
         self.root_chain = root_chain
-        self.chain = Chain(self.operator)
+        self.root_chain_submitter = root_chain_submitter
+        self.chain = Chain(self.operator, validation_workers=validation_workers, validation_batch_size=validation_batch_size,
+                           block_store=block_store, snapshot_store=snapshot_store, exit_journal=exit_journal,
+                           on_block=self._on_block)
+        self.mempool = mempool or Mempool()
         self.current_block = Block(number=self.chain.next_child_block)
 
+        if not 0 < max_block_transactions <= MAX_TRANSACTIONS:
+            raise ValueError('max_block_transactions should be between 1 and {0}'.format(MAX_TRANSACTIONS))
+        self.max_block_transactions = max_block_transactions
+
+        # Roots that were not mined before a restart are sent again.
+        if root_chain_submitter is not None:
+            root_chain_submitter.recover(lambda blknum: self.chain.get_block(blknum).root,
+                                         self.chain.next_child_block, self.chain.child_block_interval)
+
+        # Handlers of changes to the chain, by event name.
+        self.subscribers = {'Block': [], 'Deposit': [], 'Exit': []}
+
+        # All changes run on the writer thread, readers use the latest published state.
+        self.state = None
+        self._publish_state()
+        self.writer = Writer(self._publish_state)
+
+        # Blocks are only produced automatically if we hold the operator key.
+        self.block_producer = None
+        if operator_key is not None:
+            self.block_producer = BlockProducer(self, operator_key, max_block_delay)
+            self.block_producer.start()
+
         # Listen for events
         self.event_listener = RootEventListener(root_chain, confirmations=0)
         self.event_listener.on('Deposit', self.apply_deposit)
         self.event_listener.on('ExitStarted', self.apply_exit)
 
+    def on(self, event_name, event_handler):
+        """Registers a handler for changes applied to the chain.
+
+        Handlers run on the writer thread right after the change, so they
+        should hand work off rather than block. `Block` handlers are passed
+        every submitted block, `Deposit` handlers every applied deposit block
+        and `Exit` handlers the utxo id and `(owner, currency, amount)` of
+        every exited output.
+
+        Args:
+            event_name (str): One of `Block`, `Deposit` or `Exit`.
+            event_handler (function): A function to call when the change is applied.
+        """
+
+        self.subscribers[event_name].append(event_handler)
+
     def apply_exit(self, event):
         event_args = event['args']
         utxo_id = event_args['utxoPos']
-        self.chain.mark_utxo_spent(utxo_id)
+        self.writer.call(self._apply_exit, utxo_id)
+
+    def _apply_exit(self, utxo_id):
+        utxo = self.chain.apply_exit(utxo_id)
+        if utxo is not None:
+            self._broadcast('Exit', utxo_id, utxo)
 
     def apply_deposit(self, event):
         event_args = event['args']
@@ -30,25 +112,216 @@ class ChildChain(object):
 
         deposit_tx = get_deposit_tx(owner, amount)
         deposit_block = Block([deposit_tx], number=blknum)
+        self.writer.call(self._apply_deposit, deposit_block)
+
+    def _apply_deposit(self, deposit_block):
         self.chain.add_block(deposit_block)
 
     def apply_transaction(self, tx):
-        self.chain.validate_transaction(tx, self.current_block.spent_utxos)
+        """Validates a transaction and queues it for the current block.
+
+        Returns:
+            int: The utxo id of the transaction's first output, or None if
+                the current block is full and the transaction is waiting in
+                the mempool.
+        """
+
+        # Recover signers on the calling thread to keep the writer free, validation reports bad signatures.
+        try:
+            if tx.blknum1 != 0 and tx.sig1 != NULL_SIGNATURE:
+                tx.sender1
+            if tx.blknum2 != 0 and tx.sig2 != NULL_SIGNATURE:
+                tx.sender2
+        except Exception:
+            pass
+
+        return self.writer.call(self._apply_transaction, tx)
+
+    def apply_transactions(self, transactions):
+        """Validates many transactions and queues them in order.
+
+        Signers of the whole batch are recovered together, then the batch is
+        applied in a single step of the writer, so transactions in it see the
+        inputs spent by the ones before them.
+
+        Returns:
+            list: For every transaction, the utxo id of its first output, None
+                if it is waiting in the mempool, or the exception that rejected it.
+                Unexpected failures are reported as an InternalErrorException.
+        """
+
+        self.chain.recover_signers(transactions)
+        return self.writer.call(self._apply_transactions, transactions)
+
+    def _apply_transactions(self, transactions):
+        results = []
+        for tx in transactions:
+            try:
+                results.append(self._apply_transaction(tx))
+            except (InvalidTxSignatureException, TxAlreadySpentException, TxAmountMismatchException, MempoolFullException) as e:
+                results.append(e)
+            except Exception as e:
+                # Transactions before it are already applied, so the batch carries on.
+                error = InternalErrorException('failed to apply tx')
+                error.__cause__ = e
+                results.append(error)
+        return results
+
+    def _apply_transaction(self, tx):
+        fee = self.chain.validate_transaction(tx, self.current_block.spent_utxos)
+
+        # The mempool only fills up once the current block is full.
+        if len(self.current_block.transaction_set) >= self.max_block_transactions:
+            self.mempool.add(tx, fee)
+            return None
+
         self.current_block.add_transaction(tx)
-        return encode_utxo_id(self.current_block.number, len(self.current_block.transaction_set) - 1, 0)
+        utxo_id = encode_utxo_id(self.current_block.number, len(self.current_block.transaction_set) - 1, 0)
+        if self.block_producer is not None:
+            self.block_producer.notify()
+        return utxo_id
+
+    def build_block(self):
+        """Moves pending transactions into the current block, highest fee first, until it is full."""
+
+        while len(self.mempool) and len(self.current_block.transaction_set) < self.max_block_transactions:
+            room = self.max_block_transactions - len(self.current_block.transaction_set)
+            for tx in self.mempool.pop(room):
+                # The chain may have moved on since the transaction was queued.
+                try:
+                    self.chain.validate_transaction(tx, self.current_block.spent_utxos)
+                except (InvalidTxSignatureException, TxAlreadySpentException, TxAmountMismatchException):
+                    continue
+                self.current_block.add_transaction(tx)
 
     def submit_block(self, block):
+        self.writer.call(self._submit_block, block)
+
+    def _submit_block(self, block):
         self.chain.add_block(block)
-        self.root_chain.transact({
-            'from': self.operator
-        }).submitBlock(block.merkle.root)
+        if self.root_chain_submitter is not None:
+            self.root_chain_submitter.submit(block.number, block.root)
+        else:
+            self.root_chain.transact({
+                'from': self.operator
+            }).submitBlock(block.root)
         self.current_block = Block(number=self.chain.next_child_block)
+        self.build_block()
+        # The mempool may have filled the new block.
+        if self.block_producer is not None:
+            self.block_producer.notify()
 
     def get_transaction(self, tx_id):
+        self._check_published(decode_utxo_id(tx_id)[0])
         return self.chain.get_transaction(tx_id)
 
+    def get_encoded_transaction(self, tx_id):
+        self._check_published(decode_utxo_id(tx_id)[0])
+        return self.chain.get_encoded_transaction(tx_id)
+
     def get_block(self, blknum):
+        self._check_published(blknum)
         return self.chain.get_block(blknum)
 
+    def get_block_numbers(self, start, end, max_span=MAX_BLOCK_SPAN):
+        """Yields the numbers of the submitted and deposit blocks in `[start, end)`.
+
+        Raises:
+            ValueError: The range is reversed, negative or spans more than `max_span` block numbers.
+        """
+
+        if not 0 <= start <= end:
+            raise ValueError('block range should satisfy 0 <= start <= end')
+        if end - start > max_span:
+            raise ValueError('block range spans at most {0} block numbers'.format(max_span))
+        return self.chain.get_block_numbers(start, min(end, self.state.next_deposit_block))
+
+    def get_blocks(self, start, end):
+        for blknum in self.get_block_numbers(start, end):
+            yield self.chain.get_block(blknum)
+
+    def get_block_filters(self, start, end):
+        """Returns the number and the owner Bloom filter bits of the submitted and deposit blocks in `[start, end)`."""
+
+        return [(blknum, self.chain.get_owner_filter(blknum)) for blknum in self.get_block_numbers(start, end, MAX_BLOCK_FILTER_SPAN)]
+
     def get_current_block(self):
-        return self.current_block
+        return self.state.get_current_block()
+
+    def get_current_block_num(self):
+        return self.state.current_block_number
+
+    def get_current_block_since(self, index, blknum=None):
+        """Returns what was added to the current block after its first `index` transactions.
+
+        Args:
+            index (int): Number of transactions the caller already has.
+            blknum (int): Number of the block the caller's transactions belong to.
+
+        Returns:
+            (int, int, list): The current block number, the index of the first
+                returned transaction and the transactions. If the current block
+                is no longer `blknum`, every transaction is returned.
+        """
+
+        if index < 0:
+            raise ValueError('index should not be negative')
+        state = self.state
+        if blknum is not None and blknum != state.current_block_number:
+            index = 0
+        return (state.current_block_number, index, state.get_transactions_since(index))
+
+    def get_submission_status(self, blknum):
+        if self.root_chain_submitter is None:
+            return None
+        return self.root_chain_submitter.get_status(blknum)
+
+    def get_submission_error(self):
+        """Returns why root submissions stopped, or None if they are running."""
+
+        if self.root_chain_submitter is None:
+            return None
+        return self.root_chain_submitter.error
+
+    def resume_submissions(self):
+        """Sends the root that stopped submissions again, followed by the ones queued after it."""
+
+        if self.root_chain_submitter is not None:
+            self.root_chain_submitter.resume()
+
+    def get_utxos(self, owner):
+        # The owner index is copy-on-write and every block swaps an owner's entry in at once, so it needs no lock.
+        return self.chain.get_utxos(owner)
+
+    def get_balance(self, owner, currency):
+        return self.chain.get_balance(owner, currency)
+
+    def close(self):
+        """Stops producing blocks and applying changes, and shuts down the chain's workers."""
+
+        if self.block_producer is not None:
+            self.block_producer.stop()
+        self.writer.stop()
+        self.chain.close()
+
+    def _check_published(self, blknum):
+        # A block the writer is still adding is only visible once its change is published.
+        if blknum >= self.state.next_deposit_block:
+            raise KeyError(blknum)
+
+    def _on_block(self, block):
+        # Deposits that waited for their parent are added along with it, so blocks are broadcast as the chain adds them.
+        if block.number % self.chain.child_block_interval == 0:
+            self._broadcast('Block', block)
+        else:
+            self._broadcast('Deposit', block)
+
+    def _broadcast(self, event_name, *args):
+        for subscriber in self.subscribers[event_name]:
+            subscriber(*args)
+
+    def _publish_state(self):
+        version = self.state.version + 1 if self.state is not None else 0
+        transaction_set = self.current_block.transaction_set
+        self.state = ChildChainState(version, self.current_block.number, self.chain.next_deposit_block,
+                                     transaction_set, len(transaction_set))
@@ -0,0 +1,6 @@
+class MempoolFullException(Exception):
+    """the mempool is full and the transaction does not pay enough to replace pending ones"""
+
+
+class InternalErrorException(Exception):
+    """the child chain failed to apply the transaction for a reason unrelated to the transaction"""
@@ -0,0 +1,142 @@
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from plasma_core.exceptions import TxAlreadySpentException
+from plasma_core.utils.transactions import encode_utxo_id
+from .exceptions import MempoolFullException
+
+
+class Mempool(object):
+    """Pending transactions waiting to be put into a block.
+
+    Transactions are indexed by the inputs they spend, so a transaction that
+    spends an input already spent by a pending transaction is rejected,
+    unless it pays a higher fee, in which case it replaces the pending ones.
+    Blocks are filled highest fee first. Transactions are dropped once they
+    are older than `max_age`, and the lowest paying ones are evicted when
+    the pool grows past `max_size` bytes.
+
+    Args:
+        max_size (int): Maximum total size of pending transactions, in bytes.
+        max_age (float): Seconds a transaction may stay pending.
+    """
+
+    def __init__(self, max_size=64 * 1024 * 1024, max_age=3600):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.size = 0
+        self.entries = OrderedDict()
+        self.spends = {}
+        self.queue = []
+        self.lowest = []
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, tx):
+        return tx.merkle_hash in self.entries
+
+    def add(self, tx, fee, now=None):
+        """Adds a validated transaction.
+
+        Args:
+            tx (Transaction): Transaction to add.
+            fee (int): Amount of the inputs not claimed by the outputs.
+            now (float): Current time, defaults to `time.time()`.
+        """
+
+        now = time.time() if now is None else now
+        self.expire(now)
+
+        key = tx.merkle_hash
+        inputs = self._get_inputs(tx)
+        conflicts = set(self.spends[i] for i in inputs if i in self.spends)
+        if key in self.entries or (conflicts and fee <= max(self.entries[c]['fee'] for c in conflicts)):
+            raise TxAlreadySpentException('failed to validate tx')
+
+        size = len(tx.encoded) + len(tx.sig1) + len(tx.sig2)
+
+        # Replaced transactions make room first, then the lowest paying ones are evicted.
+        free = self.max_size - self.size + sum(self.entries[c]['size'] for c in conflicts)
+        (popped, evicted) = ([], [])
+        while free < size:
+            lowest = self._pop_lowest()
+            if lowest is not None:
+                popped.append(lowest)
+            if lowest is None or lowest['fee'] >= fee:
+                # Nothing is evicted unless the transaction fits.
+                for entry in popped:
+                    heapq.heappush(self.lowest, (entry['fee'], entry['seq'], entry['tx'].merkle_hash))
+                raise MempoolFullException('failed to add tx')
+            if lowest['tx'].merkle_hash not in conflicts:
+                evicted.append(lowest['tx'].merkle_hash)
+                free += lowest['size']
+
+        for removed_key in list(conflicts) + evicted:
+            self._remove(removed_key)
+
+        seq = next(self.counter)
+        self.entries[key] = {'tx': tx, 'fee': fee, 'added': now, 'size': size, 'seq': seq}
+        for i in inputs:
+            self.spends[i] = key
+        self.size += size
+        heapq.heappush(self.queue, (-fee, seq, key))
+        heapq.heappush(self.lowest, (fee, seq, key))
+        self._compact()
+
+    def pop(self, count, now=None):
+        """Removes and returns up to `count` transactions, highest fee first."""
+
+        now = time.time() if now is None else now
+        self.expire(now)
+
+        transactions = []
+        while self.queue and len(transactions) < count:
+            (_, seq, key) = heapq.heappop(self.queue)
+            entry = self.entries.get(key)
+            # Entries that were removed or replaced are skipped lazily.
+            if entry is None or entry['seq'] != seq:
+                continue
+            self._remove(key)
+            transactions.append(entry['tx'])
+        return transactions
+
+    def expire(self, now):
+        # Entries are kept in insertion order, so the oldest ones are always first.
+        while self.entries:
+            (key, entry) = next(iter(self.entries.items()))
+            if now - entry['added'] <= self.max_age:
+                break
+            self._remove(key)
+
+    def _pop_lowest(self):
+        # Like the queue, the eviction heap drops entries that were removed or replaced lazily.
+        while self.lowest:
+            (_, seq, key) = heapq.heappop(self.lowest)
+            entry = self.entries.get(key)
+            if entry is not None and entry['seq'] == seq:
+                return entry
+        return None
+
+    def _compact(self):
+        # Rebuilds the heaps once they are mostly made of removed entries.
+        if len(self.queue) + len(self.lowest) <= 4 * len(self.entries) + 64:
+            return
+        self.queue = [(-e['fee'], e['seq'], k) for (k, e) in self.entries.items()]
+        self.lowest = [(e['fee'], e['seq'], k) for (k, e) in self.entries.items()]
+        heapq.heapify(self.queue)
+        heapq.heapify(self.lowest)
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        for i in self._get_inputs(entry['tx']):
+            if self.spends.get(i) == key:
+                del self.spends[i]
+        self.size -= entry['size']
+
+    @staticmethod
+    def _get_inputs(tx):
+        inputs = [(tx.blknum1, tx.txindex1, tx.oindex1), (tx.blknum2, tx.txindex2, tx.oindex2)]
+        return [encode_utxo_id(*i) for i in inputs if i[0] != 0]
@@ -0,0 +1,218 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+QUEUED = 'queued'
+SENT = 'sent'
+CONFIRMED = 'confirmed'
+FAILED = 'failed'
+
+
+class RootChainSubmitter(object):
+    """Submits block roots to the root chain from a background thread.
+
+    Roots are queued in block order and sent with locally tracked operator
+    nonces, so up to `max_in_flight` roots can wait for inclusion at the same
+    time while the root chain still receives them in order. A root that has
+    not been mined after `stall_timeout` seconds is sent again with the same
+    nonce and a gas price raised by `gas_price_bump` percent.
+
+    The root chain numbers blocks in the order their roots are mined, so
+    if a root fails, or its nonce gets used by another transaction, nothing
+    more is sent until `resume` is called. The roots already in flight can't
+    be recalled, see `error` for what went wrong.
+
+    Args:
+        root_chain (Contract): A Web3 Contract representing the root chain.
+        operator (str): Address of the operator.
+        w3 (Web3): A Web3 object, defaults to the one of `root_chain`.
+        gas (int): Gas limit of a submission.
+        gas_price (int): Initial gas price, defaults to the node's gas price.
+        gas_price_bump (int): Percent to raise the gas price by on every resubmission.
+        stall_timeout (float): Seconds to wait for a submission to be mined before resubmitting.
+        max_in_flight (int): Maximum number of unconfirmed submissions.
+        poll_interval (float): Seconds between checks for receipts.
+        clock (function): Returns the current time in seconds.
+    """
+
+    def __init__(self, root_chain, operator, w3=None, gas=100000, gas_price=None, gas_price_bump=20,
+                 stall_timeout=60, max_in_flight=16, poll_interval=1, clock=time.time):
+        self.root_chain = root_chain
+        self.operator = operator
+        self.w3 = w3 or root_chain.web3
+        self.gas = gas
+        self.gas_price = gas_price
+        self.gas_price_bump = gas_price_bump
+        self.stall_timeout = stall_timeout
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self.clock = clock
+
+        self.nonce = None
+        self.queue = OrderedDict()
+        self.in_flight = OrderedDict()
+        self.statuses = {}
+        self.failed = None
+        self.error = None
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.running = False
+        self.thread = None
+
+    def submit(self, blknum, root):
+        """Queues a block root for submission."""
+
+        with self.lock:
+            self.queue[blknum] = root
+            self.statuses[blknum] = QUEUED
+        self.wakeup.set()
+
+    def get_status(self, blknum):
+        """Returns the submission status of a block, or None if it was never queued."""
+
+        return self.statuses.get(blknum)
+
+    def resume(self):
+        """Requeues the root that stopped the pipeline ahead of the others and starts sending again."""
+
+        with self.lock:
+            if self.error is None:
+                return
+            if self.failed is not None:
+                (blknum, root) = self.failed
+                self.queue[blknum] = root
+                self.queue.move_to_end(blknum, last=False)
+                self.statuses[blknum] = QUEUED
+            # Nothing is sent while stopped, so the nonce is reset before sending is allowed again.
+            self.nonce = None
+            (self.failed, self.error) = (None, None)
+        self.wakeup.set()
+
+    def recover(self, get_root, next_child_block, child_block_interval=1000):
+        """Queues the roots of stored child blocks the root chain has not numbered yet.
+
+        Queued and unconfirmed roots only live in memory, so after a restart
+        every child block from the root chain's `currentChildBlock` up to
+        `next_child_block` is submitted again.
+
+        Args:
+            get_root (function): Returns the root of a stored child block by number.
+            next_child_block (int): Number of the child chain's next child block.
+            child_block_interval (int): Distance between child block numbers.
+        """
+
+        blknum = self.root_chain.functions.currentChildBlock().call()
+        while blknum < next_child_block:
+            self.submit(blknum, get_root(blknum))
+            blknum += child_block_interval
+
+    def step(self):
+        """Checks submissions in flight, then sends queued roots while there is room."""
+
+        for (blknum, submission) in list(self.in_flight.items()):
+            self._check(blknum, submission)
+
+        while self.error is None and self.queue and len(self.in_flight) < self.max_in_flight:
+            with self.lock:
+                (blknum, root) = next(iter(self.queue.items()))
+            if self.nonce is None:
+                self.nonce = self.w3.eth.getTransactionCount(self.operator, 'pending')
+            submission = {
+                'root': root,
+                'nonce': self.nonce,
+                'gas_price': self.gas_price or self.w3.eth.gasPrice,
+                'tx_hashes': [],
+                'sent_at': None
+            }
+            if not self._send(submission) and not self._resync_nonce(submission):
+                break
+            with self.lock:
+                del self.queue[blknum]
+                self.statuses[blknum] = SENT
+            self.in_flight[blknum] = submission
+            self.nonce += 1
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        while self.running:
+            try:
+                self.step()
+            except Exception:
+                # Lost contact with the node, everything in flight is checked again on the next step.
+                pass
+            self.wakeup.wait(self.poll_interval)
+            self.wakeup.clear()
+
+    def _send(self, submission):
+        try:
+            tx_hash = self.root_chain.functions.submitBlock(submission['root']).transact({
+                'from': self.operator,
+                'nonce': submission['nonce'],
+                'gas': self.gas,
+                'gasPrice': submission['gas_price']
+            })
+        except Exception:
+            # The node is unreachable or rejected the transaction, try again on the next step.
+            return False
+        submission['tx_hashes'].append(tx_hash)
+        submission['sent_at'] = self.clock()
+        return True
+
+    def _resync_nonce(self, submission):
+        # The node may know of operator transactions we didn't send, retry once with its nonce.
+        nonce = self.w3.eth.getTransactionCount(self.operator, 'pending')
+        if nonce <= self.nonce:
+            return False
+        self.nonce = nonce
+        submission['nonce'] = nonce
+        return self._send(submission)
+
+    def _check(self, blknum, submission):
+        if self._check_receipts(blknum, submission):
+            return
+
+        if self.clock() - submission['sent_at'] >= self.stall_timeout:
+            gas_price = submission['gas_price']
+            submission['gas_price'] = gas_price + gas_price * self.gas_price_bump // 100
+            if self._send(submission):
+                return
+            submission['gas_price'] = gas_price
+
+            # Once the nonce is mined without any of our transactions, they never will be.
+            mined_nonce = self.w3.eth.getTransactionCount(self.operator, 'latest')
+            if mined_nonce > submission['nonce'] and not self._check_receipts(blknum, submission):
+                del self.in_flight[blknum]
+                self._fail(blknum, submission, 'nonce of block {0} was used by another transaction'.format(blknum))
+
+    def _check_receipts(self, blknum, submission):
+        # Any of the transactions sent with this nonce may be the one that was mined.
+        for tx_hash in submission['tx_hashes']:
+            receipt = self.w3.eth.getTransactionReceipt(tx_hash)
+            if receipt is not None:
+                del self.in_flight[blknum]
+                if receipt['status'] == 1:
+                    self.statuses[blknum] = CONFIRMED
+                else:
+                    self._fail(blknum, submission, 'submission of block {0} failed'.format(blknum))
+                return True
+        return False
+
+    def _fail(self, blknum, submission, error):
+        self.statuses[blknum] = FAILED
+        if self.failed is None:
+            self.failed = (blknum, submission['root'])
+            self.error = error
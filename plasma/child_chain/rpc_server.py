@@ -0,0 +1,183 @@
+import asyncio
+import gzip
+import types
+from concurrent.futures import ThreadPoolExecutor
+from aiohttp import web
+from jsonrpc import JSONRPCResponseManager
+from plasma_core.constants import RLP_CONTENT_TYPE, RLP_PATH
+
+
+class ImmutableBody(object):
+    """Binary response body that never changes.
+
+    It is served with a strong ETag, so clients can revalidate it with
+    If-None-Match, and its gzip encoding is only computed once.
+
+    Args:
+        data (bytes): The body.
+        etag (str): Quoted strong entity tag of the body.
+    """
+
+    def __init__(self, data, etag):
+        self.data = bytes(data)
+        self.etag = etag
+        self._gzipped = None
+
+    @property
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.data)
+        return self._gzipped
+
+
+def create_app(dispatcher, rlp_handlers={}, max_concurrency=64, workers=8, max_request_size=128 * 1024 * 1024):
+    """Creates an asyncio JSON-RPC 2.0 application.
+
+    Handlers run on a thread pool, so signature recovery, Merkle building
+    and waiting on the child chain never block the event loop. Single
+    requests and batch arrays are both accepted. At most `max_concurrency`
+    requests are handled at once and the rest wait their turn.
+
+    Binary endpoints are served under `/rlp/`. Their handlers are called with
+    the URL parameters, including the query string, and the raw request
+    body. They respond with raw RLP if they return bytes or an
+    ImmutableBody, a chunked stream of concatenated RLP items if they return
+    a generator, JSON for anything else, or no content for None.
+
+    Args:
+        dispatcher (Dispatcher): Handlers by method name.
+        rlp_handlers (dict): Binary handlers by `(HTTP method, path)`, paths are relative to `/rlp/`.
+        max_concurrency (int): Maximum number of requests handled at once.
+        workers (int): Number of threads to run handlers on.
+        max_request_size (int): Maximum size of a request body, in bytes.
+
+    Returns:
+        Application: An aiohttp application.
+    """
+
+    app = web.Application(client_max_size=max_request_size)
+    app['dispatcher'] = dispatcher
+    app['max_concurrency'] = max_concurrency
+    app['executor'] = ThreadPoolExecutor(max_workers=workers)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+
+    # Clients probe this path to find out whether binary endpoints are available.
+    app.router.add_get(RLP_PATH, handle_rlp_probe)
+    for ((method, path), handler) in rlp_handlers.items():
+        app.router.add_route(method, RLP_PATH + path, create_rlp_handler(handler))
+    app.router.add_post('/{path:.*}', handle_rpc)
+    return app
+
+
+async def on_startup(app):
+    # Created here so the semaphore belongs to the running loop.
+    app['semaphore'] = asyncio.Semaphore(app['max_concurrency'])
+
+
+async def on_cleanup(app):
+    app['executor'].shutdown(wait=False)
+
+
+async def run_in_executor(request, func, *args):
+    app = request.app
+    async with app['semaphore']:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(app['executor'], func, *args)
+
+
+async def handle_rpc(request):
+    body = await request.text()
+    response = await run_in_executor(request, JSONRPCResponseManager.handle, body, request.app['dispatcher'])
+
+    # Requests made up of notifications only get no response.
+    if response is None:
+        return web.Response(status=204)
+    return web.Response(text=response.json, content_type='application/json')
+
+
+async def handle_rlp_probe(request):
+    return web.Response(text=RLP_CONTENT_TYPE)
+
+
+def create_rlp_handler(handler):
+    async def handle(request):
+        body = await request.read()
+        try:
+            params = dict(request.query)
+            params.update(request.match_info)
+            result = await run_in_executor(request, handler, params, body)
+        except (KeyError, IndexError):
+            raise web.HTTPNotFound()
+        except Exception as e:
+            return web.json_response({'error': type(e).__name__, 'message': str(e)}, status=400)
+
+        if result is None:
+            return web.Response(status=204)
+        if isinstance(result, ImmutableBody):
+            return create_immutable_response(request, result)
+        if isinstance(result, types.GeneratorType):
+            return await stream_response(request, result)
+        if isinstance(result, (bytes, bytearray, memoryview)):
+            return web.Response(body=bytes(result), content_type=RLP_CONTENT_TYPE)
+        return web.json_response(result)
+    return handle
+
+
+def create_immutable_response(request, body):
+    headers = {
+        'ETag': body.etag,
+        'Cache-Control': 'public, max-age=31536000, immutable',
+        'Vary': 'Accept-Encoding'
+    }
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        etags = [etag.strip() for etag in if_none_match.split(',')]
+        if '*' in etags or body.etag in etags:
+            return web.Response(status=304, headers=headers)
+
+    accept_encoding = request.headers.get('Accept-Encoding', '')
+    if accepts_encoding(accept_encoding, 'gzip'):
+        headers['Content-Encoding'] = 'gzip'
+        return web.Response(body=body.gzipped, content_type=RLP_CONTENT_TYPE, headers=headers)
+
+    response = web.Response(body=body.data, content_type=RLP_CONTENT_TYPE, headers=headers)
+    if accepts_encoding(accept_encoding, 'deflate'):
+        response.enable_compression(web.ContentCoding.deflate)
+    return response
+
+
+def accepts_encoding(accept_encoding, coding):
+    """Returns whether an Accept-Encoding header allows a content coding, honouring q-values like `gzip;q=0`."""
+
+    qualities = {}
+    for item in accept_encoding.split(','):
+        (name, *params) = [part.strip() for part in item.split(';')]
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            (key, _, value) = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    return qualities.get(coding, qualities.get('*', 0.0)) > 0
+
+
+async def stream_response(request, items):
+    response = web.StreamResponse(headers={'Content-Type': RLP_CONTENT_TYPE})
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+
+    # Items may come from disk, so they are produced on the executor as well.
+    while True:
+        item = await run_in_executor(request, next, items, None)
+        if item is None:
+            break
+        await response.write(bytes(item))
+    await response.write_eof()
+    return response
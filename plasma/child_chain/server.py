@@ -1,32 +1,138 @@
+import atexit
+import functools
+import os
 import rlp
-from werkzeug.wrappers import Request, Response
-from werkzeug.serving import run_simple
-from jsonrpc import JSONRPCResponseManager, dispatcher
+from aiohttp import web
+from jsonrpc import Dispatcher
+from jsonrpc.exceptions import JSONRPCDispatchException, JSONRPCInvalidParams
 from ethereum import utils
 from plasma.child_chain.child_chain import ChildChain
+from plasma.child_chain.root_chain_submitter import RootChainSubmitter
+from plasma.child_chain.rpc_server import create_app, ImmutableBody
+from plasma.child_chain.subscriptions import Subscriptions
 from plasma.root_chain.deployer import Deployer
 from plasma_core.constants import CONTRACT_ADDRESS, AUTHORITY
-from plasma_core.block import Block
+from rlp.sedes import CountableList
+from plasma_core.block import Block, MAX_TRANSACTIONS
+from plasma_core.block_store import BlockStore
+from plasma_core.exit_journal import ExitJournal
+from plasma_core.snapshot import SnapshotStore
 from plasma_core.transaction import Transaction
 from plasma_core.utils.transactions import encode_utxo_id
+from plasma_core.utils.address import address_to_hex
 
 root_chain = Deployer().get_contract_at_address("RootChain", CONTRACT_ADDRESS, concise=False)
-child_chain = ChildChain(AUTHORITY['address'], root_chain)
+data_dir = os.environ.get('PLASMA_DATA_DIR', 'child_chain_data')
+block_store = BlockStore(os.path.join(data_dir, 'blocks'))
+snapshot_store = SnapshotStore(os.path.join(data_dir, 'snapshots'))
+exit_journal = ExitJournal(os.path.join(data_dir, 'exits.log'))
+atexit.register(block_store.close)
+atexit.register(exit_journal.close)
 
+# Blocks are cut automatically once either trigger is configured.
+max_block_transactions = int(os.environ.get('PLASMA_BLOCK_SIZE', MAX_TRANSACTIONS))
+max_block_delay = int(os.environ['PLASMA_BLOCK_DELAY']) if 'PLASMA_BLOCK_DELAY' in os.environ else None
+produce_blocks = 'PLASMA_BLOCK_SIZE' in os.environ or max_block_delay is not None
 
-@Request.application
-def application(request):
-    # Dispatcher is dictionary {<method_name>: callable}
-    dispatcher["submit_block"] = lambda block: child_chain.submit_block(rlp.decode(utils.decode_hex(block), Block))
-    dispatcher["apply_transaction"] = lambda transaction: child_chain.apply_transaction(rlp.decode(utils.decode_hex(transaction), Transaction))
-    dispatcher["get_transaction"] = lambda blknum, txindex: rlp.encode(child_chain.get_transaction(encode_utxo_id(blknum, txindex, 0)), Transaction).hex()
-    dispatcher["get_current_block"] = lambda: rlp.encode(child_chain.get_current_block(), Block).hex()
-    dispatcher["get_current_block_num"] = lambda: child_chain.get_current_block_num()
-    dispatcher["get_block"] = lambda blknum: rlp.encode(child_chain.get_block(blknum), Block).hex()
-    response = JSONRPCResponseManager.handle(
-        request.data, dispatcher)
-    return Response(response.json, mimetype='application/json')
+# Signers of large blocks and batches are recovered on this many processes.
+validation_workers = int(os.environ.get('PLASMA_VALIDATION_WORKERS', 1))
+validation_batch_size = int(os.environ.get('PLASMA_VALIDATION_BATCH_SIZE', 256))
+
+# Block roots are sent to the root chain in the background.
+root_chain_submitter = RootChainSubmitter(root_chain, AUTHORITY['address'])
+root_chain_submitter.start()
+child_chain = ChildChain(AUTHORITY['address'], root_chain, block_store=block_store, snapshot_store=snapshot_store, exit_journal=exit_journal,
+                         operator_key=AUTHORITY['key'] if produce_blocks else None,
+                         max_block_transactions=max_block_transactions, max_block_delay=max_block_delay,
+                         root_chain_submitter=root_chain_submitter,
+                         validation_workers=validation_workers, validation_batch_size=validation_batch_size)
+# Registered last, so it runs before the stores it writes to are closed.
+atexit.register(child_chain.close)
+
+
+# Submitted blocks never change, so their encodings are kept around.
+@functools.lru_cache(maxsize=int(os.environ.get('PLASMA_ENCODED_BLOCK_CACHE_SIZE', 256)))
+def get_encoded_block(blknum):
+    block = child_chain.get_block(blknum)
+    return ImmutableBody(block.signed_encoded, '"{0}"'.format(block.hash.hex()))
+
+
+def invalid_params(func):
+    # Arguments the child chain rejects are reported as invalid params rather than a server error.
+    @functools.wraps(func)
+    def wrapper(*args):
+        try:
+            return func(*args)
+        except ValueError as e:
+            raise JSONRPCDispatchException(code=JSONRPCInvalidParams.CODE, message=str(e))
+    return wrapper
+
+
+def get_range(params):
+    # Missing bounds are a bad request, not a missing resource.
+    if 'from' not in params or 'to' not in params:
+        raise ValueError('from and to are required')
+    return (int(params['from']), int(params['to']))
+
+
+def get_current_block_since(index, blknum):
+    (number, start, transactions) = child_chain.get_current_block_since(index, blknum)
+    return {
+        'number': number,
+        'start': start,
+        'transactions': [rlp.encode(tx, Transaction).hex() for tx in transactions]
+    }
+
+
+def apply_transactions(transactions):
+    return [{'error': type(result).__name__} if isinstance(result, Exception) else {'utxo_id': result}
+            for result in child_chain.apply_transactions(transactions)]
+
+
+# Handlers are registered once, the dispatcher is a dictionary {<method_name>: callable}.
+dispatcher = Dispatcher()
+dispatcher["submit_block"] = lambda block: child_chain.submit_block(rlp.decode(utils.decode_hex(block), Block))
+dispatcher["apply_transaction"] = lambda transaction: child_chain.apply_transaction(rlp.decode(utils.decode_hex(transaction), Transaction))
+dispatcher["apply_transactions"] = lambda transactions: apply_transactions([rlp.decode(utils.decode_hex(tx), Transaction) for tx in transactions])
+dispatcher["get_transaction"] = lambda blknum, txindex: child_chain.get_encoded_transaction(encode_utxo_id(blknum, txindex, 0)).hex()
+dispatcher["get_current_block"] = lambda: rlp.encode(child_chain.get_current_block(), Block).hex()
+dispatcher["get_current_block_num"] = lambda: child_chain.get_current_block_num()
+dispatcher["get_current_block_since"] = invalid_params(lambda index, blknum=None: get_current_block_since(index, blknum))
+dispatcher["get_blocks"] = invalid_params(lambda start, end: [get_encoded_block(blknum).data.hex() for blknum in child_chain.get_block_numbers(start, end)])
+dispatcher["get_block_filters"] = invalid_params(lambda start, end: [{'number': blknum, 'filter': block_filter.hex()}
+                                                                     for (blknum, block_filter) in child_chain.get_block_filters(start, end)])
+dispatcher["get_submission_status"] = lambda blknum: child_chain.get_submission_status(blknum)
+dispatcher["get_submission_error"] = lambda: child_chain.get_submission_error()
+dispatcher["resume_submissions"] = lambda: child_chain.resume_submissions()
+dispatcher["get_block"] = lambda blknum: get_encoded_block(blknum).data.hex()
+dispatcher["get_utxos"] = lambda address: [{
+    'utxo_id': utxo_id,
+    'currency': address_to_hex(currency),
+    'amount': amount
+} for (utxo_id, currency, amount) in child_chain.get_utxos(utils.normalize_address(address))]
+dispatcher["get_balance"] = lambda address, currency: child_chain.get_balance(utils.normalize_address(address), utils.normalize_address(currency))
+
+# Binary endpoints exchange raw RLP instead of hex strings inside JSON.
+rlp_handlers = {
+    ('GET', 'block/{blknum}'): lambda params, body: get_encoded_block(int(params['blknum'])),
+    ('GET', 'current_block'): lambda params, body: rlp.encode(child_chain.get_current_block(), Block),
+    ('GET', 'blocks'): lambda params, body: (get_encoded_block(blknum).data for blknum in child_chain.get_block_numbers(*get_range(params))),
+    ('GET', 'block_filters'): lambda params, body: rlp.encode(child_chain.get_block_filters(*get_range(params))),
+    ('GET', 'transaction/{blknum}/{txindex}'): lambda params, body: child_chain.get_encoded_transaction(
+        encode_utxo_id(int(params['blknum']), int(params['txindex']), 0)),
+    ('POST', 'block'): lambda params, body: child_chain.submit_block(rlp.decode(body, Block)),
+    ('POST', 'transactions'): lambda params, body: apply_transactions(rlp.decode(body, CountableList(Transaction))),
+}
+
+app = create_app(dispatcher, rlp_handlers,
+                 max_concurrency=int(os.environ.get('PLASMA_RPC_CONCURRENCY', 64)),
+                 workers=int(os.environ.get('PLASMA_RPC_WORKERS', 8)))
+
+# New blocks, deposits and exits are pushed to WebSocket subscribers.
+subscriptions = Subscriptions(child_chain)
+app.on_startup.append(subscriptions.on_startup)
+app.router.add_get('/ws', subscriptions.handle)
 
 
 if __name__ == '__main__':
-    run_simple('localhost', 8546, application)
+    web.run_app(app, host='localhost', port=8546)
@@ -0,0 +1,161 @@
+import asyncio
+import json
+from aiohttp import web, WSMsgType
+from ethereum import utils
+from plasma_core.constants import NULL_ADDRESS
+from plasma_core.utils.address import address_to_hex
+
+
+class Subscription(object):
+    """Events one WebSocket connection asked for.
+
+    Args:
+        kind (str): One of `blocks`, `deposits` or `exits`.
+        owner (bytes): Only send events that touch this address, or None for every event.
+        full (bool): Whether block events carry the whole encoded block.
+    """
+
+    def __init__(self, kind, owner=None, full=False):
+        self.kind = kind
+        self.owner = owner
+        self.full = full
+
+    def matches(self, kind, owners):
+        return kind == self.kind and (self.owner is None or self.owner in owners)
+
+
+class Subscriptions(object):
+    """Pushes blocks, deposits and exits applied to a child chain to WebSocket clients.
+
+    Clients send `{"subscribe": "blocks" | "deposits" | "exits"}` messages,
+    optionally with an `owner` address to filter on and, for blocks,
+    `"full": true` to also receive the encoded block. Events are built on
+    the child chain's writer thread and handed to the event loop, which
+    encodes full blocks only if someone asked for them. Clients that fall
+    more than `max_pending` events behind are dropped right away, without
+    waiting for the events queued before.
+
+    Args:
+        child_chain (ChildChain): Child chain to watch.
+        max_pending (int): Maximum number of unsent events per client.
+    """
+
+    def __init__(self, child_chain, max_pending=1024):
+        self.max_pending = max_pending
+        self.loop = None
+        self.connections = {}
+
+        child_chain.on('Block', self.on_block)
+        child_chain.on('Deposit', self.on_deposit)
+        child_chain.on('Exit', self.on_exit)
+
+    async def on_startup(self, app):
+        self.loop = asyncio.get_event_loop()
+
+    def on_block(self, block):
+        owners = set()
+        for tx in block.transaction_set:
+            owners.update([tx.newowner1, tx.newowner2])
+            if tx.blknum1 != 0:
+                owners.add(tx.sender1)
+            if tx.blknum2 != 0:
+                owners.add(tx.sender2)
+        event = {
+            'type': 'block',
+            'number': block.number,
+            'root': block.root.hex(),
+            'transaction_count': len(block.transaction_set)
+        }
+        self.publish('blocks', owners, event, lambda: dict(event, block=block.signed_encoded.hex()))
+
+    def on_deposit(self, block):
+        tx = block.transaction_set[0]
+        event = {
+            'type': 'deposit',
+            'blknum': block.number,
+            'owner': address_to_hex(tx.newowner1),
+            'currency': address_to_hex(tx.cur12),
+            'amount': tx.amount1
+        }
+        self.publish('deposits', {tx.newowner1}, event)
+
+    def on_exit(self, utxo_id, utxo):
+        (owner, currency, amount) = utxo
+        event = {
+            'type': 'exit',
+            'utxo_id': utxo_id,
+            'owner': address_to_hex(owner),
+            'currency': address_to_hex(currency),
+            'amount': amount
+        }
+        self.publish('exits', {owner}, event)
+
+    def publish(self, kind, owners, event, get_full_event=None):
+        if self.loop is None:
+            return
+        owners.discard(NULL_ADDRESS)
+        # Only the cheap summary is built here, the writer thread must not wait on encoding.
+        self.loop.call_soon_threadsafe(self._dispatch, kind, owners, event, get_full_event)
+
+    def _dispatch(self, kind, owners, event, get_full_event=None):
+        full_event = None
+        for (ws, subscriptions) in list(self.connections.items()):
+            matching = [s for s in subscriptions if s.matches(kind, owners)]
+            if not matching:
+                continue
+            queue = ws['queue']
+            if queue.qsize() >= self.max_pending:
+                # Too slow to keep up, the client has to reconnect and catch up. Its backlog is dropped so it is closed next.
+                del self.connections[ws]
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                continue
+            if get_full_event is not None and any(s.full for s in matching):
+                if full_event is None:
+                    full_event = get_full_event()
+                queue.put_nowait(full_event)
+            else:
+                queue.put_nowait(event)
+
+    async def handle(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        ws['queue'] = asyncio.Queue()
+        self.connections[ws] = []
+        sender = asyncio.ensure_future(self._send(ws))
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                # Replies go through the queue too, so only the sender writes to the socket.
+                try:
+                    subscription = self._parse(json.loads(message.data))
+                except (ValueError, KeyError, TypeError) as e:
+                    ws['queue'].put_nowait({'error': str(e)})
+                    continue
+                if ws in self.connections:
+                    self.connections[ws].append(subscription)
+                    ws['queue'].put_nowait({'subscribed': subscription.kind})
+        finally:
+            self.connections.pop(ws, None)
+            sender.cancel()
+        return ws
+
+    async def _send(self, ws):
+        queue = ws['queue']
+        while True:
+            event = await queue.get()
+            if event is None:
+                await ws.close()
+                return
+            await ws.send_json(event)
+
+    @staticmethod
+    def _parse(message):
+        kind = message['subscribe']
+        if kind not in ('blocks', 'deposits', 'exits'):
+            raise ValueError('unknown subscription {0}'.format(kind))
+        owner = message.get('owner')
+        return Subscription(kind, utils.normalize_address(owner) if owner is not None else None, bool(message.get('full', False)))
@@ -0,0 +1,68 @@
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class Writer(object):
+    """Applies every change to the child chain state on a single thread.
+
+    Changes are queued and run one at a time in the order they were
+    submitted, so the state never needs a lock. After every change
+    `on_commit` is called on the writer thread to publish a new read
+    snapshot, before the caller of the change is woken up.
+
+    Args:
+        on_commit (function): Called after every change, whether it succeeded or not.
+    """
+
+    def __init__(self, on_commit=None):
+        self.on_commit = on_commit
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, func, *args):
+        """Queues a change and returns a Future of its result."""
+
+        future = Future()
+        self.queue.put((func, args, future))
+        return future
+
+    def call(self, func, *args):
+        """Runs a change and waits for its result, raising whatever it raised."""
+
+        # Changes that trigger other changes run them in place.
+        if threading.current_thread() is self.thread:
+            return func(*args)
+        return self.submit(func, *args).result()
+
+    def stop(self):
+        self.queue.put(None)
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+
+            (func, args, future) = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            (result, error) = (None, None)
+            try:
+                result = func(*args)
+            except BaseException as e:
+                error = e
+
+            # Publish before waking the caller, so it can read its own change.
+            if self.on_commit is not None:
+                try:
+                    self.on_commit()
+                except BaseException as e:
+                    # The caller hears about it, the thread carries on with the next change.
+                    error = error or e
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
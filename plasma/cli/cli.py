@@ -5,7 +5,8 @@ from plasma_core.transaction import Transaction
 from plasma_core.utils.utils import confirm_tx
 from plasma_core.utils.transactions import encode_utxo_id
 from plasma.client.client import Client
-from plasma.client.exceptions import ChildChainServiceError
+from plasma.client.exceptions import ChildChainServiceError, InsufficientFundsException
+from plasma.client.wallet import Wallet
 
 
 CONTEXT_SETTINGS = dict(
@@ -84,6 +85,41 @@ def sendtx(client,
     client_call(client.apply_transaction, [tx], "Sent transaction")
 
 
+@cli.command()
+@click.argument('key', required=True)
+@click.argument('newowner', required=True)
+@click.argument('amount', required=True, type=int)
+@click.option('--currency', default="0x0")
+@click.option('--fee', default=0, type=int)
+@click.option('--wallet', 'wallet_path', default="wallet.rlp", help="File to keep the wallet state in")
+@click.pass_obj
+def send(client, key, newowner, amount, currency, fee, wallet_path):
+    if currency == "0x0":
+        currency = NULL_ADDRESS
+
+    # Inputs are picked from the wallet's outputs, which are brought up to date first
+    wallet = Wallet(client, [utils.normalize_key(key)], wallet_path)
+    client_call(wallet.sync)
+    try:
+        tx = wallet.create_transaction(utils.normalize_address(newowner), amount, utils.normalize_address(currency), fee)
+    except InsufficientFundsException as err:
+        print("Error:", err)
+        return
+
+    client_call(wallet.send_transaction, [tx], "Sent transaction")
+
+
+@cli.command()
+@click.argument('key', required=True)
+@click.option('--wallet', 'wallet_path', default="wallet.rlp", help="File to keep the wallet state in")
+@click.pass_obj
+def utxos(client, key, wallet_path):
+    wallet = Wallet(client, [utils.normalize_key(key)], wallet_path)
+    client_call(wallet.sync)
+    for utxo in sorted(wallet.utxos.values(), key=lambda utxo: utxo.utxo_id):
+        print(utxo.utxo_id, utils.encode_hex(utxo.currency), utxo.amount, utxo.status)
+
+
 @cli.command()
 @click.argument('key', required=True)
 @click.pass_obj
@@ -116,14 +152,14 @@ def withdraw(client,
 
     # Create a Merkle proof
     tx = block.transaction_set[txindex]
-    proof = block.merkle.create_membership_proof(tx.merkle_hash)
+    proof = block.get_proof(txindex)
 
     # Create the confirmation signatures
     confirmSig1, confirmSig2 = b'', b''
     if key1:
-        confirmSig1 = confirm_tx(tx, block.merkle.root, utils.normalize_key(key1))
+        confirmSig1 = confirm_tx(tx, block.root, utils.normalize_key(key1))
     if key2:
-        confirmSig2 = confirm_tx(tx, block.merkle.root, utils.normalize_key(key2))
+        confirmSig2 = confirm_tx(tx, block.root, utils.normalize_key(key2))
     sigs = tx.sig1 + tx.sig2 + confirmSig1 + confirmSig2
 
     client.withdraw(blknum, txindex, oindex, tx, proof, sigs)
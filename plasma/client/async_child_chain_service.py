@@ -0,0 +1,193 @@
+import asyncio
+import itertools
+import aiohttp
+import rlp
+from urllib.parse import urljoin
+from ethereum import utils
+from rlp.sedes import CountableList
+from plasma_core.constants import MAX_BLOCK_SPAN, MAX_BLOCK_FILTER_SPAN, RLP_CONTENT_TYPE, RLP_PATH
+from plasma_core.transaction import Transaction
+from plasma_core.block import Block
+from .child_chain_service import BlockFileCache, block_filters_sedes, match_batch_responses, take_rlp_items
+from .exceptions import ChildChainServiceError
+
+
+class AsyncChildChainService(object):
+    """Talks to the child chain server from asyncio code.
+
+    Has the same methods as ChildChainService, as coroutines. At most
+    `pool_size` requests are in flight at once, further requests wait for
+    a free connection.
+
+    Args:
+        url (str): URL of the JSON-RPC endpoint.
+        cache_dir (str): Directory to keep fetched blocks in, submitted blocks never change.
+        pool_size (int): Maximum number of connections open to the server.
+        timeout (float): Seconds to wait for a request to complete.
+        chain_id (str): Chain the cached blocks belong to, defaults to `url`.
+    """
+
+    def __init__(self, url, cache_dir=None, pool_size=10, timeout=30, chain_id=None):
+        self.url = url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = None
+        self.ids = itertools.count()
+        self.block_cache = BlockFileCache(cache_dir, chain_id or url) if cache_dir is not None else None
+        self.rlp_url = urljoin(url, RLP_PATH)
+        self.binary = None
+
+    def get_session(self):
+        # Sessions belong to the loop they are created in, so they are created on first use.
+        if self.session is None:
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.pool_size),
+                                                 timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def create_payload(self, method, args):
+        return {
+            "method": method,
+            "params": args,
+            "jsonrpc": "2.0",
+            "id": next(self.ids),
+        }
+
+    async def send_request(self, method, args):
+        async with self.get_session().post(self.url, json=self.create_payload(method, args)) as response:
+            response = await response.json()
+        if 'error' in response.keys():
+            raise ChildChainServiceError(response["error"])
+
+        return response["result"]
+
+    async def send_batch_request(self, calls):
+        if not calls:
+            return []
+        payloads = [self.create_payload(method, args) for (method, args) in calls]
+        async with self.get_session().post(self.url, json=payloads) as response:
+            responses = await response.json()
+        return match_batch_responses(payloads, responses)
+
+    async def supports_binary(self):
+        if self.binary is None:
+            async with self.get_session().get(self.rlp_url) as response:
+                self.binary = response.status == 200 and await response.text() == RLP_CONTENT_TYPE
+        return self.binary
+
+    async def send_rlp_request(self, path, data=None):
+        if data is None:
+            request = self.get_session().get(self.rlp_url + path)
+        else:
+            request = self.get_session().post(self.rlp_url + path, data=data, headers={'Content-Type': RLP_CONTENT_TYPE})
+        async with request as response:
+            if response.status == 404:
+                raise ChildChainServiceError({'code': 404, 'message': 'not found'})
+            if response.status >= 400:
+                raise ChildChainServiceError(await response.json())
+
+            if response.status == 204:
+                return None
+            if response.content_type == RLP_CONTENT_TYPE:
+                return await response.read()
+            return await response.json()
+
+    async def apply_transaction(self, transaction):
+        return await self.send_request("apply_transaction", [rlp.encode(transaction, Transaction).hex()])
+
+    async def apply_transactions(self, transactions):
+        if await self.supports_binary():
+            return await self.send_rlp_request("transactions", rlp.encode(transactions, CountableList(Transaction)))
+        return await self.send_request("apply_transactions", [[rlp.encode(tx, Transaction).hex() for tx in transactions]])
+
+    async def submit_block(self, block):
+        if await self.supports_binary():
+            return await self.send_rlp_request("block", rlp.encode(block, Block))
+        return await self.send_request("submit_block", [rlp.encode(block, Block).hex()])
+
+    async def get_transaction(self, blknum, txindex):
+        if await self.supports_binary():
+            return await self.send_rlp_request("transaction/{0}/{1}".format(blknum, txindex))
+        return utils.decode_hex(await self.send_request("get_transaction", [blknum, txindex]))
+
+    async def get_current_block(self):
+        if await self.supports_binary():
+            return await self.send_rlp_request("current_block")
+        return utils.decode_hex(await self.send_request("get_current_block", []))
+
+    async def get_block(self, blknum):
+        # Cache files are read and written on the default executor, to keep the event loop free.
+        loop = asyncio.get_event_loop()
+        encoded_block = await loop.run_in_executor(None, self.block_cache.get, blknum) if self.block_cache is not None else None
+        if encoded_block is not None:
+            return encoded_block
+
+        if await self.supports_binary():
+            encoded_block = await self.send_rlp_request("block/{0}".format(blknum))
+        else:
+            encoded_block = utils.decode_hex(await self.send_request("get_block", [blknum]))
+
+        if self.block_cache is not None:
+            await loop.run_in_executor(None, self.block_cache.put, blknum, encoded_block)
+        return encoded_block
+
+    async def get_blocks(self, start, end):
+        """Yields the signed RLP encodings of the blocks numbered in `[start, end)` that exist."""
+
+        for span_start in range(start, end, MAX_BLOCK_SPAN):
+            async for encoded_block in self._get_blocks(span_start, min(span_start + MAX_BLOCK_SPAN, end)):
+                yield encoded_block
+
+    async def _get_blocks(self, start, end):
+        if not await self.supports_binary():
+            for encoded_block in await self.send_request("get_blocks", [start, end]):
+                yield utils.decode_hex(encoded_block)
+            return
+
+        async with self.get_session().get(self.rlp_url + "blocks", params={'from': start, 'to': end}) as response:
+            if response.status >= 400:
+                raise ChildChainServiceError(await response.json())
+
+            buffer = bytearray()
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                buffer += chunk
+                for encoded_block in take_rlp_items(buffer):
+                    yield encoded_block
+
+    async def get_block_filters(self, start, end):
+        block_filters = []
+        for span_start in range(start, end, MAX_BLOCK_FILTER_SPAN):
+            block_filters += await self._get_block_filters(span_start, min(span_start + MAX_BLOCK_FILTER_SPAN, end))
+        return block_filters
+
+    async def _get_block_filters(self, start, end):
+        if await self.supports_binary():
+            encoded_filters = await self.send_rlp_request("block_filters?from={0}&to={1}".format(start, end))
+            return [(blknum, block_filter) for (blknum, block_filter) in rlp.decode(encoded_filters, block_filters_sedes)]
+        return [(result['number'], utils.decode_hex(result['filter'])) for result in await self.send_request("get_block_filters", [start, end])]
+
+    async def get_current_block_num(self):
+        return await self.send_request("get_current_block_num", [])
+
+    async def get_current_block_since(self, index, blknum=None):
+        result = await self.send_request("get_current_block_since", [index, blknum])
+        return (result['number'], result['start'], [utils.decode_hex(tx) for tx in result['transactions']])
+
+    async def get_submission_status(self, blknum):
+        return await self.send_request("get_submission_status", [blknum])
+
+    async def get_submission_error(self):
+        return await self.send_request("get_submission_error", [])
+
+    async def resume_submissions(self):
+        return await self.send_request("resume_submissions", [])
+
+    async def get_utxos(self, address):
+        return await self.send_request("get_utxos", [address])
+
+    async def get_balance(self, address, currency):
+        return await self.send_request("get_balance", [address, currency])
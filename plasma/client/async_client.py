@@ -0,0 +1,125 @@
+import asyncio
+import functools
+import rlp
+from concurrent.futures import ThreadPoolExecutor
+from web3 import HTTPProvider
+from plasma_core.block import Block
+from plasma_core.transaction import Transaction
+from plasma_core.constants import NULL_ADDRESS, NULL_ADDRESS_HEX, CONTRACT_ADDRESS
+from plasma.root_chain.deployer import Deployer
+from .async_child_chain_service import AsyncChildChainService
+from .client import (Client, decode_block_filters, decode_current_block_since, get_challenge_args, get_current_block_since_args,
+                     get_exit_args, merge_current_block)
+
+
+class AsyncClient(object):
+    """Client with the same methods as Client, as coroutines.
+
+    Many transfers, proof fetches and exits can run at once from a single
+    event loop. Child chain requests share `pool_size` connections, and
+    root chain transactions are sent from `root_chain_workers` threads,
+    since web3 itself only talks to the node synchronously.
+
+    Args:
+        root_chain_provider (BaseProvider): Provider of the root chain node.
+        child_chain_url (str): URL of the child chain JSON-RPC endpoint.
+        cache_dir (str): Directory to keep fetched blocks in.
+        pool_size (int): Maximum number of child chain requests in flight.
+        root_chain_workers (int): Maximum number of root chain calls in flight.
+    """
+
+    def __init__(self, root_chain_provider=HTTPProvider('http://localhost:8545'), child_chain_url="http://localhost:8546/jsonrpc",
+                 cache_dir=None, pool_size=10, root_chain_workers=8):
+        deployer = Deployer(root_chain_provider)
+        self.root_chain = deployer.get_contract_at_address("RootChain", CONTRACT_ADDRESS, concise=True)
+        self.child_chain = AsyncChildChainService(child_chain_url, cache_dir, pool_size=pool_size, chain_id=CONTRACT_ADDRESS)
+        self.executor = ThreadPoolExecutor(max_workers=root_chain_workers)
+
+    async def close(self):
+        await self.child_chain.close()
+        self.executor.shutdown(wait=False)
+
+    async def run_on_root_chain(self, func, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    # Building and signing transactions does no I/O.
+    create_transaction = Client.create_transaction
+    sign_transaction = Client.sign_transaction
+
+    async def deposit(self, amount, owner):
+        await self.run_on_root_chain(self.root_chain.deposit, transact={'from': owner, 'value': amount})
+
+    async def apply_transaction(self, transaction):
+        await self.child_chain.apply_transaction(transaction)
+
+    async def apply_transactions(self, transactions):
+        return await self.child_chain.apply_transactions(transactions)
+
+    async def submit_block(self, block):
+        await self.child_chain.submit_block(block)
+
+    async def withdraw(self, blknum, txindex, oindex, tx, proof, sigs):
+        (args, owner_addr) = get_exit_args(blknum, txindex, oindex, tx, proof, sigs)
+        await self.run_on_root_chain(self.root_chain.startExit, *args, transact={'from': owner_addr})
+
+    async def withdraw_deposit(self, owner, deposit_pos, amount):
+        await self.run_on_root_chain(self.root_chain.startDepositExit, deposit_pos, NULL_ADDRESS, amount, transact={'from': owner})
+
+    async def get_transaction(self, blknum, txindex):
+        encoded_transaction = await self.child_chain.get_transaction(blknum, txindex)
+        return rlp.decode(encoded_transaction, Transaction)
+
+    async def get_current_block(self):
+        encoded_block = await self.child_chain.get_current_block()
+        return rlp.decode(encoded_block, Block)
+
+    async def get_block(self, blknum):
+        encoded_block = await self.child_chain.get_block(blknum)
+        return rlp.decode(encoded_block, Block)
+
+    async def get_blocks(self, start, end):
+        async for encoded_block in self.child_chain.get_blocks(start, end):
+            yield rlp.decode(encoded_block, Block)
+
+    async def get_block_filters(self, start, end):
+        return decode_block_filters(await self.child_chain.get_block_filters(start, end))
+
+    async def get_current_block_num(self):
+        return await self.child_chain.get_current_block_num()
+
+    async def get_current_block_since(self, index, blknum=None):
+        return decode_current_block_since(await self.child_chain.get_current_block_since(index, blknum))
+
+    async def catch_up(self, next_blknum, current_block=None):
+        # Returns the blocks from next_blknum up to the current block, and the current block.
+        (number, start, transactions) = await self.get_current_block_since(*get_current_block_since_args(current_block))
+
+        blocks = [block async for block in self.get_blocks(next_blknum, number)]
+        block = merge_current_block(current_block, number, start, transactions)
+        if block is None:
+            block = merge_current_block(None, *await self.get_current_block_since(0))
+        return (blocks, block)
+
+    async def get_submission_status(self, blknum):
+        return await self.child_chain.get_submission_status(blknum)
+
+    async def get_submission_error(self):
+        return await self.child_chain.get_submission_error()
+
+    async def resume_submissions(self):
+        return await self.child_chain.resume_submissions()
+
+    async def get_utxos(self, address):
+        return await self.child_chain.get_utxos(address)
+
+    async def get_balance(self, address, currency=NULL_ADDRESS_HEX):
+        return await self.child_chain.get_balance(address, currency)
+
+    async def finalize_exits(self, account):
+        await self.run_on_root_chain(self.root_chain.finalizeExits, NULL_ADDRESS, transact={'from': account})
+
+    async def challenge_exit(self, blknum, txindex, oindex, confirm_sig, account):
+        block = await self.get_block(blknum)
+        return await self.run_on_root_chain(self.root_chain.challengeExit, *get_challenge_args(block, blknum, txindex, oindex, confirm_sig),
+                                            transact={'from': account})
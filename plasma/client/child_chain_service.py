@@ -1,44 +1,277 @@
+import itertools
+import os
 import requests
+from requests.adapters import HTTPAdapter
 import rlp
+from urllib.parse import urljoin
+from ethereum import utils
+from rlp.sedes import big_endian_int, binary, CountableList, List
 from plasma.child_chain.child_chain import ChildChain
+from plasma_core.block_store import read_length_prefix
+from plasma_core.constants import MAX_BLOCK_SPAN, MAX_BLOCK_FILTER_SPAN, RLP_CONTENT_TYPE, RLP_PATH
 from plasma_core.transaction import Transaction
+from plasma_core.utils.crypto import sha3
 from plasma_core.block import Block
 from .exceptions import ChildChainServiceError
 
 
+block_filters_sedes = CountableList(List([big_endian_int, binary]))
+
+
+def split_rlp_items(chunks):
+    """Yields the RLP items of a stream of concatenated encodings as they arrive.
+
+    Every item must be longer than the longest possible length prefix,
+    which holds for encoded blocks and transactions.
+    """
+
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        for item in take_rlp_items(buffer):
+            yield item
+
+
+def take_rlp_items(buffer):
+    """Removes the complete RLP items from the start of a bytearray and returns them."""
+
+    items = []
+    position = 0
+    while len(buffer) - position >= 9:
+        (payload_start, payload_length) = read_length_prefix(buffer, position)
+        end = payload_start + payload_length
+        if end > len(buffer):
+            break
+        items.append(bytes(buffer[position:end]))
+        position = end
+    del buffer[:position]
+    return items
+
+
+def match_batch_responses(payloads, responses):
+    """Returns the result of every batched call in order, or a ChildChainServiceError for calls that failed."""
+
+    if isinstance(responses, dict):
+        # The whole batch was rejected.
+        raise ChildChainServiceError(responses["error"])
+
+    # Responses may come back in any order.
+    responses_by_id = {response.get("id"): response for response in responses}
+    results = []
+    for payload in payloads:
+        response = responses_by_id.get(payload["id"], {"error": {"code": -32603, "message": "missing response"}})
+        results.append(ChildChainServiceError(response["error"]) if "error" in response else response["result"])
+    return results
+
+
+class BlockFileCache(object):
+    """Directory of fetched blocks, submitted blocks never change.
+
+    Block numbers are only unique within a chain, so every chain keeps its
+    blocks in a subdirectory of its own.
+
+    Args:
+        path (str): Directory to keep the blocks in.
+        chain_id (str): Identifies the chain, like the address of its root chain contract.
+    """
+
+    def __init__(self, path, chain_id):
+        self.path = os.path.join(path, sha3(chain_id.lower().encode()).hex()[:16])
+        os.makedirs(self.path, exist_ok=True)
+
+    def get(self, blknum):
+        """Returns the signed RLP encoding of a cached block, or None."""
+
+        try:
+            with open(os.path.join(self.path, '{0}.rlp'.format(blknum)), 'rb') as cache_file:
+                return cache_file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, blknum, encoded_block):
+        file_path = os.path.join(self.path, '{0}.rlp'.format(blknum))
+        temp_path = file_path + '.tmp'
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(encoded_block)
+        os.replace(temp_path, file_path)
+
+
 class ChildChainService(object):
+    """Talks to the child chain server.
 
-    def __init__(self, url):
+    Connections are kept alive in a pool and reused across requests.
+
+    Args:
+        url (str): URL of the JSON-RPC endpoint.
+        cache_dir (str): Directory to keep fetched blocks in, submitted blocks never change.
+        pool_size (int): Maximum number of connections kept open to the server.
+        timeout (float): Seconds to wait for the server to connect or respond.
+        chain_id (str): Chain the cached blocks belong to, defaults to `url`.
+    """
+
+    def __init__(self, url, cache_dir=None, pool_size=10, timeout=30, chain_id=None):
         self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.ids = itertools.count()
+        self.block_cache = BlockFileCache(cache_dir, chain_id or url) if cache_dir is not None else None
+        self.rlp_url = urljoin(url, RLP_PATH)
+        self.binary = None
         self.methods = [func for func in dir(ChildChain) if callable(getattr(ChildChain, func)) and not func.startswith("__")]
 
-    def send_request(self, method, args):
-        payload = {
+    def create_payload(self, method, args):
+        return {
             "method": method,
             "params": args,
             "jsonrpc": "2.0",
-            "id": 0,
+            "id": next(self.ids),
         }
-        response = requests.post(self.url, json=payload).json()
+
+    def send_request(self, method, args):
+        response = self.session.post(self.url, json=self.create_payload(method, args), timeout=self.timeout).json()
         if 'error' in response.keys():
             raise ChildChainServiceError(response["error"])
 
         return response["result"]
 
+    def send_batch_request(self, calls):
+        """Sends many calls in one JSON-RPC batch.
+
+        Args:
+            calls (list): `(method, args)` of every call.
+
+        Returns:
+            list: The result of every call in order, or a ChildChainServiceError for calls that failed.
+        """
+
+        if not calls:
+            return []
+        payloads = [self.create_payload(method, args) for (method, args) in calls]
+        responses = self.session.post(self.url, json=payloads, timeout=self.timeout).json()
+        return match_batch_responses(payloads, responses)
+
+    def supports_binary(self):
+        """Returns whether the server has binary RLP endpoints, asking it the first time."""
+
+        if self.binary is None:
+            response = self.session.get(self.rlp_url, timeout=self.timeout)
+            self.binary = response.status_code == 200 and response.text == RLP_CONTENT_TYPE
+        return self.binary
+
+    def send_rlp_request(self, path, data=None):
+        if data is None:
+            response = self.session.get(self.rlp_url + path, timeout=self.timeout)
+        else:
+            response = self.session.post(self.rlp_url + path, data=data, headers={'Content-Type': RLP_CONTENT_TYPE}, timeout=self.timeout)
+        if response.status_code == 404:
+            raise ChildChainServiceError({'code': 404, 'message': 'not found'})
+        if response.status_code >= 400:
+            raise ChildChainServiceError(response.json())
+
+        if response.status_code == 204:
+            return None
+        if response.headers.get('Content-Type') == RLP_CONTENT_TYPE:
+            return response.content
+        return response.json()
+
     def apply_transaction(self, transaction):
         return self.send_request("apply_transaction", [rlp.encode(transaction, Transaction).hex()])
 
+    def apply_transactions(self, transactions):
+        if self.supports_binary():
+            return self.send_rlp_request("transactions", rlp.encode(transactions, CountableList(Transaction)))
+        return self.send_request("apply_transactions", [[rlp.encode(tx, Transaction).hex() for tx in transactions]])
+
     def submit_block(self, block):
+        if self.supports_binary():
+            return self.send_rlp_request("block", rlp.encode(block, Block))
         return self.send_request("submit_block", [rlp.encode(block, Block).hex()])
 
     def get_transaction(self, blknum, txindex):
-        return self.send_request("get_transaction", [blknum, txindex])
+        """Returns the signed RLP encoding of a transaction."""
+
+        if self.supports_binary():
+            return self.send_rlp_request("transaction/{0}/{1}".format(blknum, txindex))
+        return utils.decode_hex(self.send_request("get_transaction", [blknum, txindex]))
 
     def get_current_block(self):
-        return self.send_request("get_current_block", [])
+        """Returns the RLP encoding of the current block."""
+
+        if self.supports_binary():
+            return self.send_rlp_request("current_block")
+        return utils.decode_hex(self.send_request("get_current_block", []))
 
     def get_block(self, blknum):
-        return self.send_request("get_block", [blknum])
+        """Returns the signed RLP encoding of a block."""
+
+        encoded_block = self.block_cache.get(blknum) if self.block_cache is not None else None
+        if encoded_block is not None:
+            return encoded_block
+
+        if self.supports_binary():
+            encoded_block = self.send_rlp_request("block/{0}".format(blknum))
+        else:
+            encoded_block = utils.decode_hex(self.send_request("get_block", [blknum]))
+
+        if self.block_cache is not None:
+            self.block_cache.put(blknum, encoded_block)
+        return encoded_block
+
+    def get_blocks(self, start, end):
+        """Returns an iterator over the signed RLP encodings of the blocks numbered in `[start, end)` that exist."""
+
+        # The server caps the span of a single request, later spans are only requested once the earlier ones are read.
+        spans = range(start, end, MAX_BLOCK_SPAN)
+        return itertools.chain.from_iterable(self._get_blocks(span_start, min(span_start + MAX_BLOCK_SPAN, end)) for span_start in spans)
+
+    def _get_blocks(self, start, end):
+        if not self.supports_binary():
+            return (utils.decode_hex(encoded_block) for encoded_block in self.send_request("get_blocks", [start, end]))
+
+        response = self.session.get(self.rlp_url + "blocks", params={'from': start, 'to': end}, stream=True, timeout=self.timeout)
+        if response.status_code >= 400:
+            raise ChildChainServiceError(response.json())
+
+        return split_rlp_items(response.iter_content(chunk_size=64 * 1024))
+
+    def get_block_filters(self, start, end):
+        """Returns the number and the owner Bloom filter bits of the blocks numbered in `[start, end)` that exist."""
+
+        # The server caps the span of a single request.
+        block_filters = []
+        for span_start in range(start, end, MAX_BLOCK_FILTER_SPAN):
+            block_filters += self._get_block_filters(span_start, min(span_start + MAX_BLOCK_FILTER_SPAN, end))
+        return block_filters
+
+    def _get_block_filters(self, start, end):
+        if self.supports_binary():
+            encoded_filters = self.send_rlp_request("block_filters?from={0}&to={1}".format(start, end))
+            return [(blknum, block_filter) for (blknum, block_filter) in rlp.decode(encoded_filters, block_filters_sedes)]
+        return [(result['number'], utils.decode_hex(result['filter'])) for result in self.send_request("get_block_filters", [start, end])]
 
     def get_current_block_num(self):
         return self.send_request("get_current_block_num", [])
+
+    def get_current_block_since(self, index, blknum=None):
+        """Returns the current block number, the index of the first returned transaction and the signed RLP encodings of the transactions."""
+
+        result = self.send_request("get_current_block_since", [index, blknum])
+        return (result['number'], result['start'], [utils.decode_hex(tx) for tx in result['transactions']])
+
+    def get_submission_status(self, blknum):
+        return self.send_request("get_submission_status", [blknum])
+
+    def get_submission_error(self):
+        return self.send_request("get_submission_error", [])
+
+    def resume_submissions(self):
+        return self.send_request("resume_submissions", [])
+
+    def get_utxos(self, address):
+        return self.send_request("get_utxos", [address])
+
+    def get_balance(self, address, currency):
+        return self.send_request("get_balance", [address, currency])
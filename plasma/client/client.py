@@ -1,21 +1,75 @@
 import rlp
-from ethereum import utils
 from web3 import HTTPProvider
 from plasma_core.block import Block
 from plasma_core.transaction import Transaction, UnsignedTransaction
-from plasma_core.constants import NULL_ADDRESS, CONTRACT_ADDRESS
+from plasma_core.constants import NULL_ADDRESS, NULL_ADDRESS_HEX, CONTRACT_ADDRESS
+from plasma_core.utils.bloom import BloomFilter
 from plasma_core.utils.transactions import encode_utxo_id
 from plasma.root_chain.deployer import Deployer
 from .child_chain_service import ChildChainService
 from eth_utils import address
 
 
+# Helpers shared with AsyncClient, they build requests and read responses but do no I/O.
+
+def decode_block_filters(block_filters):
+    return [(blknum, BloomFilter(block_filter)) for (blknum, block_filter) in block_filters]
+
+
+def decode_current_block_since(result):
+    (number, start, encoded_transactions) = result
+    return (number, start, [rlp.decode(encoded_transaction, Transaction) for encoded_transaction in encoded_transactions])
+
+
+def get_current_block_since_args(current_block):
+    # Only the transactions added to current_block since it was fetched are requested.
+    if current_block is None:
+        return (0, None)
+    return (len(current_block.transaction_set), current_block.number)
+
+
+def merge_current_block(current_block, number, start, transactions):
+    """Returns the current block with the transactions added since `current_block`.
+
+    Returns:
+        Block: The current block, or None if the server moved on to another
+            block and its transactions must be fetched from the start.
+    """
+
+    # Only transactions of the same block may be merged, anything else starts over.
+    if start > 0 and number != current_block.number:
+        return None
+    if start > 0:
+        transactions = list(current_block.transaction_set) + transactions
+    return Block(transactions, number=number)
+
+
+def get_exit_args(blknum, txindex, oindex, tx, proof, sigs):
+    """Returns the arguments of startExit, and the owner of the output who sends it."""
+
+    utxo_pos = encode_utxo_id(blknum, txindex, oindex)
+    encoded_transaction = rlp.encode(tx, UnsignedTransaction)
+    owner = tx.newowner1 if oindex == 0 else tx.newowner2
+    owner_addr = address.to_checksum_address('0x' + owner.hex())
+    return ((utxo_pos, encoded_transaction, proof, sigs), owner_addr)
+
+
+def get_challenge_args(block, blknum, txindex, oindex, confirm_sig):
+    """Returns the arguments of challengeExit for a transaction of `block`."""
+
+    tx = block.transaction_set[txindex]
+    utxo_pos = encode_utxo_id(blknum, txindex, oindex)
+    proof = block.get_proof(txindex)
+    sigs = tx.sig1 + tx.sig2
+    return (utxo_pos, oindex, tx.encoded, proof, sigs, confirm_sig)
+
+
 class Client(object):
 
-    def __init__(self, root_chain_provider=HTTPProvider('http://localhost:8545'), child_chain_url="http://localhost:8546/jsonrpc"):
+    def __init__(self, root_chain_provider=HTTPProvider('http://localhost:8545'), child_chain_url="http://localhost:8546/jsonrpc", cache_dir=None):
         deployer = Deployer(root_chain_provider)
         self.root_chain = deployer.get_contract_at_address("RootChain", CONTRACT_ADDRESS, concise=True)
-        self.child_chain = ChildChainService(child_chain_url)
+        self.child_chain = ChildChainService(child_chain_url, cache_dir, chain_id=CONTRACT_ADDRESS)
 
     def create_transaction(self, blknum1=0, txindex1=0, oindex1=0,
                            blknum2=0, txindex2=0, oindex2=0,
@@ -43,43 +97,72 @@ class Client(object):
     def apply_transaction(self, transaction):
         self.child_chain.apply_transaction(transaction)
 
+    def apply_transactions(self, transactions):
+        return self.child_chain.apply_transactions(transactions)
+
     def submit_block(self, block):
         self.child_chain.submit_block(block)
 
     def withdraw(self, blknum, txindex, oindex, tx, proof, sigs):
-        utxo_pos = encode_utxo_id(blknum, txindex, oindex)
-        encoded_transaction = rlp.encode(tx, UnsignedTransaction)
-        owner = tx.newowner1 if oindex == 0 else tx.newowner2
-        owner_addr = address.to_checksum_address('0x' + owner.hex())
-        self.root_chain.startExit(utxo_pos, encoded_transaction, proof, sigs, transact={'from': owner_addr})
+        (args, owner_addr) = get_exit_args(blknum, txindex, oindex, tx, proof, sigs)
+        self.root_chain.startExit(*args, transact={'from': owner_addr})
 
     def withdraw_deposit(self, owner, deposit_pos, amount):
         self.root_chain.startDepositExit(deposit_pos, NULL_ADDRESS, amount, transact={'from': owner})
 
     def get_transaction(self, blknum, txindex):
         encoded_transaction = self.child_chain.get_transaction(blknum, txindex)
-        return rlp.decode(utils.decode_hex(encoded_transaction), Transaction)
+        return rlp.decode(encoded_transaction, Transaction)
 
     def get_current_block(self):
         encoded_block = self.child_chain.get_current_block()
-        return rlp.decode(utils.decode_hex(encoded_block), Block)
+        return rlp.decode(encoded_block, Block)
 
     def get_block(self, blknum):
         encoded_block = self.child_chain.get_block(blknum)
-        return rlp.decode(utils.decode_hex(encoded_block), Block)
+        return rlp.decode(encoded_block, Block)
+
+    def get_blocks(self, start, end):
+        return (rlp.decode(encoded_block, Block) for encoded_block in self.child_chain.get_blocks(start, end))
+
+    def get_block_filters(self, start, end):
+        return decode_block_filters(self.child_chain.get_block_filters(start, end))
 
     def get_current_block_num(self):
         return self.child_chain.get_current_block_num()
 
+    def get_current_block_since(self, index, blknum=None):
+        return decode_current_block_since(self.child_chain.get_current_block_since(index, blknum))
+
+    def catch_up(self, next_blknum, current_block=None):
+        # Returns the blocks from next_blknum up to the current block, and the current block.
+        (number, start, transactions) = self.get_current_block_since(*get_current_block_since_args(current_block))
+
+        # Every block before the current one has been submitted, so it can be fetched in one range.
+        blocks = list(self.get_blocks(next_blknum, number))
+        block = merge_current_block(current_block, number, start, transactions)
+        if block is None:
+            block = merge_current_block(None, *self.get_current_block_since(0))
+        return (blocks, block)
+
+    def get_submission_status(self, blknum):
+        return self.child_chain.get_submission_status(blknum)
+
+    def get_submission_error(self):
+        return self.child_chain.get_submission_error()
+
+    def resume_submissions(self):
+        return self.child_chain.resume_submissions()
+
+    def get_utxos(self, address):
+        return self.child_chain.get_utxos(address)
+
+    def get_balance(self, address, currency=NULL_ADDRESS_HEX):
+        return self.child_chain.get_balance(address, currency)
+
     def finalize_exits(self, account):
         self.root_chain.finalizeExits(NULL_ADDRESS, transact={'from': account})
 
     def challenge_exit(self, blknum, txindex, oindex, confirm_sig, account):
         block = self.get_block(blknum)
-        tx = block.transaction_set[txindex]
-
-        utxo_pos = encode_utxo_id(blknum, txindex, oindex)
-        proof = block.merkle.create_membership_proof(tx.merkle_hash)
-        sigs = tx.sig1 + tx.sig2
-
-        return self.root_chain.challengeExit(utxo_pos, oindex, tx.encoded, proof, sigs, confirm_sig, transact={'from': account})
+        return self.root_chain.challengeExit(*get_challenge_args(block, blknum, txindex, oindex, confirm_sig), transact={'from': account})
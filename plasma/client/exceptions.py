@@ -1,2 +1,6 @@
 class ChildChainServiceError(Exception):
     """the request sent to the child chain server returned some error"""
+
+
+class InsufficientFundsException(Exception):
+    """the wallet does not hold enough spendable outputs to cover the amount"""
@@ -0,0 +1,276 @@
+import os
+import time
+import zlib
+import rlp
+from rlp.sedes import big_endian_int, binary, CountableList, List
+from ethereum import utils
+from eth_utils import address
+from plasma_core.block import Block
+from plasma_core.constants import NULL_ADDRESS
+from plasma_core.snapshot import CHECKSUM
+from plasma_core.transaction import Transaction
+from plasma_core.utils.transactions import decode_utxo_id, encode_utxo_id
+from plasma_core.utils.utils import confirm_tx
+from .exceptions import InsufficientFundsException
+
+
+WALLET_VERSION = 1
+
+PENDING = 'pending'
+CONFIRMED = 'confirmed'
+SPENDING = 'spending'
+SPENT = 'spent'
+EXITING = 'exiting'
+
+# Outputs of the open block can't be spent until it is submitted.
+SPENDABLE = (CONFIRMED,)
+
+wallet_utxo_sedes = List([big_endian_int, binary, binary, big_endian_int, binary, big_endian_int])
+wallet_sedes = List([
+    big_endian_int,                      # version
+    big_endian_int,                      # number of the next block to scan
+    CountableList(wallet_utxo_sedes),    # utxo id, owner, currency, amount, status, time it was sent
+])
+
+
+class WalletUtxo(object):
+    """Output owned by one of the wallet's addresses.
+
+    Args:
+        utxo_id (int): Position of the output.
+        owner (bytes): Address that owns the output.
+        currency (bytes): Token of the output.
+        amount (int): Value of the output.
+        status (str): PENDING while its block is open, then CONFIRMED, SPENDING, SPENT or EXITING.
+        spent_at (int): When a transaction spending the output was sent, while it is SPENDING.
+    """
+
+    def __init__(self, utxo_id, owner, currency, amount, status, spent_at=0):
+        self.utxo_id = utxo_id
+        self.owner = owner
+        self.currency = currency
+        self.amount = amount
+        self.status = status
+        self.spent_at = spent_at
+
+
+class Wallet(object):
+    """Outputs owned by a set of keys, kept up to date from the child chain.
+
+    Every sync only fetches the blocks after a cursor whose owner Bloom
+    filter may hold one of the wallet's addresses, and the transactions
+    added to the current block since the last sync. The cursor and the
+    owned outputs are saved to `path` after every change, so a restarted
+    wallet carries on where it left off.
+
+    Inputs of a sent transaction are SPENDING until a sync finds the
+    transaction in a block, as it may only be waiting in the mempool. If
+    it is still missing after `spend_timeout` seconds and the child chain
+    lists the inputs as unspent, the transaction was dropped and they are
+    spendable again.
+
+    Args:
+        client (Client): Client of the chain to follow.
+        keys (list): Private keys of the owned addresses.
+        path (str): File to keep the wallet state in, nothing is saved if None.
+        spend_timeout (int): Seconds to wait for a sent transaction to show up in a block.
+        clock (function): Returns the current time in seconds.
+    """
+
+    def __init__(self, client, keys, path=None, spend_timeout=3600, clock=time.time):
+        self.client = client
+        self.keys = {utils.privtoaddr(key): key for key in keys}
+        self.path = path
+        self.spend_timeout = spend_timeout
+        self.clock = clock
+        self.next_blknum = 1
+        self.utxos = {}
+        self.current_block = None
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def sync(self):
+        if self.current_block is None:
+            (number, start, transactions) = self.client.get_current_block_since(0)
+        else:
+            (number, start, transactions) = self.client.get_current_block_since(len(self.current_block.transaction_set), self.current_block.number)
+
+        # Blocks whose owner filter holds none of the wallet's addresses can't concern it, so they are never fetched.
+        for (blknum, block_filter) in self.client.get_block_filters(self.next_blknum, number):
+            if any(owner in block_filter for owner in self.keys):
+                self._apply_block(self.client.get_block(blknum), 0, CONFIRMED)
+            self.next_blknum = blknum + 1
+
+        # The server only sends the transactions added since the last sync, unless the block was sealed in between.
+        if start > 0 and number != self.current_block.number:
+            (number, start, transactions) = self.client.get_current_block_since(0)
+        if start > 0:
+            transactions = list(self.current_block.transaction_set) + transactions
+        self.current_block = Block(transactions, number=number)
+        self._apply_block(self.current_block, start, PENDING)
+        self._release_dropped_inputs()
+        self.save()
+
+    def get_utxos(self, currency=None, statuses=SPENDABLE):
+        return [utxo for utxo in self.utxos.values()
+                if utxo.status in statuses and (currency is None or utxo.currency == currency)]
+
+    def get_balance(self, currency=NULL_ADDRESS, statuses=SPENDABLE):
+        """Returns the value of the outputs in `statuses`, pass `(PENDING,)` for what the open block will confirm."""
+
+        return sum(utxo.amount for utxo in self.get_utxos(currency, statuses))
+
+    def select_utxos(self, amount, currency=NULL_ADDRESS):
+        """Returns one or two spendable outputs worth at least `amount`, leaving as little change as possible.
+
+        Raises:
+            InsufficientFundsException: No one or two outputs add up to `amount`.
+        """
+
+        candidates = sorted(self.get_utxos(currency), key=lambda utxo: utxo.amount)
+
+        # A single output needs only one signature.
+        for utxo in candidates:
+            if utxo.amount >= amount:
+                return [utxo]
+
+        # Otherwise find the smallest pair that covers the amount.
+        best = None
+        (low, high) = (0, len(candidates) - 1)
+        while low < high:
+            total = candidates[low].amount + candidates[high].amount
+            if total >= amount:
+                if best is None or total < best[0].amount + best[1].amount:
+                    best = [candidates[low], candidates[high]]
+                high -= 1
+            else:
+                low += 1
+        if best is None:
+            raise InsufficientFundsException('{0} spendable outputs cannot cover {1}'.format(len(candidates), amount))
+        return best
+
+    def create_transaction(self, newowner, amount, currency=NULL_ADDRESS, fee=0, change_owner=None):
+        """Returns a signed transaction paying `amount` to `newowner` out of the wallet's outputs.
+
+        Whatever the inputs hold beyond `amount` and `fee` goes back to
+        `change_owner`, by default the owner of the first input.
+        """
+
+        inputs = self.select_utxos(amount + fee, currency)
+        change = sum(utxo.amount for utxo in inputs) - amount - fee
+        if change_owner is None:
+            change_owner = inputs[0].owner
+
+        positions = [decode_utxo_id(utxo.utxo_id) for utxo in inputs] + [(0, 0, 0)]
+        tx = Transaction(*positions[0], *positions[1],
+                         currency,
+                         newowner, amount,
+                         change_owner if change else NULL_ADDRESS, change)
+        tx.sign1(self.keys[inputs[0].owner])
+        if len(inputs) > 1:
+            tx.sign2(self.keys[inputs[1].owner])
+        return tx
+
+    def send(self, newowner, amount, currency=NULL_ADDRESS, fee=0, change_owner=None):
+        return self.send_transaction(self.create_transaction(newowner, amount, currency, fee, change_owner))
+
+    def send_transaction(self, tx):
+        self.client.apply_transaction(tx)
+
+        # The transaction may only have been queued, its inputs are spent once a sync finds it in a block.
+        spent_at = int(self.clock())
+        for utxo in self._get_inputs(tx):
+            if utxo.status in SPENDABLE:
+                (utxo.status, utxo.spent_at) = (SPENDING, spent_at)
+        self.save()
+        return tx
+
+    def start_exit(self, utxo_id, confirm_sigs=None):
+        """Starts the exit of an owned output on the root chain.
+
+        Confirmation signatures are made with the wallet's keys, unless
+        given, which is needed when someone else sent the output.
+        """
+
+        utxo = self.utxos[utxo_id]
+        (blknum, txindex, oindex) = decode_utxo_id(utxo_id)
+        block = self.client.get_block(blknum)
+        tx = block.transaction_set[txindex]
+
+        if tx.is_deposit_transaction:
+            self.client.withdraw_deposit(address.to_checksum_address('0x' + utxo.owner.hex()), utxo_id, utxo.amount)
+        else:
+            if confirm_sigs is None:
+                senders = [tx.sender1] if tx.is_single_utxo else [tx.sender1, tx.sender2]
+                missing = [sender for sender in senders if sender not in self.keys]
+                if missing:
+                    raise ValueError('confirmation signatures of 0x{0} are required'.format(missing[0].hex()))
+                confirm_sigs = b''.join(confirm_tx(tx, block.root, self.keys[sender]) for sender in senders)
+            self.client.withdraw(blknum, txindex, oindex, tx, block.get_proof(txindex), tx.sig1 + tx.sig2 + confirm_sigs)
+
+        utxo.status = EXITING
+        self.save()
+
+    def save(self):
+        if self.path is None:
+            return
+        utxos = [[utxo.utxo_id, utxo.owner, utxo.currency, utxo.amount, utxo.status.encode(), utxo.spent_at]
+                 for utxo in sorted(self.utxos.values(), key=lambda utxo: utxo.utxo_id)]
+        payload = rlp.encode([WALLET_VERSION, self.next_blknum, utxos], wallet_sedes)
+
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as wallet_file:
+            wallet_file.write(CHECKSUM.pack(zlib.crc32(payload)) + payload)
+            wallet_file.flush()
+            os.fsync(wallet_file.fileno())
+        os.replace(temp_path, self.path)
+
+    def load(self):
+        with open(self.path, 'rb') as wallet_file:
+            data = wallet_file.read()
+        (checksum,) = CHECKSUM.unpack_from(data)
+        payload = data[CHECKSUM.size:]
+        if zlib.crc32(payload) != checksum:
+            raise ValueError('wallet checksum mismatch')
+
+        (version, next_blknum, utxos) = rlp.decode(payload, wallet_sedes)
+        if version != WALLET_VERSION:
+            raise ValueError('unsupported wallet version {0}'.format(version))
+
+        self.next_blknum = next_blknum
+        self.utxos = {utxo_id: WalletUtxo(utxo_id, owner, currency, amount, status.decode(), spent_at)
+                      for (utxo_id, owner, currency, amount, status, spent_at) in utxos}
+
+    def _apply_block(self, block, start, status):
+        for txindex in range(start, len(block.transaction_set)):
+            tx = block.transaction_set[txindex]
+            self._spend_inputs(tx)
+            for (oindex, (owner, amount)) in enumerate([(tx.newowner1, tx.amount1), (tx.newowner2, tx.amount2)]):
+                if amount == 0 or owner not in self.keys:
+                    continue
+                utxo_id = encode_utxo_id(block.number, txindex, oindex)
+                utxo = self.utxos.get(utxo_id)
+                if utxo is None:
+                    self.utxos[utxo_id] = WalletUtxo(utxo_id, owner, tx.cur12, amount, status)
+                elif utxo.status == PENDING:
+                    utxo.status = status
+
+    def _spend_inputs(self, tx):
+        for utxo in self._get_inputs(tx):
+            (utxo.status, utxo.spent_at) = (SPENT, 0)
+
+    def _get_inputs(self, tx):
+        inputs = [(tx.blknum1, tx.txindex1, tx.oindex1), (tx.blknum2, tx.txindex2, tx.oindex2)]
+        utxo_ids = [encode_utxo_id(*i) for i in inputs if i[0] != 0]
+        return [self.utxos[utxo_id] for utxo_id in utxo_ids if utxo_id in self.utxos]
+
+    def _release_dropped_inputs(self):
+        deadline = self.clock() - self.spend_timeout
+        expired = [utxo for utxo in self.get_utxos(statuses=(SPENDING,)) if utxo.spent_at <= deadline]
+
+        # Inputs of transactions in the open block are still listed, but the sync has already marked those SPENT.
+        for owner in set(utxo.owner for utxo in expired):
+            unspent = set(utxo['utxo_id'] for utxo in self.client.get_utxos('0x' + owner.hex()))
+            for utxo in expired:
+                if utxo.owner == owner and utxo.utxo_id in unspent:
+                    (utxo.status, utxo.spent_at) = (CONFIRMED, 0)
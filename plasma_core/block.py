@@ -1,11 +1,17 @@
 import rlp
 from rlp.sedes import binary, CountableList, big_endian_int
-from ethereum import utils
+from plasma_core.utils.bloom import BloomFilter
+from plasma_core.utils.crypto import sha3
 from plasma_core.utils.merkle.fixed_merkle import FixedMerkle
+from plasma_core.utils.merkle.incremental_merkle import IncrementalMerkle
 from plasma_core.utils.signatures import sign, get_signer
 from plasma_core.utils.transactions import encode_utxo_id
 from plasma_core.transaction import Transaction
-from plasma_core.constants import NULL_SIGNATURE
+from plasma_core.constants import NULL_ADDRESS, NULL_SIGNATURE
+
+
+MERKLE_DEPTH = 16
+MAX_TRANSACTIONS = 2 ** MERKLE_DEPTH
 
 
 class Block(rlp.Serializable):
@@ -17,27 +23,67 @@ class Block(rlp.Serializable):
     ]
 
     def __init__(self, transaction_set=None, number=0, sig=NULL_SIGNATURE):
+        self._cache = {}
+        self._merkle_accumulator = None
         self.transaction_set = transaction_set or []
         self.number = number
         self.sig = sig
         self.spent_utxos = {}
 
+    def __setattr__(self, attr, value):
+        previous = self.__dict__.get(attr)
+        super(Block, self).__setattr__(attr, value)
+        if attr == 'sig':
+            if previous != value:
+                self._cache.pop('signer', None)
+                self._cache.pop('signed_encoded', None)
+        elif attr == 'number':
+            if previous != value:
+                self._cache.clear()
+        elif attr == 'transaction_set':
+            # make_mutable/make_immutable swap list and tuple, keep the cache if the items are the same.
+            if previous is None or len(previous) != len(value) or any(a is not b for a, b in zip(previous, value)):
+                self._cache.clear()
+                self._merkle_accumulator = None
+
+    def _get_cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def sealed(self):
+        return not self.is_mutable()
+
     @property
     def hash(self):
-        return utils.sha3(self.encoded)
+        return self._get_cached('hash', lambda: sha3(self.encoded))
 
     @property
     def signer(self):
-        return get_signer(self.hash, self.sig)
+        return self._get_cached('signer', lambda: get_signer(self.hash, self.sig))
 
     @property
     def merkle(self):
-        hashed_transaction_set = [transaction.merkle_hash for transaction in self.transaction_set]
-        return FixedMerkle(16, hashed_transaction_set, hashed=True)
+        def create_merkle():
+            hashed_transaction_set = [transaction.merkle_hash for transaction in self.transaction_set]
+            return FixedMerkle(MERKLE_DEPTH, hashed_transaction_set, hashed=True, sparse=True)
+        return self._get_cached('merkle', create_merkle)
+
+    @property
+    def merkle_accumulator(self):
+        accumulator = self._merkle_accumulator
+        if accumulator is None or accumulator.size != len(self.transaction_set):
+            hashed_transaction_set = [transaction.merkle_hash for transaction in self.transaction_set]
+            accumulator = IncrementalMerkle(MERKLE_DEPTH, hashed_transaction_set, hashed=True)
+            self._merkle_accumulator = accumulator
+        return accumulator
 
     @property
     def root(self):
-        return self.merkle.root
+        if 'merkle' in self._cache:
+            return self._cache['merkle'].root
+        return self.merkle_accumulator.root
 
     @property
     def is_deposit_block(self):
@@ -45,13 +91,60 @@ class Block(rlp.Serializable):
 
     @property
     def encoded(self):
-        return rlp.encode(self, UnsignedBlock)
+        return self._get_cached('encoded', lambda: rlp.encode(self, UnsignedBlock))
+
+    @property
+    def signed_encoded(self):
+        return self._get_cached('signed_encoded', lambda: rlp.encode(self, Block))
+
+    @property
+    def owner_filter(self):
+        """Bloom filter of the output owners and input owners of the transactions."""
+
+        def create_owner_filter():
+            owners = []
+            for tx in self.transaction_set:
+                owners += [tx.newowner1, tx.newowner2]
+                if not tx.is_deposit_transaction:
+                    owners.append(tx.sender1)
+                if not tx.is_single_utxo:
+                    owners.append(tx.sender2)
+            return BloomFilter.create(owner for owner in owners if owner != NULL_ADDRESS)
+        return self._get_cached('owner_filter', create_owner_filter)
+
+    def get_proof(self, txindex):
+        proofs = self._get_cached('proofs', dict)
+        if txindex not in proofs:
+            proofs[txindex] = self.merkle.create_membership_proof(self.transaction_set[txindex].merkle_hash)
+        return proofs[txindex]
+
+    def set_signer(self, signer):
+        """Stores a signer that was recovered outside of this object."""
+
+        self._cache['signer'] = signer
 
     def sign(self, key):
         self.sig = sign(self.hash, key)
+        self.seal()
+
+    def seal(self):
+        """Makes the block immutable and caches its hash and Merkle tree.
+
+        Sealed blocks never change, so encodings, the signer, the tree and
+        any proofs built from them are computed once and reused.
+        """
+
+        self.make_immutable()
+        self.hash
+        self.merkle
 
     def add_transaction(self, tx):
+        if self.sealed:
+            raise ValueError('Tried to mutate immutable object')
+        accumulator = self.merkle_accumulator
         self.transaction_set.append(tx)
+        accumulator.append(tx.merkle_hash)
+        self._cache.clear()
         inputs = [(tx.blknum1, tx.txindex1, tx.oindex1), (tx.blknum2, tx.txindex2, tx.oindex2)]
         for i in inputs:
             input_id = encode_utxo_id(*i)
@@ -0,0 +1,297 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+import rlp
+from plasma_core.block import Block
+
+
+# Segment records are a (blknum, length, crc32) header followed by the signed RLP encoding of the block.
+RECORD_HEADER = struct.Struct('>QII')
+
+# Index entries are (blknum, offset, length, tx_count, filter_length), where offset points at the record payload,
+# followed by a (relative offset, length) span for the RLP encoding of every transaction and the owner filter.
+INDEX_ENTRY = struct.Struct('>QQIII')
+TX_SPAN = struct.Struct('>II')
+
+
+def read_length_prefix(data, start):
+    """Returns the start and length of the payload of the RLP item at `start`."""
+
+    b0 = data[start]
+    if b0 < 0x80:
+        return (start, 1)
+    elif b0 < 0xb8:
+        return (start + 1, b0 - 0x80)
+    elif b0 < 0xc0:
+        length_of_length = b0 - 0xb7
+        return (start + 1 + length_of_length, int.from_bytes(data[start + 1:start + 1 + length_of_length], 'big'))
+    elif b0 < 0xf8:
+        return (start + 1, b0 - 0xc0)
+    else:
+        length_of_length = b0 - 0xf7
+        return (start + 1 + length_of_length, int.from_bytes(data[start + 1:start + 1 + length_of_length], 'big'))
+
+
+def get_transaction_spans(encoded_block):
+    """Returns the (offset, length) of every transaction inside an RLP encoded block without decoding it."""
+
+    (block_start, _) = read_length_prefix(encoded_block, 0)
+    (position, transactions_length) = read_length_prefix(encoded_block, block_start)
+    end = position + transactions_length
+    spans = []
+    while position < end:
+        (payload_start, payload_length) = read_length_prefix(encoded_block, position)
+        item_end = payload_start + payload_length
+        spans.append((position, item_end - position))
+        position = item_end
+    return spans
+
+
+class BlockStore(object):
+    """Append-only on-disk store of blocks.
+
+    Blocks are appended to a segment file and their position is written to
+    an offset index. Writes are flushed immediately but only fsynced every
+    `sync_interval` blocks, or when `sync` or `close` is called.
+
+    The index also records where every transaction sits inside its block, so
+    a single transaction can be sliced out of the memory-mapped segment
+    without decoding the block. The owner Bloom filter of every block is
+    kept there too, since rebuilding it means recovering every sender.
+
+    Blocks are appended from a single writer, while reads may come from any
+    thread. The in-memory index and the segment map are only swapped under
+    a short lock, and a block becomes visible once it is fully indexed.
+
+    On open, records that were written but never indexed are added back to
+    the index, and a partially written record at the end of the segment is
+    truncated away.
+
+    Args:
+        path (str): Directory to keep the segment and index files in.
+        sync_interval (int): Number of appended blocks between fsyncs.
+    """
+
+    def __init__(self, path, sync_interval=64):
+        os.makedirs(path, exist_ok=True)
+        self.segment_path = os.path.join(path, 'blocks.dat')
+        self.index_path = os.path.join(path, 'blocks.idx')
+        self.sync_interval = sync_interval
+        self.unsynced = 0
+
+        self.offsets = OrderedDict()
+        self.transaction_spans = {}
+        self.owner_filters = {}
+        self._recover()
+
+        self.segment = open(self.segment_path, 'ab')
+        self.index = open(self.index_path, 'ab')
+        self.reader = open(self.segment_path, 'rb')
+        self.segment_map = None
+        self.lock = threading.Lock()
+
+    def __contains__(self, blknum):
+        return blknum in self.offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __iter__(self):
+        """Yields stored blocks in the order they were appended."""
+
+        return self.iter_from(0)
+
+    def iter_from(self, position):
+        """Yields stored blocks in append order, skipping the first `position` records."""
+
+        for blknum in list(self.offsets)[position:]:
+            yield self.get(blknum)
+
+    def block_numbers(self):
+        return list(self.offsets)
+
+    def append(self, block):
+        if block.number in self.offsets:
+            raise ValueError('block {0} is already stored'.format(block.number))
+
+        encoded = block.signed_encoded
+        header = RECORD_HEADER.pack(block.number, len(encoded), zlib.crc32(encoded))
+        offset = self.segment.tell() + RECORD_HEADER.size
+        self.segment.write(header + encoded)
+        self.segment.flush()
+        spans = get_transaction_spans(encoded)
+        owner_filter = bytes(block.owner_filter)
+        self.index.write(self._pack_index_entry(block.number, offset, len(encoded), spans, owner_filter))
+        self.index.flush()
+        with self.lock:
+            self.transaction_spans[block.number] = spans
+            self.owner_filters[block.number] = owner_filter
+            self.offsets[block.number] = (offset, len(encoded))
+
+        self.unsynced += 1
+        if self.unsynced >= self.sync_interval:
+            self.sync()
+
+    def get_encoded(self, blknum):
+        with self.lock:
+            (offset, length) = self.offsets[blknum]
+            view = self._read(offset, length)
+        return bytes(view)
+
+    def get_encoded_transaction(self, blknum, txindex):
+        """Returns a zero-copy view of the signed RLP encoding of a stored transaction."""
+
+        with self.lock:
+            (offset, _) = self.offsets[blknum]
+            (tx_offset, tx_length) = self.transaction_spans[blknum][txindex]
+            return self._read(offset + tx_offset, tx_length)
+
+    def get_owner_filter(self, blknum):
+        """Returns the bits of the owner Bloom filter of a stored block."""
+
+        return self.owner_filters[blknum]
+
+    def get(self, blknum):
+        return rlp.decode(self.get_encoded(blknum), Block)
+
+    def sync(self):
+        self.segment.flush()
+        os.fsync(self.segment.fileno())
+        self.index.flush()
+        os.fsync(self.index.fileno())
+        self.unsynced = 0
+
+    def close(self):
+        self.sync()
+        self.segment.close()
+        self.index.close()
+        self.reader.close()
+        with self.lock:
+            self._unmap()
+
+    def _read(self, offset, length):
+        # Called with the lock held, so concurrent readers never swap the map under each other.
+        if self.segment_map is None or offset + length > len(self.segment_map):
+            self._unmap()
+            self.segment_map = mmap.mmap(self.reader.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self.segment_map)[offset:offset + length]
+
+    def _unmap(self):
+        (segment_map, self.segment_map) = (self.segment_map, None)
+        if segment_map is None:
+            return
+        try:
+            segment_map.close()
+        except BufferError:
+            # Views handed out earlier keep the map alive, it is unmapped once they are released.
+            pass
+
+    def _recover(self):
+        segment_size = os.path.getsize(self.segment_path) if os.path.exists(self.segment_path) else 0
+
+        # Load every complete index entry that points inside the segment.
+        end = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as index:
+                data = index.read()
+            position = 0
+            while position + INDEX_ENTRY.size <= len(data):
+                (blknum, offset, length, tx_count, filter_length) = INDEX_ENTRY.unpack_from(data, position)
+                spans_end = position + INDEX_ENTRY.size + tx_count * TX_SPAN.size
+                entry_end = spans_end + filter_length
+                if entry_end > len(data) or offset + length > segment_size:
+                    break
+                spans = [TX_SPAN.unpack_from(data, span_position)
+                         for span_position in range(position + INDEX_ENTRY.size, spans_end, TX_SPAN.size)]
+                self.offsets[blknum] = (offset, length)
+                self.transaction_spans[blknum] = spans
+                self.owner_filters[blknum] = data[spans_end:entry_end]
+                end = offset + length
+                position = entry_end
+
+        # Scan records after the last indexed one and stop at the first incomplete or corrupt record.
+        missing = []
+        with open(self.segment_path, 'ab+') as segment:
+            segment.seek(end)
+            while end + RECORD_HEADER.size <= segment_size:
+                (blknum, length, checksum) = RECORD_HEADER.unpack(segment.read(RECORD_HEADER.size))
+                payload = segment.read(length)
+                if len(payload) != length or zlib.crc32(payload) != checksum:
+                    break
+                # Unindexed records lost their filter, it is rebuilt from the block.
+                owner_filter = bytes(rlp.decode(payload, Block).owner_filter)
+                missing.append((blknum, end + RECORD_HEADER.size, length, get_transaction_spans(payload), owner_filter))
+                end += RECORD_HEADER.size + length
+            segment.truncate(end)
+
+        # Rewrite the index so that it matches the segment exactly.
+        for (blknum, offset, length, spans, owner_filter) in missing:
+            self.offsets[blknum] = (offset, length)
+            self.transaction_spans[blknum] = spans
+            self.owner_filters[blknum] = owner_filter
+        with open(self.index_path, 'wb') as index:
+            for (blknum, (offset, length)) in self.offsets.items():
+                index.write(self._pack_index_entry(blknum, offset, length, self.transaction_spans[blknum], self.owner_filters[blknum]))
+
+    @staticmethod
+    def _pack_index_entry(blknum, offset, length, spans, owner_filter):
+        entry = INDEX_ENTRY.pack(blknum, offset, length, len(spans), len(owner_filter))
+        return entry + b''.join(TX_SPAN.pack(*span) for span in spans) + owner_filter
+
+
+class BlockCache(object):
+    """Bounded LRU cache of blocks in front of a BlockStore.
+
+    Supports the subset of the dict interface that Chain uses for its
+    blocks. Added blocks are written through to the store. Lookups may come
+    from any thread, the LRU order is kept under a short lock.
+
+    Args:
+        store (BlockStore): Store to read missing blocks from and write new blocks to.
+        size (int): Maximum number of blocks to keep in memory.
+    """
+
+    def __init__(self, store, size=1024):
+        self.store = store
+        self.size = size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __contains__(self, blknum):
+        return blknum in self.cache or blknum in self.store
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, blknum):
+        with self.lock:
+            if blknum in self.cache:
+                self.cache.move_to_end(blknum)
+                return self.cache[blknum]
+        if blknum not in self.store:
+            raise KeyError(blknum)
+        block = self.store.get(blknum)
+        self.remember(block)
+        return block
+
+    def __setitem__(self, blknum, block):
+        self.store.append(block)
+        self.remember(block)
+
+    def get(self, blknum, default=None):
+        try:
+            return self[blknum]
+        except KeyError:
+            return default
+
+    def remember(self, block):
+        """Puts a block in the cache without writing it to the store."""
+
+        with self.lock:
+            self.cache[block.number] = block
+            self.cache.move_to_end(block.number)
+            while len(self.cache) > self.size:
+                self.cache.popitem(last=False)
@@ -1,6 +1,13 @@
+import rlp
+from concurrent.futures import ProcessPoolExecutor
+from plasma_core.utils.signatures import get_signers
 from plasma_core.utils.transactions import decode_utxo_id, encode_utxo_id
 from plasma_core.utils.address import address_to_hex
-from plasma_core.constants import NULL_SIGNATURE
+from plasma_core.utxo_set import UtxoSet
+from plasma_core.block_store import BlockCache
+from plasma_core.snapshot import Snapshot
+from plasma_core.transaction import Transaction
+from plasma_core.constants import NULL_ADDRESS, NULL_SIGNATURE
 from plasma_core.exceptions import (InvalidBlockSignatureException,
                                     InvalidTxSignatureException,
                                     TxAlreadySpentException,
@@ -9,14 +16,43 @@ from plasma_core.exceptions import (InvalidBlockSignatureException,
 
 class Chain(object):
 
-    def __init__(self, operator):
+    def __init__(self, operator, validation_workers=1, validation_batch_size=256,
+                 block_store=None, block_cache_size=1024,
+                 snapshot_store=None, snapshot_interval=1000, exit_journal=None, on_block=None):
         self.operator = operator
-        self.blocks = {}
+        self.validation_workers = validation_workers
+        self.validation_batch_size = validation_batch_size
+        self.validation_executor = None
+        self.block_store = block_store
+        self.snapshot_store = snapshot_store
+        self.snapshot_interval = snapshot_interval
+        self.exit_journal = exit_journal
+        # Called with every block added, including the ones that waited for their parent.
+        self.on_block = on_block
+        self.utxos = UtxoSet()
         self.parent_queue = {}
         self.child_block_interval = 1000
         self.next_child_block = self.child_block_interval
         self.next_deposit_block = 1
 
+        if block_store is None:
+            self.blocks = {}
+        else:
+            self.blocks = BlockCache(block_store, block_cache_size)
+            position = 0
+            if snapshot_store is not None:
+                snapshot = snapshot_store.load_latest(max_block_count=len(block_store))
+                if snapshot is not None:
+                    self._restore(snapshot)
+                    position = snapshot.block_count
+            self._replay(block_store, position)
+
+        # Exits spend outputs outside of any block, they are applied on top of whatever was restored.
+        if exit_journal is not None:
+            with self.utxos.batch():
+                for utxo_id in exit_journal:
+                    self.utxos.remove(utxo_id)
+
     def add_block(self, block):
         # Is the block being added to the head?
         is_next_child_block = block.number == self.next_child_block
@@ -27,11 +63,9 @@ class Chain(object):
             self._apply_block(block)
 
             # Update the head state.
-            if is_next_child_block:
-                self.next_deposit_block = self.next_child_block + 1
-                self.next_child_block += self.child_block_interval
-            else:
-                self.next_deposit_block += 1
+            self._update_head(block)
+            if self.on_block is not None:
+                self.on_block(block)
         # Or does the block not yet have a parent?
         elif block.number > self.next_deposit_block:
             parent_block_number = block.number - 1
@@ -44,10 +78,11 @@ class Chain(object):
             return False
 
         # Process any blocks that were waiting for this block.
-        if block.number in self.parent_queue:
-            for blk in self.parent_queue[block.number]:
-                self.add_block(blk)
-            del self.parent_queue[block.number]
+        for blk in self.parent_queue.pop(block.number, []):
+            self.add_block(blk)
+
+        # Only checkpoint once the queue no longer holds blocks that were applied.
+        self._checkpoint()
         return True
 
     def validate_transaction(self, tx, temp_spent={}):
@@ -55,66 +90,213 @@ class Chain(object):
         output_amount = tx.amount1 + tx.amount2
 
         inputs = [(tx.blknum1, tx.txindex1, tx.oindex1), (tx.blknum2, tx.txindex2, tx.oindex2)]
-        for (blknum, txindex, oindex) in inputs:
+        for (index, (blknum, txindex, oindex)) in enumerate(inputs):
             # Transactions coming from block 0 are valid.
             if blknum == 0:
                 continue
 
-            input_tx = self.blocks[blknum].transaction_set[txindex]
-
-            if oindex == 0:
-                valid_signature = tx.sig1 != NULL_SIGNATURE and input_tx.newowner1 == tx.sender1
-                spent = input_tx.spent1
-                input_amount += input_tx.amount1
-            else:
-                valid_signature = tx.sig2 != NULL_SIGNATURE and input_tx.newowner2 == tx.sender2
-                spent = input_tx.spent2
-                input_amount += input_tx.amount2
-
             # Check to see if the input is already spent.
             utxo_id = encode_utxo_id(blknum, txindex, oindex)
-            if spent or utxo_id in temp_spent:
+            utxo = self.utxos.get(utxo_id)
+            if utxo is None or utxo_id in temp_spent:
                 raise TxAlreadySpentException('failed to validate tx')
 
+            (owner, _, amount) = utxo
+            input_amount += amount
+
+            # Each input must be signed by the owner of the output it spends.
+            if index == 0:
+                valid_signature = tx.sig1 != NULL_SIGNATURE and owner == tx.sender1
+            else:
+                valid_signature = tx.sig2 != NULL_SIGNATURE and owner == tx.sender2
+
             if not valid_signature:
                 raise InvalidTxSignatureException('failed to validate tx')
 
         if not tx.is_deposit_transaction and input_amount < output_amount:
             raise TxAmountMismatchException('failed to validate tx')
 
+        # Whatever the outputs don't claim is left to the operator as a fee.
+        return max(input_amount - output_amount, 0)
+
     def get_block(self, blknum):
         return self.blocks[blknum]
 
+    def get_block_numbers(self, start, end):
+        """Yields the numbers of the blocks in `[start, end)` that exist, in order."""
+
+        blknum = start
+        while blknum < end:
+            if blknum in self.blocks:
+                yield blknum
+                blknum += 1
+            elif blknum % self.child_block_interval == 0:
+                # Deposit blocks may follow a child block we don't have (like block 0).
+                blknum += 1
+            else:
+                # Deposit blocks are numbered consecutively after each child block, skip to the next one.
+                blknum = (blknum // self.child_block_interval + 1) * self.child_block_interval
+
+    def get_owner_filter(self, blknum):
+        """Returns the bits of the owner Bloom filter of a block."""
+
+        if self.block_store is not None and blknum in self.block_store:
+            return self.block_store.get_owner_filter(blknum)
+        return bytes(self.blocks[blknum].owner_filter)
+
     def get_transaction(self, utxo_id):
         (blknum, txindex, _) = decode_utxo_id(utxo_id)
         return self.blocks[blknum].transaction_set[txindex]
 
+    def get_encoded_transaction(self, utxo_id):
+        """Returns the signed RLP encoding of a transaction.
+
+        Stored transactions are sliced straight out of the block store
+        without decoding their block.
+        """
+
+        (blknum, txindex, _) = decode_utxo_id(utxo_id)
+        if self.block_store is not None and blknum in self.block_store:
+            return self.block_store.get_encoded_transaction(blknum, txindex)
+        return rlp.encode(self.get_transaction(utxo_id), Transaction)
+
+    def get_utxo(self, utxo_id):
+        return self.utxos.get(utxo_id)
+
+    def get_utxos(self, owner):
+        return self.utxos.get_utxos(owner)
+
+    def get_balance(self, owner, currency):
+        return self.utxos.get_balance(owner, currency)
+
     def mark_utxo_spent(self, utxo_id):
-        (_, _, oindex) = decode_utxo_id(utxo_id)
-        tx = self.get_transaction(utxo_id)
-        if oindex == 0:
-            tx.spent1 = True
-        else:
-            tx.spent2 = True
+        self.utxos.remove(utxo_id)
+
+    def apply_exit(self, utxo_id):
+        """Spends an output that exited to the root chain and returns its entry, or None if it was not unspent."""
+
+        if utxo_id not in self.utxos:
+            return None
+        # Recorded first, the root chain never sends the exit again.
+        if self.exit_journal is not None:
+            self.exit_journal.append(utxo_id)
+        return self.utxos.remove(utxo_id)
 
-    def _apply_transaction(self, tx):
+    def close(self):
+        """Shuts down the validation worker processes, if any were started."""
+
+        if self.validation_executor is not None:
+            self.validation_executor.shutdown()
+            self.validation_executor = None
+
+    def _apply_transaction(self, tx, blknum, txindex):
         inputs = [(tx.blknum1, tx.txindex1, tx.oindex1), (tx.blknum2, tx.txindex2, tx.oindex2)]
         for i in inputs:
-            (blknum, _, _) = i
-            if blknum == 0:
+            (input_blknum, _, _) = i
+            if input_blknum == 0:
                 continue
             input_id = encode_utxo_id(*i)
             self.mark_utxo_spent(input_id)
 
+        outputs = [(tx.newowner1, tx.amount1), (tx.newowner2, tx.amount2)]
+        for (oindex, (owner, amount)) in enumerate(outputs):
+            if owner == NULL_ADDRESS:
+                continue
+            self.utxos.add(encode_utxo_id(blknum, txindex, oindex), owner, tx.cur12, amount)
+
+    def recover_signers(self, transactions, block=None):
+        """Recovers the signers of many transactions, and optionally their block, in batches.
+
+        Signatures that fail to recover are left for validation to report.
+        """
+
+        requests = []
+        if block is not None and not block.is_deposit_block and block.sig != NULL_SIGNATURE:
+            requests.append((block, 0, block.hash, block.sig))
+        for tx in transactions:
+            if tx.blknum1 != 0 and tx.sig1 != NULL_SIGNATURE:
+                requests.append((tx, 1, tx.hash, tx.sig1))
+            if tx.blknum2 != 0 and tx.sig2 != NULL_SIGNATURE:
+                requests.append((tx, 2, tx.hash, tx.sig2))
+        if not requests:
+            return
+
+        batch_size = self.validation_batch_size
+        batches = [[(hash, sig) for (_, _, hash, sig) in requests[i:i + batch_size]]
+                   for i in range(0, len(requests), batch_size)]
+        if self.validation_workers > 1 and len(batches) > 1:
+            if self.validation_executor is None:
+                self.validation_executor = ProcessPoolExecutor(max_workers=self.validation_workers)
+            results = self.validation_executor.map(get_signers, batches)
+        else:
+            results = map(get_signers, batches)
+        signers = [signer for batch in results for signer in batch]
+
+        for ((obj, index, _, _), signer) in zip(requests, signers):
+            if signer is None:
+                continue
+            if index == 0:
+                obj.set_signer(signer)
+            elif index == 1:
+                obj.set_senders(sender1=signer)
+            else:
+                obj.set_senders(sender2=signer)
+
     def _validate_block(self, block):
+        self.recover_signers(block.transaction_set, block)
+
         # Check for a valid signature.
         if not block.is_deposit_block and (block.sig == NULL_SIGNATURE or address_to_hex(block.signer) != self.operator.lower()):
             raise InvalidBlockSignatureException('failed to validate block')
 
+        # Validate transactions in order, catching inputs spent twice within the block.
+        spent_utxos = {}
         for tx in block.transaction_set:
-            self.validate_transaction(tx)
+            self.validate_transaction(tx, spent_utxos)
+            spent_utxos[encode_utxo_id(tx.blknum1, tx.txindex1, tx.oindex1)] = True
+            spent_utxos[encode_utxo_id(tx.blknum2, tx.txindex2, tx.oindex2)] = True
 
-    def _apply_block(self, block):
-        for tx in block.transaction_set:
-            self._apply_transaction(tx)
-        self.blocks[block.number] = block
+    def _apply_block(self, block, store=True):
+        with self.utxos.batch():
+            for (txindex, tx) in enumerate(block.transaction_set):
+                self._apply_transaction(tx, block.number, txindex)
+        block.seal()
+        if store:
+            # Validation recovered the senders, so the owner filter is cheap to build now and never later.
+            block.owner_filter
+            self.blocks[block.number] = block
+
+    def _update_head(self, block):
+        if block.number == self.next_child_block:
+            self.next_deposit_block = self.next_child_block + 1
+            self.next_child_block += self.child_block_interval
+        else:
+            self.next_deposit_block += 1
+
+    def _replay(self, block_store, position=0):
+        # Stored blocks were validated before they were written, so only their effects are applied.
+        for block in block_store.iter_from(position):
+            self._apply_block(block, store=False)
+            self._update_head(block)
+
+    def snapshot(self):
+        utxos = [(utxo_id,) + utxo for (utxo_id, utxo) in self.utxos.items()]
+        block_count = len(self.block_store) if self.block_store is not None else len(self.blocks)
+        return Snapshot(block_count, self.next_child_block, self.next_deposit_block, utxos, self.parent_queue)
+
+    def _restore(self, snapshot):
+        with self.utxos.batch():
+            for (utxo_id, owner, currency, amount) in snapshot.utxos:
+                self.utxos.add(utxo_id, owner, currency, amount)
+        self.next_child_block = snapshot.next_child_block
+        self.next_deposit_block = snapshot.next_deposit_block
+        self.parent_queue = snapshot.parent_queue
+
+    def _checkpoint(self):
+        if self.snapshot_store is None or self.block_store is None:
+            return
+        if len(self.block_store) % self.snapshot_interval != 0:
+            return
+        # The snapshot must never cover blocks that could still be lost.
+        self.block_store.sync()
+        self.snapshot_store.save(self.snapshot())
@@ -51,3 +51,11 @@ NULL_HASH = NULL_BYTE * 32
 NULL_SIGNATURE = NULL_BYTE * 65
 NULL_ADDRESS = NULL_BYTE * 20
 NULL_ADDRESS_HEX = '0x' + NULL_ADDRESS.hex()
+
+# Binary endpoints of the child chain server, shared with its clients.
+RLP_CONTENT_TYPE = 'application/rlp'
+RLP_PATH = '/rlp/'
+
+# Most block numbers a single request for blocks or block filters may cover, ten child blocks and their deposits.
+MAX_BLOCK_SPAN = 10000
+MAX_BLOCK_FILTER_SPAN = 10000
@@ -0,0 +1,61 @@
+import os
+import struct
+import zlib
+
+
+# Records are a utxo id followed by the crc32 of its packed form.
+RECORD = struct.Struct('>QI')
+
+
+class ExitJournal(object):
+    """Append-only file of the outputs that exited to the root chain.
+
+    Exits don't produce blocks, so they are recorded here to survive a
+    restart. Every record is fsynced before the exit is applied, since the
+    root chain will not send the exit again. On open, a partially written
+    record at the end of the file is truncated away.
+
+    Args:
+        path (str): File to keep the journal in.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.utxo_ids = self._recover()
+        self.journal = open(path, 'ab')
+
+    def __iter__(self):
+        return iter(list(self.utxo_ids))
+
+    def __len__(self):
+        return len(self.utxo_ids)
+
+    def append(self, utxo_id):
+        packed = struct.pack('>Q', utxo_id)
+        self.journal.write(RECORD.pack(utxo_id, zlib.crc32(packed)))
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        self.utxo_ids.append(utxo_id)
+
+    def close(self):
+        self.journal.close()
+
+    def _recover(self):
+        utxo_ids = []
+        if not os.path.exists(self.path):
+            return utxo_ids
+
+        with open(self.path, 'rb+') as journal:
+            data = journal.read()
+            end = 0
+            while end + RECORD.size <= len(data):
+                (utxo_id, checksum) = RECORD.unpack_from(data, end)
+                if zlib.crc32(data[end:end + 8]) != checksum:
+                    break
+                utxo_ids.append(utxo_id)
+                end += RECORD.size
+            journal.truncate(end)
+        return utxo_ids
@@ -0,0 +1,118 @@
+import os
+import re
+import struct
+import zlib
+import rlp
+from rlp.sedes import big_endian_int, binary, CountableList, List
+from plasma_core.block import Block
+
+
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_FILE = re.compile(r'^snapshot-(\d+)\.rlp$')
+
+CHECKSUM = struct.Struct('>I')
+
+utxo_sedes = List([big_endian_int, binary, binary, big_endian_int])
+parent_sedes = List([big_endian_int, CountableList(binary)])
+snapshot_sedes = List([
+    big_endian_int,               # version
+    big_endian_int,               # number of block store records covered
+    big_endian_int,               # next_child_block
+    big_endian_int,               # next_deposit_block
+    CountableList(utxo_sedes),    # utxo id, owner, currency, amount
+    CountableList(parent_sedes),  # parent block number, encoded waiting blocks
+])
+
+
+class Snapshot(object):
+    """Chain state at a point in the block store.
+
+    Snapshots are only taken every so many blocks, so exits applied since
+    may be missing from them. The chain applies its exit journal after
+    restoring a snapshot and replaying the blocks after it.
+
+    Args:
+        block_count (int): Number of block store records applied to this state.
+        next_child_block (int): Head state of the chain.
+        next_deposit_block (int): Head state of the chain.
+        utxos (list): `(utxo_id, owner, currency, amount)` of every unspent output.
+        parent_queue (dict): Blocks waiting for their parent, by parent block number.
+    """
+
+    def __init__(self, block_count, next_child_block, next_deposit_block, utxos, parent_queue):
+        self.block_count = block_count
+        self.next_child_block = next_child_block
+        self.next_deposit_block = next_deposit_block
+        self.utxos = utxos
+        self.parent_queue = parent_queue
+
+    def encode(self):
+        parent_queue = [[blknum, [rlp.encode(block, Block) for block in blocks]]
+                        for (blknum, blocks) in sorted(self.parent_queue.items())]
+        payload = rlp.encode([SNAPSHOT_VERSION, self.block_count, self.next_child_block, self.next_deposit_block,
+                              [list(utxo) for utxo in self.utxos], parent_queue], snapshot_sedes)
+        return CHECKSUM.pack(zlib.crc32(payload)) + payload
+
+    @classmethod
+    def decode(cls, data):
+        (checksum,) = CHECKSUM.unpack_from(data)
+        payload = data[CHECKSUM.size:]
+        if zlib.crc32(payload) != checksum:
+            raise ValueError('snapshot checksum mismatch')
+
+        (version, block_count, next_child_block, next_deposit_block, utxos, parent_queue) = rlp.decode(payload, snapshot_sedes)
+        if version != SNAPSHOT_VERSION:
+            raise ValueError('unsupported snapshot version {0}'.format(version))
+
+        parent_queue = {blknum: [rlp.decode(block, Block) for block in blocks] for (blknum, blocks) in parent_queue}
+        return cls(block_count, next_child_block, next_deposit_block, [tuple(utxo) for utxo in utxos], parent_queue)
+
+
+class SnapshotStore(object):
+    """Directory of chain state snapshots.
+
+    Snapshots are written to a temporary file and renamed into place, so a
+    crash never leaves a half written snapshot behind. Only the newest
+    `keep` snapshots are kept.
+
+    Args:
+        path (str): Directory to keep snapshots in.
+        keep (int): Number of snapshots to keep.
+    """
+
+    def __init__(self, path, keep=2):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.keep = keep
+
+    def list(self):
+        """Returns the block counts of the stored snapshots, newest first."""
+
+        counts = [int(match.group(1)) for match in map(SNAPSHOT_FILE.match, os.listdir(self.path)) if match]
+        return sorted(counts, reverse=True)
+
+    def save(self, snapshot):
+        file_path = os.path.join(self.path, 'snapshot-{0:012d}.rlp'.format(snapshot.block_count))
+        temp_path = file_path + '.tmp'
+        with open(temp_path, 'wb') as snapshot_file:
+            snapshot_file.write(snapshot.encode())
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temp_path, file_path)
+
+        for block_count in self.list()[self.keep:]:
+            os.remove(os.path.join(self.path, 'snapshot-{0:012d}.rlp'.format(block_count)))
+
+    def load_latest(self, max_block_count=None):
+        """Returns the newest readable snapshot that covers at most `max_block_count` records, or None."""
+
+        for block_count in self.list():
+            if max_block_count is not None and block_count > max_block_count:
+                continue
+            try:
+                with open(os.path.join(self.path, 'snapshot-{0:012d}.rlp'.format(block_count)), 'rb') as snapshot_file:
+                    return Snapshot.decode(snapshot_file.read())
+            except (ValueError, struct.error, rlp.DecodingError, rlp.DeserializationError):
+                continue
+        return None
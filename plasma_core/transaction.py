@@ -1,6 +1,7 @@
 import rlp
 from rlp.sedes import big_endian_int, binary
 from ethereum import utils
+from plasma_core.utils.crypto import sha3
 from plasma_core.utils.signatures import get_signer, sign
 from plasma_core.constants import NULL_SIGNATURE
 
@@ -23,6 +24,8 @@ class Transaction(rlp.Serializable):
         ('sig2', binary),
     ]
 
+    field_names = frozenset(field for field, _ in fields)
+
     def __init__(self,
                  blknum1, txindex1, oindex1,
                  blknum2, txindex2, oindex2,
@@ -31,6 +34,8 @@ class Transaction(rlp.Serializable):
                  newowner2, amount2,
                  sig1=NULL_SIGNATURE,
                  sig2=NULL_SIGNATURE):
+        self._cache = {}
+
         # Input 1
         self.blknum1 = blknum1
         self.txindex1 = txindex1
@@ -56,16 +61,32 @@ class Transaction(rlp.Serializable):
         self.confirmation1 = None
         self.confirmation2 = None
 
-        self.spent1 = False
-        self.spent2 = False
+    def __setattr__(self, attr, value):
+        previous = self.__dict__.get(attr)
+        super(Transaction, self).__setattr__(attr, value)
+        if previous == value:
+            return
+        if attr == 'sig1':
+            self._cache.pop('merkle_hash', None)
+            self._cache.pop('sender1', None)
+        elif attr == 'sig2':
+            self._cache.pop('merkle_hash', None)
+            self._cache.pop('sender2', None)
+        elif attr in self.field_names:
+            self._cache.clear()
+
+    def _get_cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
 
     @property
     def hash(self):
-        return utils.sha3(self.encoded)
+        return self._get_cached('hash', lambda: sha3(self.encoded))
 
     @property
     def merkle_hash(self):
-        return utils.sha3(self.hash + self.sig1 + self.sig2)
+        return self._get_cached('merkle_hash', lambda: sha3(self.hash + self.sig1 + self.sig2))
 
     @property
     def is_single_utxo(self):
@@ -77,15 +98,23 @@ class Transaction(rlp.Serializable):
 
     @property
     def sender1(self):
-        return get_signer(self.hash, self.sig1)
+        return self._get_cached('sender1', lambda: get_signer(self.hash, self.sig1))
 
     @property
     def sender2(self):
-        return get_signer(self.hash, self.sig2)
+        return self._get_cached('sender2', lambda: get_signer(self.hash, self.sig2))
 
     @property
     def encoded(self):
-        return rlp.encode(self, UnsignedTransaction)
+        return self._get_cached('encoded', lambda: rlp.encode(self, UnsignedTransaction))
+
+    def set_senders(self, sender1=None, sender2=None):
+        """Stores senders that were recovered outside of this object."""
+
+        if sender1 is not None:
+            self._cache['sender1'] = sender1
+        if sender2 is not None:
+            self._cache['sender2'] = sender2
 
     def sign1(self, key):
         self.sig1 = sign(self.hash, key)
@@ -0,0 +1,50 @@
+from plasma_core.utils.crypto import sha3
+
+
+BITS_PER_ITEM = 10
+HASH_COUNT = 7
+MIN_SIZE = 32
+
+
+class BloomFilter(object):
+    """Set of byte strings that may answer yes for items it doesn't hold, but never no for items it does.
+
+    Every item sets `HASH_COUNT` bits picked from its sha3 hash. Filters
+    made with `create` have about `BITS_PER_ITEM` bits per item, rounded up
+    to a power of two bytes, so about one in a hundred absent items match.
+
+    Args:
+        data (bytes): Bits of the filter, the size of the filter is taken from its length.
+    """
+
+    def __init__(self, data=bytes(MIN_SIZE)):
+        if len(data) == 0:
+            raise ValueError('bloom filter should not be empty')
+        self.data = bytearray(data)
+        self.bit_count = len(data) * 8
+
+    @classmethod
+    def create(cls, items):
+        items = set(items)
+        size = MIN_SIZE
+        while size * 8 < len(items) * BITS_PER_ITEM:
+            size *= 2
+
+        bloom = cls(bytes(size))
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def add(self, item):
+        for bit in self._get_bits(item):
+            self.data[bit // 8] |= 1 << (bit % 8)
+
+    def __contains__(self, item):
+        return all(self.data[bit // 8] & (1 << (bit % 8)) for bit in self._get_bits(item))
+
+    def __bytes__(self):
+        return bytes(self.data)
+
+    def _get_bits(self, item):
+        digest = sha3(item)
+        return [int.from_bytes(digest[i * 4:i * 4 + 4], 'big') % self.bit_count for i in range(HASH_COUNT)]
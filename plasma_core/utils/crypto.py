@@ -0,0 +1,127 @@
+import os
+from ethereum import utils as u
+
+try:
+    import coincurve
+except ImportError:
+    coincurve = None
+
+try:
+    from sha3 import keccak_256 as _keccak_256
+
+    def native_keccak(data):
+        return _keccak_256(data).digest()
+except ImportError:
+    try:
+        from Crypto.Hash import keccak as _keccak
+
+        def native_keccak(data):
+            return _keccak.new(digest_bits=256, data=data).digest()
+    except ImportError:
+        native_keccak = None
+
+
+class EthereumBackend(object):
+    """Signs, recovers and hashes through pyethereum's utils."""
+
+    name = 'ethereum'
+
+    def sha3(self, data):
+        return u.sha3(data)
+
+    def sign(self, hash, key):
+        vrs = u.ecsign(hash, key)
+        rsv = vrs[1:] + vrs[:1]
+        vrs_bytes = [u.encode_int32(i) for i in rsv[:2]] + [u.int_to_bytes(rsv[2])]
+        return b''.join(vrs_bytes)
+
+    def recover(self, hash, sig):
+        v = sig[64]
+        if v < 27:
+            v += 27
+        r = u.bytes_to_int(sig[:32])
+        s = u.bytes_to_int(sig[32:64])
+        pub = u.ecrecover_to_pub(hash, v, r, s)
+        return u.sha3(pub)[-20:]
+
+
+class NativeBackend(object):
+    """Calls libsecp256k1 (coincurve) and a C keccak directly.
+
+    Produces the same signatures and addresses as EthereumBackend.
+    """
+
+    name = 'native'
+
+    def __init__(self):
+        if coincurve is None or native_keccak is None:
+            raise ImportError('native backend requires coincurve and pysha3 or pycryptodome')
+
+    def sha3(self, data):
+        return native_keccak(data)
+
+    def sign(self, hash, key):
+        signature = coincurve.PrivateKey(key).sign_recoverable(hash, hasher=None)
+        return signature[:64] + bytes([signature[64] + 27])
+
+    def recover(self, hash, sig):
+        v = sig[64]
+        if v >= 27:
+            v -= 27
+        try:
+            pk = coincurve.PublicKey.from_signature_and_message(sig[:64] + bytes([v]), hash, hasher=None)
+            pub = pk.format(compressed=False)[1:]
+        except Exception:
+            pub = b'\x00' * 64
+        return native_keccak(pub)[-20:]
+
+
+BACKENDS = {
+    'ethereum': EthereumBackend,
+    'native': NativeBackend,
+}
+
+backend = None
+
+
+def set_backend(name='auto'):
+    """Selects the crypto backend.
+
+    Args:
+        name (str): 'native', 'ethereum' or 'auto'. 'auto' uses the native
+            backend when its libraries are installed.
+
+    Returns:
+        object: The backend that is now in use.
+    """
+
+    global backend
+    if name == 'auto':
+        try:
+            backend = NativeBackend()
+        except ImportError:
+            backend = EthereumBackend()
+    elif name in BACKENDS:
+        backend = BACKENDS[name]()
+    else:
+        raise ValueError('unknown crypto backend {0}'.format(name))
+    return backend
+
+
+def get_backend():
+    return backend
+
+
+def sha3(data):
+    return backend.sha3(data)
+
+
+def ecsign(hash, key):
+    return backend.sign(hash, key)
+
+
+def ecrecover(hash, sig):
+    return backend.recover(hash, sig)
+
+
+set_backend(os.environ.get('PLASMA_CRYPTO_BACKEND', 'auto'))
@@ -1,25 +1,40 @@
-from ethereum.utils import sha3
+from plasma_core.utils.crypto import sha3
 from plasma_core.constants import NULL_HASH
 from .exceptions import MemberNotExistException
 from .node import Node
 
 
+# zero_hashes[i] is the root of an empty subtree of height i.
+zero_hashes = [NULL_HASH]
+
+
+def get_zero_hash(height):
+    while len(zero_hashes) <= height:
+        zero_hashes.append(sha3(zero_hashes[-1] + zero_hashes[-1]))
+    return zero_hashes[height]
+
+
 class FixedMerkle(object):
 
-    def __init__(self, depth, leaves=[], hashed=False):
+    def __init__(self, depth, leaves=[], hashed=False, sparse=False):
         if depth < 1:
             raise ValueError('depth should be at least 1')
 
         self.depth = depth
         self.leaf_count = 2 ** depth
         self.hashed = hashed
+        self.sparse = sparse
 
         if len(leaves) > self.leaf_count:
             raise ValueError('num of leaves exceed max avaiable num with the depth')
 
         if not hashed:
             leaves = [sha3(leaf) for leaf in leaves]
-        self.leaves = leaves + [NULL_HASH] * (self.leaf_count - len(leaves))
+        if sparse:
+            # Only real leaves are kept, empty subtrees are read from the zero hash table.
+            self.leaves = list(leaves)
+        else:
+            self.leaves = leaves + [NULL_HASH] * (self.leaf_count - len(leaves))
         self.tree = [self.create_nodes(self.leaves)]
         self.create_tree(self.tree[0])
 
@@ -27,18 +42,27 @@ class FixedMerkle(object):
         return [Node(leaf) for leaf in leaves]
 
     def create_tree(self, leaves):
-        if len(leaves) == 1:
-            self.root = leaves[0].data
+        height = len(self.tree) - 1
+        if height == self.depth:
+            self.root = leaves[0].data if leaves else get_zero_hash(height)
             return self.root
         next_level = len(leaves)
         tree_level = []
         for i in range(0, next_level, 2):
-            combined = sha3(leaves[i].data + leaves[i + 1].data)
-            next_node = Node(combined, leaves[i], leaves[i + 1])
+            left = leaves[i]
+            right = leaves[i + 1] if i + 1 < next_level else Node(get_zero_hash(height))
+            combined = sha3(left.data + right.data)
+            next_node = Node(combined, left, right)
             tree_level.append(next_node)
         self.tree.append(tree_level)
         self.create_tree(tree_level)
 
+    def get_node_hash(self, height, index):
+        level = self.tree[height]
+        if index < len(level):
+            return level[index].data
+        return get_zero_hash(height)
+
     def check_membership(self, leaf, index, proof):
         if not self.hashed:
             leaf = sha3(leaf)
@@ -66,7 +90,7 @@ class FixedMerkle(object):
             else:
                 sibling_index = index - 1
             index = index // 2
-            proof += self.tree[i][sibling_index].data
+            proof += self.get_node_hash(i, sibling_index)
         return proof
 
     def is_member(self, leaf):
@@ -0,0 +1,56 @@
+from plasma_core.utils.crypto import sha3
+from .fixed_merkle import get_zero_hash
+
+
+class IncrementalMerkle(object):
+    """Append-only Merkle accumulator with the same root as FixedMerkle.
+
+    Only the frontier of the tree is stored: `frontier[i]` is the root of the
+    last completed left subtree of height i. Appending a leaf and computing
+    the root are both O(depth).
+    """
+
+    def __init__(self, depth, leaves=[], hashed=False):
+        if depth < 1:
+            raise ValueError('depth should be at least 1')
+
+        self.depth = depth
+        self.leaf_count = 2 ** depth
+        self.hashed = hashed
+        self.size = 0
+        self.frontier = [None] * (depth + 1)
+
+        for leaf in leaves:
+            self.append(leaf)
+
+    def append(self, leaf):
+        if self.size >= self.leaf_count:
+            raise ValueError('num of leaves exceed max avaiable num with the depth')
+
+        if not self.hashed:
+            leaf = sha3(leaf)
+
+        index = self.size
+        node = leaf
+        height = 0
+        while index % 2 == 1:
+            node = sha3(self.frontier[height] + node)
+            index = index // 2
+            height += 1
+        self.frontier[height] = node
+        self.size += 1
+
+    @property
+    def root(self):
+        if self.size == self.leaf_count:
+            return self.frontier[self.depth]
+
+        node = get_zero_hash(0)
+        size = self.size
+        for height in range(self.depth):
+            if size % 2 == 1:
+                node = sha3(self.frontier[height] + node)
+            else:
+                node = sha3(node + get_zero_hash(height))
+            size = size // 2
+        return node
@@ -1,18 +1,25 @@
-from ethereum import utils as u
+from plasma_core.utils.crypto import ecsign, ecrecover
 
 
 def sign(hash, key):
-    vrs = u.ecsign(hash, key)
-    rsv = vrs[1:] + vrs[:1]
-    vrs_bytes = [u.encode_int32(i) for i in rsv[:2]] + [u.int_to_bytes(rsv[2])]
-    return b''.join(vrs_bytes)
+    return ecsign(hash, key)
 
 
 def get_signer(hash, sig):
-    v = sig[64]
-    if v < 27:
-        v += 27
-    r = u.bytes_to_int(sig[:32])
-    s = u.bytes_to_int(sig[32:64])
-    pub = u.ecrecover_to_pub(hash, v, r, s)
-    return u.sha3(pub)[-20:]
+    return ecrecover(hash, sig)
+
+
+def get_signers(hashes_and_sigs):
+    """Recovers the signer of each (hash, sig) pair.
+
+    Pairs that fail to recover map to None. This is a top level function so
+    that batches can be shipped to worker processes.
+    """
+
+    signers = []
+    for (hash, sig) in hashes_and_sigs:
+        try:
+            signers.append(get_signer(hash, sig))
+        except Exception:
+            signers.append(None)
+    return signers
@@ -0,0 +1,104 @@
+from contextlib import contextmanager
+
+
+class UtxoSet(object):
+    """Index of unspent outputs.
+
+    Outputs are keyed by their packed utxo id (see `encode_utxo_id`) and map
+    to an `(owner, currency, amount)` tuple, so checking or spending an
+    output never touches the block that created it. The set also keeps the
+    unspent outputs and per-currency balance of every owner.
+
+    The per-owner index is copy-on-write: an owner's entry is replaced, never
+    changed in place, so readers on other threads always see a consistent
+    version of it without locking. Changes made inside `batch` are published
+    together when the batch ends.
+    """
+
+    def __init__(self):
+        self.utxos = {}
+        self.owners = {}
+        self.staged = None
+
+    def __contains__(self, utxo_id):
+        return utxo_id in self.utxos
+
+    def __len__(self):
+        return len(self.utxos)
+
+    def __iter__(self):
+        return iter(self.utxos)
+
+    def get(self, utxo_id):
+        """Returns the `(owner, currency, amount)` of an output, or None if it is spent or unknown."""
+
+        return self.utxos.get(utxo_id)
+
+    def add(self, utxo_id, owner, currency, amount):
+        self.remove(utxo_id)
+        self.utxos[utxo_id] = (owner, currency, amount)
+
+        (owned, balances) = self._stage(owner)
+        owned[utxo_id] = (currency, amount)
+        balances[currency] = balances.get(currency, 0) + amount
+        if self.staged is None:
+            self._publish(owner, owned, balances)
+
+    def remove(self, utxo_id):
+        """Removes an output and returns its entry, or None if it was not in the set."""
+
+        utxo = self.utxos.pop(utxo_id, None)
+        if utxo is None:
+            return None
+
+        (owner, currency, amount) = utxo
+        (owned, balances) = self._stage(owner)
+        del owned[utxo_id]
+        balance = balances.get(currency, 0) - amount
+        if balance:
+            balances[currency] = balance
+        else:
+            balances.pop(currency, None)
+        if self.staged is None:
+            self._publish(owner, owned, balances)
+        return utxo
+
+    @contextmanager
+    def batch(self):
+        """Publishes every owner changed inside the block at once, copying each of them only once."""
+
+        self.staged = {}
+        try:
+            yield self
+        finally:
+            (staged, self.staged) = (self.staged, None)
+            for (owner, (owned, balances)) in staged.items():
+                self._publish(owner, owned, balances)
+
+    def items(self):
+        return self.utxos.items()
+
+    def get_utxos(self, owner):
+        """Returns the `(utxo_id, currency, amount)` of every unspent output of an owner, sorted by utxo id."""
+
+        (owned, _) = self.owners.get(owner, ({}, {}))
+        return [(utxo_id,) + owned[utxo_id] for utxo_id in sorted(owned)]
+
+    def get_balance(self, owner, currency):
+        (_, balances) = self.owners.get(owner, ({}, {}))
+        return balances.get(currency, 0)
+
+    def _stage(self, owner):
+        if self.staged is not None and owner in self.staged:
+            return self.staged[owner]
+        (owned, balances) = self.owners.get(owner, ({}, {}))
+        entry = (dict(owned), dict(balances))
+        if self.staged is not None:
+            self.staged[owner] = entry
+        return entry
+
+    def _publish(self, owner, owned, balances):
+        if owned:
+            self.owners[owner] = (owned, balances)
+        else:
+            self.owners.pop(owner, None)
@@ -18,7 +18,7 @@ setup(
     install_requires=[
         'ethereum==2.3.0',
         'web3==4.5.0',
-        'werkzeug==0.14.1',
+        'aiohttp==3.4.4',
         'json-rpc==1.10.8',
         'py-solc',
         'click==6.7',
@@ -26,6 +26,9 @@ setup(
         'flake8==3.5.0',
         'rlp==0.6.0'
     ],
+    extras_require={
+        'fast': ['coincurve', 'pysha3'],
+    },
     entry_points={
         'console_scripts': ["omg=plasma.cli:cli"],
     }
@@ -0,0 +1,47 @@
+import pytest
+from plasma_core.block import Block
+from plasma_core.constants import NULL_ADDRESS
+from plasma_core.transaction import Transaction
+
+
+class FakeChildChain(object):
+    """Stands in for ChildChain where only its current block and subscribers matter."""
+
+    def __init__(self, max_block_transactions=10):
+        self.max_block_transactions = max_block_transactions
+        self.current_block = Block(number=1000)
+        self.submitted = []
+        self.subscribers = {'Block': [], 'Deposit': [], 'Exit': []}
+
+    def add_transaction(self, amount):
+        self.current_block.add_transaction(Transaction(0, 0, 0, 0, 0, 0, NULL_ADDRESS, NULL_ADDRESS, amount, NULL_ADDRESS, 0))
+
+    def submit_block(self, block):
+        self.submitted.append(block)
+        self.current_block = Block(number=block.number + 1000)
+
+    def on(self, event_name, event_handler):
+        self.subscribers[event_name].append(event_handler)
+
+    def broadcast(self, event_name, *args):
+        for subscriber in self.subscribers[event_name]:
+            subscriber(*args)
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def child_chain():
+    return FakeChildChain()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -1,6 +1,7 @@
 import pytest
 from plasma_core.block import Block
-from plasma_core.constants import NULL_SIGNATURE
+from plasma_core.transaction import Transaction
+from plasma_core.constants import NULL_ADDRESS, NULL_SIGNATURE
 from plasma_core.utils.signatures import sign, get_signer
 
 
@@ -18,3 +19,38 @@ def test_signature(t, block):
     block.sign(t.k0)
     assert block.sig == sign(block.hash, t.k0)
     assert block.signer == get_signer(block.hash, sign(block.hash, t.k0))
+
+
+def test_root_tracks_added_transactions(t, block):
+    for i in range(3):
+        block.add_transaction(Transaction(0, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a1, i + 1, NULL_ADDRESS, 0))
+        assert block.root == block.merkle.root
+
+
+def test_sign_seals_block(t, block):
+    block.add_transaction(Transaction(0, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a1, 1, NULL_ADDRESS, 0))
+    block.sign(t.k0)
+    assert block.sealed is True
+    assert block.merkle is block.merkle
+    with pytest.raises(ValueError):
+        block.add_transaction(Transaction(0, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a1, 2, NULL_ADDRESS, 0))
+    with pytest.raises(ValueError):
+        block.number = 1
+
+
+def test_mutation_invalidates_cache(t, block):
+    block.add_transaction(Transaction(0, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a1, 1, NULL_ADDRESS, 0))
+    old_hash = block.hash
+    block.add_transaction(Transaction(0, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a1, 2, NULL_ADDRESS, 0))
+    assert block.hash != old_hash
+    assert block.get_proof(1) == block.merkle.create_membership_proof(block.transaction_set[1].merkle_hash)
+
+
+def test_owner_filter(t, block):
+    tx = Transaction(1, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a2, 1, t.a3, 2)
+    tx.sign1(t.k1)
+    block.add_transaction(tx)
+    assert all(owner in block.owner_filter for owner in [t.a1, t.a2, t.a3])
+
+    block.add_transaction(Transaction(0, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a4, 1, NULL_ADDRESS, 0))
+    assert t.a4 in block.owner_filter
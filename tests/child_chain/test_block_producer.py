@@ -0,0 +1,93 @@
+import pytest
+from plasma.child_chain.block_producer import BlockProducer
+
+
+def test_produce_full_block(t, child_chain):
+    child_chain.max_block_transactions = 2
+    producer = BlockProducer(child_chain, t.k0)
+
+    child_chain.add_transaction(1)
+    producer.notify()
+    assert child_chain.submitted == []
+
+    child_chain.add_transaction(2)
+    producer.notify()
+    assert len(child_chain.submitted) == 1
+    assert child_chain.submitted[0].signer == t.a0
+    assert child_chain.current_block.number == 2000
+
+
+def test_produce_after_delay(t, child_chain, clock):
+    producer = BlockProducer(child_chain, t.k0, max_delay=500, clock=clock)
+
+    assert not producer.poll()
+
+    child_chain.add_transaction(1)
+    producer.notify()
+    clock.now = 0.4
+    child_chain.add_transaction(2)
+    producer.notify()
+    assert not producer.poll()
+
+    # The delay counts from the first transaction in the block.
+    clock.now = 0.5
+    assert producer.poll()
+    assert len(child_chain.submitted[0].transaction_set) == 2
+    assert not producer.poll()
+
+
+def test_delay_restarts_after_external_submit(t, child_chain, clock):
+    producer = BlockProducer(child_chain, t.k0, max_delay=500, clock=clock)
+
+    child_chain.add_transaction(1)
+    producer.notify()
+    child_chain.submit_block(child_chain.current_block)
+
+    clock.now = 0.4
+    child_chain.add_transaction(2)
+    producer.notify()
+    clock.now = 0.6
+    assert not producer.poll()
+    clock.now = 0.9
+    assert producer.poll()
+
+
+def test_failed_submit_leaves_block_open(t, child_chain):
+    producer = BlockProducer(child_chain, t.k0)
+    child_chain.add_transaction(1)
+
+    def fail(block):
+        raise IOError('root chain unavailable')
+    (submit_block, child_chain.submit_block) = (child_chain.submit_block, fail)
+    with pytest.raises(IOError):
+        producer.produce()
+
+    # The current block still takes transactions, and is submitted once the root chain is back.
+    child_chain.add_transaction(2)
+    child_chain.submit_block = submit_block
+    producer.produce()
+    assert len(child_chain.submitted[0].transaction_set) == 2
+    assert child_chain.submitted[0].signer == t.a0
+
+
+def test_reject_non_positive_delay(t, child_chain):
+    with pytest.raises(ValueError):
+        BlockProducer(child_chain, t.k0, max_delay=0)
+
+
+def test_notify_logs_failed_submit(t, child_chain, caplog):
+    child_chain.max_block_transactions = 1
+    producer = BlockProducer(child_chain, t.k0)
+
+    def fail(block):
+        raise IOError('root chain unavailable')
+    (submit_block, child_chain.submit_block) = (child_chain.submit_block, fail)
+    child_chain.add_transaction(1)
+    producer.notify()
+    assert 'Failed to submit block 1000' in caplog.text
+
+    # The full block is retried on the next poll, even without a time trigger.
+    child_chain.submit_block = submit_block
+    assert producer.poll()
+    assert len(child_chain.submitted) == 1
+    assert not producer.poll()
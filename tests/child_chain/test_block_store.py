@@ -0,0 +1,127 @@
+import os
+import pytest
+import rlp
+from plasma_core.block import Block
+from plasma_core.block_store import BlockStore, BlockCache
+from plasma_core.chain import Chain
+from plasma_core.constants import NULL_ADDRESS
+from plasma_core.transaction import Transaction
+from plasma_core.utils.address import address_to_hex
+from plasma_core.utils.transactions import encode_utxo_id, get_deposit_tx
+
+
+@pytest.fixture
+def store_path(tmpdir):
+    return str(tmpdir.join('blocks'))
+
+
+def deposit_block(owner, amount, blknum):
+    return Block([get_deposit_tx(owner, amount)], number=blknum)
+
+
+def test_append_and_get(t, store_path):
+    store = BlockStore(store_path)
+    block = deposit_block(t.a1, 100, 1)
+    store.append(block)
+    assert 1 in store
+    assert store.get(1).hash == block.hash
+    assert store.get_encoded(1) == block.signed_encoded
+    store.close()
+
+    store = BlockStore(store_path)
+    assert store.block_numbers() == [1]
+    assert store.get(1).hash == block.hash
+
+
+def test_recover_truncated_record(t, store_path):
+    store = BlockStore(store_path)
+    store.append(deposit_block(t.a1, 100, 1))
+    store.append(deposit_block(t.a1, 200, 2))
+    store.close()
+
+    # Lose the index and half of the last record.
+    os.remove(os.path.join(store_path, 'blocks.idx'))
+    segment_path = os.path.join(store_path, 'blocks.dat')
+    with open(segment_path, 'r+b') as segment:
+        segment.truncate(os.path.getsize(segment_path) - 10)
+
+    store = BlockStore(store_path)
+    assert store.block_numbers() == [1]
+    store.append(deposit_block(t.a1, 300, 2))
+    assert store.get(2).transaction_set[0].amount1 == 300
+
+
+def test_block_cache_evicts(t, store_path):
+    store = BlockStore(store_path)
+    cache = BlockCache(store, size=1)
+    cache[1] = deposit_block(t.a1, 100, 1)
+    cache[2] = deposit_block(t.a1, 200, 2)
+    assert list(cache.cache) == [2]
+    assert cache[1].transaction_set[0].amount1 == 100
+    assert 3 not in cache
+
+
+def test_chain_replays_block_store(t, store_path):
+    operator = address_to_hex(t.a0)
+    chain = Chain(operator, block_store=BlockStore(store_path))
+    chain.add_block(deposit_block(t.a1, 100, 1))
+    tx = Transaction(1, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a2, 100, NULL_ADDRESS, 0)
+    tx.sign1(t.k1)
+    block = Block([tx], number=chain.next_child_block)
+    block.sign(t.k0)
+    chain.add_block(block)
+    chain.block_store.close()
+
+    chain = Chain(operator, block_store=BlockStore(store_path))
+    assert chain.next_child_block == 2000
+    assert chain.next_deposit_block == 1001
+    assert chain.get_utxo(encode_utxo_id(1, 0, 0)) is None
+    assert chain.get_utxo(encode_utxo_id(1000, 0, 0)) == (t.a2, NULL_ADDRESS, 100)
+    assert chain.get_block(1000).hash == block.hash
+
+
+def test_get_encoded_transaction(t, store_path):
+    txs = [Transaction(1, i, 0, 0, 0, 0, NULL_ADDRESS, t.a1, i, NULL_ADDRESS, 0) for i in range(3)]
+    block = Block(txs, number=1000)
+    store = BlockStore(store_path)
+    store.append(block)
+    for (txindex, tx) in enumerate(txs):
+        assert bytes(store.get_encoded_transaction(1000, txindex)) == rlp.encode(tx, Transaction)
+    store.close()
+
+    os.remove(os.path.join(store_path, 'blocks.idx'))
+    store = BlockStore(store_path)
+    assert bytes(store.get_encoded_transaction(1000, 2)) == rlp.encode(txs[2], Transaction)
+
+
+def test_owner_filters_are_persisted(t, store_path):
+    store = BlockStore(store_path)
+    store.append(deposit_block(t.a1, 100, 1))
+    store.append(deposit_block(t.a2, 200, 2))
+    owner_filters = [store.get_owner_filter(1), store.get_owner_filter(2)]
+    assert owner_filters[0] == bytes(deposit_block(t.a1, 100, 1).owner_filter)
+    store.close()
+
+    store = BlockStore(store_path)
+    assert [store.get_owner_filter(1), store.get_owner_filter(2)] == owner_filters
+    store.close()
+
+    # Filters of records missing from the index are rebuilt.
+    os.remove(os.path.join(store_path, 'blocks.idx'))
+    store = BlockStore(store_path)
+    assert [store.get_owner_filter(1), store.get_owner_filter(2)] == owner_filters
+
+
+def test_close_unmaps_segment(t, store_path):
+    store = BlockStore(store_path)
+    store.append(deposit_block(t.a1, 100, 1))
+    store.get_encoded(1)
+    segment_map = store.segment_map
+    store.close()
+    assert segment_map.closed
+
+    # A view that is still held keeps its map readable.
+    store = BlockStore(store_path)
+    view = store.get_encoded_transaction(1, 0)
+    store.close()
+    assert bytes(view) == rlp.encode(get_deposit_tx(t.a1, 100), Transaction)
@@ -0,0 +1,139 @@
+import pytest
+from plasma_core.block import Block
+from plasma_core.chain import Chain
+from plasma_core.constants import NULL_ADDRESS
+from plasma_core.exceptions import TxAlreadySpentException
+from plasma_core.transaction import Transaction
+from plasma_core.utils.address import address_to_hex
+from plasma_core.utils.transactions import encode_utxo_id, get_deposit_tx
+
+
+@pytest.fixture
+def chain(t):
+    return Chain(address_to_hex(t.a0))
+
+
+def add_deposit(chain, owner, amount):
+    blknum = chain.next_deposit_block
+    chain.add_block(Block([get_deposit_tx(owner, amount)], number=blknum))
+    return blknum
+
+
+def test_validate_block_in_process_pool(t):
+    chain = Chain(address_to_hex(t.a0), validation_workers=2, validation_batch_size=1)
+    deposits = [add_deposit(chain, t.a1, 100) for _ in range(3)]
+
+    block = Block(number=chain.next_child_block)
+    for blknum in deposits:
+        tx = Transaction(blknum, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a2, 100, NULL_ADDRESS, 0)
+        tx.sign1(t.k1)
+        block.add_transaction(tx)
+    block.sign(t.k0)
+
+    assert chain.add_block(block) is True
+    assert chain.get_block(block.number).transaction_set[0].sender1 == t.a1
+
+    executor = chain.validation_executor
+    chain.close()
+    assert chain.validation_executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(len, [])
+
+
+def test_validate_block_double_spend_within_block(t, chain):
+    blknum = add_deposit(chain, t.a1, 100)
+
+    block = Block(number=chain.next_child_block)
+    for newowner in [t.a2, t.a3]:
+        tx = Transaction(blknum, 0, 0, 0, 0, 0, NULL_ADDRESS, newowner, 100, NULL_ADDRESS, 0)
+        tx.sign1(t.k1)
+        block.transaction_set.append(tx)
+    block.sign(t.k0)
+
+    with pytest.raises(TxAlreadySpentException):
+        chain.add_block(block)
+
+
+def test_utxo_set_tracks_outputs(t, chain):
+    blknum = add_deposit(chain, t.a1, 100)
+    deposit_id = encode_utxo_id(blknum, 0, 0)
+    assert chain.get_utxo(deposit_id) == (t.a1, NULL_ADDRESS, 100)
+
+    tx = Transaction(blknum, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a2, 60, t.a1, 40)
+    tx.sign1(t.k1)
+    block = Block([tx], number=chain.next_child_block)
+    block.sign(t.k0)
+    chain.add_block(block)
+
+    assert chain.get_utxo(deposit_id) is None
+    assert chain.get_utxo(encode_utxo_id(block.number, 0, 0)) == (t.a2, NULL_ADDRESS, 60)
+    assert chain.get_utxo(encode_utxo_id(block.number, 0, 1)) == (t.a1, NULL_ADDRESS, 40)
+
+
+def test_exited_utxo_cannot_be_spent(t, chain):
+    blknum = add_deposit(chain, t.a1, 100)
+    chain.mark_utxo_spent(encode_utxo_id(blknum, 0, 0))
+
+    tx = Transaction(blknum, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a2, 100, NULL_ADDRESS, 0)
+    tx.sign1(t.k1)
+    with pytest.raises(TxAlreadySpentException):
+        chain.validate_transaction(tx)
+
+
+def test_owner_index_and_balances(t, chain):
+    blknum1 = add_deposit(chain, t.a1, 100)
+    blknum2 = add_deposit(chain, t.a1, 50)
+    assert chain.get_utxos(t.a1) == [(encode_utxo_id(blknum1, 0, 0), NULL_ADDRESS, 100),
+                                     (encode_utxo_id(blknum2, 0, 0), NULL_ADDRESS, 50)]
+    assert chain.get_balance(t.a1, NULL_ADDRESS) == 150
+
+    tx = Transaction(blknum1, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a2, 70, t.a1, 30)
+    tx.sign1(t.k1)
+    block = Block([tx], number=chain.next_child_block)
+    block.sign(t.k0)
+    chain.add_block(block)
+
+    assert chain.get_balance(t.a1, NULL_ADDRESS) == 80
+    assert chain.get_balance(t.a2, NULL_ADDRESS) == 70
+    assert chain.get_utxos(t.a2) == [(encode_utxo_id(block.number, 0, 0), NULL_ADDRESS, 70)]
+
+    chain.mark_utxo_spent(encode_utxo_id(block.number, 0, 0))
+    assert chain.get_utxos(t.a2) == []
+    assert chain.get_balance(t.a2, NULL_ADDRESS) == 0
+
+
+def test_owner_index_is_copy_on_write(t, chain):
+    blknum = add_deposit(chain, t.a1, 100)
+    (owned, balances) = chain.utxos.owners[t.a1]
+
+    add_deposit(chain, t.a1, 50)
+
+    # Readers holding the previous version never see it change.
+    assert list(owned) == [encode_utxo_id(blknum, 0, 0)]
+    assert balances == {NULL_ADDRESS: 100}
+    assert chain.get_balance(t.a1, NULL_ADDRESS) == 150
+
+
+def test_get_block_numbers(t, chain):
+    add_deposit(chain, t.a1, 100)
+    add_deposit(chain, t.a1, 100)
+    block = Block(number=chain.next_child_block)
+    block.sign(t.k0)
+    chain.add_block(block)
+    add_deposit(chain, t.a1, 100)
+    block = Block(number=chain.next_child_block)
+    block.sign(t.k0)
+    chain.add_block(block)
+
+    assert list(chain.get_block_numbers(0, 3000)) == [1, 2, 1000, 1001, 2000]
+    assert list(chain.get_block_numbers(2, 1001)) == [2, 1000]
+
+
+def test_on_block_sees_queued_blocks(t):
+    added = []
+    chain = Chain(address_to_hex(t.a0), on_block=lambda block: added.append(block.number))
+
+    chain.add_block(Block([get_deposit_tx(t.a1, 100)], number=2))
+    assert added == []
+    chain.add_block(Block([get_deposit_tx(t.a1, 100)], number=1))
+    assert added == [1, 2]
@@ -1,4 +1,9 @@
 import pytest
+from plasma.child_chain.exceptions import InternalErrorException
+from plasma_core.block import Block
+from plasma_core.constants import NULL_ADDRESS, MAX_BLOCK_SPAN
+from plasma_core.transaction import Transaction
+from plasma_core.utils.transactions import decode_utxo_id, encode_utxo_id, get_deposit_tx
 from plasma_core.exceptions import (InvalidBlockSignatureException,
                                     InvalidTxSignatureException,
                                     TxAlreadySpentException)
@@ -77,3 +82,73 @@ def test_submit_block_invalid_sig(test_lang):
 
     with pytest.raises(InvalidBlockSignatureException):
         test_lang.submit_block(owner_1)
+
+
+def test_broadcast_queued_deposits(test_lang):
+    owner = test_lang.get_account()
+    child_chain = test_lang.child_chain
+    deposits = []
+    child_chain.on('Deposit', lambda block: deposits.append(block.number))
+
+    blknum = child_chain.chain.next_deposit_block
+    child_chain.writer.call(child_chain._apply_deposit, Block([get_deposit_tx(owner['address'], 100)], number=blknum + 1))
+    assert deposits == []
+
+    # The deposit that waited for its parent is broadcast once it is applied.
+    child_chain.writer.call(child_chain._apply_deposit, Block([get_deposit_tx(owner['address'], 100)], number=blknum))
+    assert deposits == [blknum, blknum + 1]
+
+
+def test_apply_transactions(test_lang):
+    owner_1 = test_lang.get_account()
+    owner_2 = test_lang.get_account()
+    amount = 100
+
+    deposit_id = test_lang.deposit(owner_1, amount)
+    tx = Transaction(*decode_utxo_id(deposit_id), 0, 0, 0, NULL_ADDRESS, owner_2['address'], amount, NULL_ADDRESS, 0)
+    tx.sign1(owner_1['key'])
+    double_spend = Transaction(*decode_utxo_id(deposit_id), 0, 0, 0, NULL_ADDRESS, owner_1['address'], amount, NULL_ADDRESS, 0)
+    double_spend.sign1(owner_1['key'])
+
+    results = test_lang.child_chain.apply_transactions([tx, double_spend])
+
+    blknum = test_lang.child_chain.get_current_block().number
+    assert results[0] == encode_utxo_id(blknum, 0, 0)
+    assert isinstance(results[1], TxAlreadySpentException)
+
+
+def test_apply_transactions_reports_internal_errors(test_lang, monkeypatch):
+    owner_1 = test_lang.get_account()
+    owner_2 = test_lang.get_account()
+
+    deposit_ids = [test_lang.deposit(owner_1, 100) for _ in range(2)]
+    transactions = []
+    for deposit_id in deposit_ids:
+        tx = Transaction(*decode_utxo_id(deposit_id), 0, 0, 0, NULL_ADDRESS, owner_2['address'], 100, NULL_ADDRESS, 0)
+        tx.sign1(owner_1['key'])
+        transactions.append(tx)
+
+    child_chain = test_lang.child_chain
+    validate_transaction = child_chain.chain.validate_transaction
+
+    def fail_first(tx, temp_spent):
+        if tx is transactions[0]:
+            raise RuntimeError('disk unavailable')
+        return validate_transaction(tx, temp_spent)
+    monkeypatch.setattr(child_chain.chain, 'validate_transaction', fail_first)
+
+    results = child_chain.apply_transactions(transactions)
+
+    # The failure stays with its transaction, the rest of the batch is applied.
+    assert isinstance(results[0], InternalErrorException)
+    assert isinstance(results[0].__cause__, RuntimeError)
+    assert results[1] == encode_utxo_id(child_chain.get_current_block().number, 0, 0)
+
+
+def test_reject_bad_block_ranges(test_lang):
+    child_chain = test_lang.child_chain
+    for (start, end) in [(-1, 10), (10, 5), (0, MAX_BLOCK_SPAN + 1)]:
+        with pytest.raises(ValueError):
+            child_chain.get_block_numbers(start, end)
+    with pytest.raises(ValueError):
+        child_chain.get_current_block_since(-1)
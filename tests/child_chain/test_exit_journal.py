@@ -0,0 +1,50 @@
+import os
+import pytest
+from plasma_core.block import Block
+from plasma_core.block_store import BlockStore
+from plasma_core.chain import Chain
+from plasma_core.constants import NULL_ADDRESS
+from plasma_core.exit_journal import ExitJournal
+from plasma_core.utils.address import address_to_hex
+from plasma_core.utils.transactions import encode_utxo_id, get_deposit_tx
+
+
+@pytest.fixture
+def data_path(tmpdir):
+    return str(tmpdir)
+
+
+def test_append_and_recover(data_path):
+    journal_path = os.path.join(data_path, 'exits.log')
+    journal = ExitJournal(journal_path)
+    journal.append(1000000000)
+    journal.append(2000000000)
+    journal.close()
+
+    # Lose half of the last record.
+    with open(journal_path, 'r+b') as journal_file:
+        journal_file.truncate(os.path.getsize(journal_path) - 5)
+
+    journal = ExitJournal(journal_path)
+    assert list(journal) == [1000000000]
+    journal.append(3000000000)
+    journal.close()
+    assert list(ExitJournal(journal_path)) == [1000000000, 3000000000]
+
+
+def test_exited_utxo_stays_spent_after_restart(t, data_path):
+    operator = address_to_hex(t.a0)
+    block_path = os.path.join(data_path, 'blocks')
+    journal_path = os.path.join(data_path, 'exits.log')
+    chain = Chain(operator, block_store=BlockStore(block_path), exit_journal=ExitJournal(journal_path))
+    chain.add_block(Block([get_deposit_tx(t.a1, 100)], number=1))
+    chain.add_block(Block([get_deposit_tx(t.a1, 200)], number=2))
+    assert chain.apply_exit(encode_utxo_id(1, 0, 0)) == (t.a1, NULL_ADDRESS, 100)
+    assert chain.apply_exit(encode_utxo_id(1, 0, 0)) is None
+    chain.block_store.close()
+    chain.exit_journal.close()
+
+    chain = Chain(operator, block_store=BlockStore(block_path), exit_journal=ExitJournal(journal_path))
+    assert chain.get_utxo(encode_utxo_id(1, 0, 0)) is None
+    assert chain.get_balance(t.a1, NULL_ADDRESS) == 200
+    assert len(chain.exit_journal) == 1
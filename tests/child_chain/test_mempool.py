@@ -0,0 +1,92 @@
+import pytest
+from plasma.child_chain.exceptions import MempoolFullException
+from plasma.child_chain.mempool import Mempool
+from plasma_core.constants import NULL_ADDRESS
+from plasma_core.exceptions import TxAlreadySpentException
+from plasma_core.transaction import Transaction
+
+
+def make_tx(t, blknum, amount):
+    tx = Transaction(blknum, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a1, amount, NULL_ADDRESS, 0)
+    tx.sign1(t.k1)
+    return tx
+
+
+def test_pop_highest_fee_first(t):
+    mempool = Mempool()
+    txs = [make_tx(t, blknum, 100) for blknum in range(1, 4)]
+    for (tx, fee) in zip(txs, [5, 20, 10]):
+        mempool.add(tx, fee)
+    assert mempool.pop(2) == [txs[1], txs[2]]
+    assert mempool.pop(2) == [txs[0]]
+    assert len(mempool) == 0
+
+
+def test_conflicting_transaction(t):
+    mempool = Mempool()
+    tx = make_tx(t, 1, 100)
+    mempool.add(tx, 10)
+
+    with pytest.raises(TxAlreadySpentException):
+        mempool.add(make_tx(t, 1, 95), 5)
+
+    replacement = make_tx(t, 1, 80)
+    mempool.add(replacement, 20)
+    assert tx not in mempool
+    assert mempool.pop(10) == [replacement]
+
+
+def test_expire_old_transactions(t):
+    mempool = Mempool(max_age=10)
+    old_tx, new_tx = make_tx(t, 1, 100), make_tx(t, 2, 100)
+    mempool.add(old_tx, 1, now=0)
+    mempool.add(new_tx, 1, now=5)
+    assert mempool.pop(10, now=12) == [new_tx]
+
+
+def test_evict_lowest_fee_when_full(t):
+    tx = make_tx(t, 1, 100)
+    size = len(tx.encoded) + len(tx.sig1) + len(tx.sig2)
+    mempool = Mempool(max_size=size)
+    mempool.add(tx, 1)
+
+    with pytest.raises(MempoolFullException):
+        mempool.add(make_tx(t, 2, 100), 1)
+
+    richer_tx = make_tx(t, 3, 100)
+    mempool.add(richer_tx, 2)
+    assert tx not in mempool
+    assert richer_tx in mempool
+
+
+def test_replace_in_full_pool(t):
+    tx, other_tx = make_tx(t, 1, 100), make_tx(t, 2, 100)
+    size = len(tx.encoded) + len(tx.sig1) + len(tx.sig2)
+    mempool = Mempool(max_size=2 * size)
+    mempool.add(tx, 5)
+    mempool.add(other_tx, 1)
+
+    # The replaced transaction makes room, nothing else is evicted.
+    replacement = make_tx(t, 1, 90)
+    mempool.add(replacement, 10)
+    assert tx not in mempool
+    assert replacement in mempool
+    assert other_tx in mempool
+    assert mempool.size == 2 * size
+
+
+def test_full_pool_keeps_transactions_when_add_fails(t):
+    txs = [make_tx(t, blknum, 100) for blknum in range(1, 4)]
+    size = len(txs[0].encoded) + len(txs[0].sig1) + len(txs[0].sig2)
+    mempool = Mempool(max_size=2 * size)
+    mempool.add(txs[0], 1)
+    mempool.add(txs[1], 5)
+
+    with pytest.raises(MempoolFullException):
+        mempool.add(txs[2], 1)
+    assert len(mempool) == 2
+
+    # The lowest paying transaction can still be evicted afterwards.
+    mempool.add(txs[2], 3)
+    assert txs[0] not in mempool
+    assert mempool.pop(10) == [txs[1], txs[2]]
@@ -0,0 +1,152 @@
+from plasma.child_chain.root_chain_submitter import RootChainSubmitter, QUEUED, SENT, CONFIRMED, FAILED
+
+
+class FakeEth(object):
+
+    def __init__(self):
+        self.gasPrice = 100
+        self.sent = []
+        self.receipts = {}
+        self.transaction_count = {'latest': 7, 'pending': 7}
+        self.current_child_block = 1000
+
+    def getTransactionCount(self, address, block_identifier):
+        return self.transaction_count[block_identifier]
+
+    def getTransactionReceipt(self, tx_hash):
+        return self.receipts.get(tx_hash)
+
+
+class FakeRootChain(object):
+
+    def __init__(self, eth):
+        self.eth = eth
+        self.functions = self
+
+    def submitBlock(self, root):
+        self.root = root
+        return self
+
+    def currentChildBlock(self):
+        return self
+
+    def call(self):
+        return self.eth.current_child_block
+
+    def transact(self, transaction):
+        if transaction['nonce'] < self.eth.transaction_count['pending']:
+            raise ValueError('nonce too low')
+        tx_hash = len(self.eth.sent)
+        self.eth.sent.append((self.root, transaction['nonce'], transaction['gasPrice']))
+        return tx_hash
+
+
+class FakeWeb3(object):
+
+    def __init__(self):
+        self.eth = FakeEth()
+
+
+def create_submitter(clock, **kwargs):
+    w3 = FakeWeb3()
+    submitter = RootChainSubmitter(FakeRootChain(w3.eth), '0x0', w3=w3, clock=clock, **kwargs)
+    return (submitter, w3.eth)
+
+
+def test_pipeline_nonces(clock):
+    (submitter, eth) = create_submitter(clock, max_in_flight=2)
+    for blknum in [1000, 2000, 3000]:
+        submitter.submit(blknum, b'root' + bytes([blknum // 1000]))
+    assert submitter.get_status(1000) == QUEUED
+
+    submitter.step()
+    assert eth.sent == [(b'root\x01', 7, 100), (b'root\x02', 8, 100)]
+    assert submitter.get_status(2000) == SENT
+    assert submitter.get_status(3000) == QUEUED
+
+    eth.receipts[0] = {'status': 1}
+    submitter.step()
+    assert submitter.get_status(1000) == CONFIRMED
+    assert eth.sent[2] == (b'root\x03', 9, 100)
+
+
+def test_resubmit_stalled_with_higher_gas_price(clock):
+    (submitter, eth) = create_submitter(clock, stall_timeout=10, gas_price_bump=20)
+    submitter.submit(1000, b'root')
+    submitter.step()
+
+    clock.now = 5
+    submitter.step()
+    assert len(eth.sent) == 1
+
+    clock.now = 10
+    submitter.step()
+    assert eth.sent[1] == (b'root', 7, 120)
+
+    # The original transaction may still be the one that gets mined.
+    eth.receipts[0] = {'status': 1}
+    submitter.step()
+    assert submitter.get_status(1000) == CONFIRMED
+    assert submitter.get_status(2000) is None
+
+
+def test_resync_nonce_when_rejected(clock):
+    (submitter, eth) = create_submitter(clock)
+    submitter.submit(1000, b'root\x01')
+    submitter.step()
+
+    # Another transaction of the operator took the next nonce.
+    eth.transaction_count['pending'] = 9
+    submitter.submit(2000, b'root\x02')
+    submitter.step()
+    assert eth.sent == [(b'root\x01', 7, 100), (b'root\x02', 9, 100)]
+    assert submitter.get_status(2000) == SENT
+    assert submitter.nonce == 10
+
+
+def test_failed_submission_stops_pipeline(clock):
+    (submitter, eth) = create_submitter(clock, max_in_flight=1)
+    for blknum in [1000, 2000]:
+        submitter.submit(blknum, b'root' + bytes([blknum // 1000]))
+    submitter.step()
+
+    eth.receipts[0] = {'status': 0}
+    eth.transaction_count = {'latest': 8, 'pending': 8}
+    submitter.step()
+    assert submitter.get_status(1000) == FAILED
+    assert submitter.error is not None
+    assert len(eth.sent) == 1
+
+    # The failed root goes out again before the ones after it.
+    submitter.resume()
+    submitter.step()
+    assert submitter.get_status(1000) == SENT
+    assert eth.sent[1] == (b'root\x01', 8, 100)
+    assert submitter.get_status(2000) == QUEUED
+
+
+def test_stalled_nonce_used_by_another_transaction(clock):
+    (submitter, eth) = create_submitter(clock, stall_timeout=10)
+    submitter.submit(1000, b'root')
+    submitter.step()
+
+    eth.transaction_count = {'latest': 8, 'pending': 8}
+    clock.now = 10
+    submitter.step()
+    assert submitter.get_status(1000) == FAILED
+    assert 1000 not in submitter.in_flight
+
+
+def test_resume_while_running_keeps_nonce(clock):
+    (submitter, eth) = create_submitter(clock)
+    submitter.submit(1000, b'root')
+    submitter.step()
+    submitter.resume()
+    assert submitter.nonce == 8
+
+
+def test_recover_unmined_roots(clock):
+    (submitter, eth) = create_submitter(clock)
+    eth.current_child_block = 2000
+    submitter.recover(lambda blknum: b'root' + bytes([blknum // 1000]), 4000)
+    assert list(submitter.queue.items()) == [(2000, b'root\x02'), (3000, b'root\x03')]
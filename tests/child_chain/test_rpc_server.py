@@ -0,0 +1,102 @@
+import asyncio
+import json
+from aiohttp.test_utils import TestClient, TestServer
+from jsonrpc import Dispatcher
+from plasma.child_chain.rpc_server import accepts_encoding, create_app, ImmutableBody
+from plasma_core.constants import RLP_CONTENT_TYPE
+
+
+def send(app, *requests):
+    async def send_all():
+        responses = []
+        async with TestClient(TestServer(app)) as client:
+            for (method, path, data, *headers) in requests:
+                response = await client.request(method, path, data=data, headers=headers[0] if headers else None)
+                responses.append((response.status, response.content_type, await response.read()))
+        return responses
+    return asyncio.new_event_loop().run_until_complete(send_all())
+
+
+def post(app, payload):
+    [(status, _, body)] = send(app, ('POST', '/jsonrpc', json.dumps(payload)))
+    if status == 204:
+        return None
+    return json.loads(body.decode())
+
+
+def create_test_app():
+    dispatcher = Dispatcher()
+    dispatcher["add"] = lambda a, b: a + b
+    blocks = {1: b'\xc1\x01'}
+    rlp_handlers = {
+        ('GET', 'block/{blknum}'): lambda params, body: blocks[int(params['blknum'])],
+        ('POST', 'block'): lambda params, body: blocks.__setitem__(2, body),
+        ('POST', 'length'): lambda params, body: {'length': len(body)},
+        ('GET', 'immutable'): lambda params, body: ImmutableBody(b'\x00' * 1000, '"abc"'),
+        ('GET', 'stream'): lambda params, body: (bytes([i]) * 10 for i in range(int(params['count']))),
+    }
+    return create_app(dispatcher, rlp_handlers, max_concurrency=2, workers=2)
+
+
+def test_single_request():
+    response = post(create_test_app(), {"method": "add", "params": [1, 2], "jsonrpc": "2.0", "id": 0})
+    assert response == {"result": 3, "jsonrpc": "2.0", "id": 0}
+
+
+def test_batch_request():
+    response = post(create_test_app(), [
+        {"method": "add", "params": [1, 2], "jsonrpc": "2.0", "id": 0},
+        {"method": "missing", "params": [], "jsonrpc": "2.0", "id": 1},
+        {"method": "add", "params": [3, 4], "jsonrpc": "2.0", "id": 2},
+    ])
+    assert [r.get("result") for r in response] == [3, None, 7]
+    assert response[1]["error"]["code"] == -32601
+
+
+def test_notification_only():
+    assert post(create_test_app(), {"method": "add", "params": [1, 2], "jsonrpc": "2.0"}) is None
+
+
+def test_rlp_endpoints():
+    responses = send(create_test_app(),
+                     ('GET', '/rlp/', None),
+                     ('GET', '/rlp/block/1', None),
+                     ('GET', '/rlp/block/3', None),
+                     ('POST', '/rlp/block', b'\xc0'),
+                     ('GET', '/rlp/block/2', None),
+                     ('POST', '/rlp/length', b'\x00' * 3),
+                     ('GET', '/rlp/block/x', None))
+
+    assert responses[0] == (200, 'text/plain', RLP_CONTENT_TYPE.encode())
+    assert responses[1] == (200, RLP_CONTENT_TYPE, b'\xc1\x01')
+    assert responses[2][0] == 404
+    assert responses[3][0] == 204
+    assert responses[4][2] == b'\xc0'
+    assert json.loads(responses[5][2].decode()) == {'length': 3}
+    assert responses[6][0] == 400
+
+
+def test_immutable_body():
+    responses = send(create_test_app(),
+                     ('GET', '/rlp/immutable', None),
+                     ('GET', '/rlp/immutable', None, {'If-None-Match': '"abc"'}),
+                     ('GET', '/rlp/immutable', None, {'If-None-Match': '"def"', 'Accept-Encoding': 'identity'}))
+
+    # The test client asks for gzip and decompresses transparently.
+    assert responses[0] == (200, RLP_CONTENT_TYPE, b'\x00' * 1000)
+    assert responses[1][0] == 304
+    assert responses[2] == (200, RLP_CONTENT_TYPE, b'\x00' * 1000)
+
+
+def test_accepts_encoding():
+    assert accepts_encoding('gzip, deflate', 'gzip')
+    assert not accepts_encoding('gzip;q=0, deflate', 'gzip')
+    assert accepts_encoding('deflate;q=0.5, *', 'gzip')
+    assert not accepts_encoding('*;q=0, identity', 'gzip')
+    assert not accepts_encoding('', 'gzip')
+
+
+def test_stream():
+    [(status, content_type, body)] = send(create_test_app(), ('GET', '/rlp/stream?count=3', None))
+    assert (status, content_type) == (200, RLP_CONTENT_TYPE)
+    assert body == b'\x00' * 10 + b'\x01' * 10 + b'\x02' * 10
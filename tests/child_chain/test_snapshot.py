@@ -0,0 +1,95 @@
+from plasma_core.block import Block
+from plasma_core.block_store import BlockStore
+from plasma_core.chain import Chain
+from plasma_core.constants import NULL_ADDRESS
+from plasma_core.exit_journal import ExitJournal
+from plasma_core.snapshot import Snapshot, SnapshotStore
+from plasma_core.utils.address import address_to_hex
+from plasma_core.utils.transactions import encode_utxo_id, get_deposit_tx
+
+
+def test_encode_decode(t):
+    waiting = Block([get_deposit_tx(t.a1, 5)], number=3)
+    snapshot = Snapshot(2, 1000, 3, [(encode_utxo_id(1, 0, 0), t.a1, NULL_ADDRESS, 100)], {2: [waiting]})
+    decoded = Snapshot.decode(snapshot.encode())
+    assert decoded.block_count == 2
+    assert decoded.next_child_block == 1000
+    assert decoded.next_deposit_block == 3
+    assert decoded.utxos == snapshot.utxos
+    assert decoded.parent_queue[2][0].hash == waiting.hash
+
+
+def test_chain_restarts_from_snapshot(t, tmpdir):
+    operator = address_to_hex(t.a0)
+    block_path, snapshot_path = str(tmpdir.join('blocks')), str(tmpdir.join('snapshots'))
+
+    chain = Chain(operator, block_store=BlockStore(block_path),
+                  snapshot_store=SnapshotStore(snapshot_path), snapshot_interval=2)
+    for blknum in range(1, 4):
+        chain.add_block(Block([get_deposit_tx(t.a1, blknum)], number=blknum))
+    chain.block_store.close()
+    assert SnapshotStore(snapshot_path).list() == [2]
+
+    chain = Chain(operator, block_store=BlockStore(block_path),
+                  snapshot_store=SnapshotStore(snapshot_path), snapshot_interval=2)
+    assert chain.next_deposit_block == 4
+    assert chain.get_balance(t.a1, NULL_ADDRESS) == 6
+    assert chain.get_utxo(encode_utxo_id(3, 0, 0)) == (t.a1, NULL_ADDRESS, 3)
+
+
+def test_exits_between_snapshots_survive_restart(t, tmpdir):
+    operator = address_to_hex(t.a0)
+    block_path, snapshot_path = str(tmpdir.join('blocks')), str(tmpdir.join('snapshots'))
+    journal_path = str(tmpdir.join('exits.log'))
+
+    def open_chain():
+        return Chain(operator, block_store=BlockStore(block_path), snapshot_store=SnapshotStore(snapshot_path),
+                     snapshot_interval=2, exit_journal=ExitJournal(journal_path))
+
+    chain = open_chain()
+    for blknum in range(1, 4):
+        chain.add_block(Block([get_deposit_tx(t.a1, blknum)], number=blknum))
+
+    # One output comes from the snapshot and one from the replayed blocks, neither exit is in a snapshot.
+    chain.apply_exit(encode_utxo_id(1, 0, 0))
+    chain.apply_exit(encode_utxo_id(3, 0, 0))
+    chain.block_store.close()
+    chain.exit_journal.close()
+    assert SnapshotStore(snapshot_path).list() == [2]
+
+    chain = open_chain()
+    assert chain.get_utxo(encode_utxo_id(1, 0, 0)) is None
+    assert chain.get_utxo(encode_utxo_id(3, 0, 0)) is None
+    assert chain.get_balance(t.a1, NULL_ADDRESS) == 2
+
+
+def test_snapshot_ahead_of_block_store_is_ignored(t, tmpdir):
+    snapshot_store = SnapshotStore(str(tmpdir.join('snapshots')))
+    snapshot_store.save(Snapshot(5, 1000, 6, [], {}))
+    assert snapshot_store.load_latest(max_block_count=4) is None
+    assert snapshot_store.load_latest().block_count == 5
+
+
+def test_snapshot_while_child_is_queued(t, tmpdir):
+    operator = address_to_hex(t.a0)
+    block_path, snapshot_path = str(tmpdir.join('blocks')), str(tmpdir.join('snapshots'))
+
+    chain = Chain(operator, block_store=BlockStore(block_path),
+                  snapshot_store=SnapshotStore(snapshot_path), snapshot_interval=2)
+    chain.add_block(Block([get_deposit_tx(t.a1, 1)], number=1))
+    # Block 3 waits for block 2, and both are applied once block 2 arrives.
+    assert not chain.add_block(Block([get_deposit_tx(t.a1, 3)], number=3))
+    assert chain.add_block(Block([get_deposit_tx(t.a1, 2)], number=2))
+    chain.block_store.close()
+    assert chain.parent_queue == {}
+
+    chain = Chain(operator, block_store=BlockStore(block_path),
+                  snapshot_store=SnapshotStore(snapshot_path), snapshot_interval=2)
+    assert chain.parent_queue == {}
+    assert chain.next_deposit_block == 4
+    assert chain.get_balance(t.a1, NULL_ADDRESS) == 6
+
+    # Block 3 is neither applied twice nor left waiting after the restart.
+    chain.add_block(Block([get_deposit_tx(t.a1, 4)], number=4))
+    assert chain.next_deposit_block == 5
+    assert chain.get_balance(t.a1, NULL_ADDRESS) == 10
@@ -0,0 +1,83 @@
+import asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from plasma.child_chain.subscriptions import Subscription, Subscriptions
+from plasma_core.block import Block
+from plasma_core.constants import NULL_ADDRESS
+from plasma_core.utils.address import address_to_hex
+from plasma_core.utils.transactions import get_deposit_tx
+
+
+class FakeSocket(dict):
+    __hash__ = object.__hash__
+
+
+def run(child_chain, session):
+    subscriptions = Subscriptions(child_chain)
+    app = web.Application()
+    app.on_startup.append(subscriptions.on_startup)
+    app.router.add_get('/ws', subscriptions.handle)
+
+    async def connect():
+        async with TestClient(TestServer(app)) as client:
+            ws = await client.ws_connect('/ws')
+            result = await session(ws)
+            await ws.close()
+            return result
+    return asyncio.new_event_loop().run_until_complete(connect())
+
+
+def test_deposit_subscription_with_owner_filter(t, child_chain):
+
+    async def session(ws):
+        await ws.send_json({'subscribe': 'deposits', 'owner': address_to_hex(t.a1)})
+        assert await ws.receive_json() == {'subscribed': 'deposits'}
+
+        child_chain.broadcast('Deposit', Block([get_deposit_tx(t.a2, 50)], number=1))
+        child_chain.broadcast('Deposit', Block([get_deposit_tx(t.a1, 100)], number=2))
+        return await ws.receive_json()
+
+    event = run(child_chain, session)
+    assert event == {'type': 'deposit', 'blknum': 2, 'owner': address_to_hex(t.a1),
+                     'currency': address_to_hex(NULL_ADDRESS), 'amount': 100}
+
+
+def test_block_subscription(t, child_chain):
+    block = Block([get_deposit_tx(t.a1, 100)], number=1000)
+    block.sign(t.k0)
+
+    async def session(ws):
+        await ws.send_json({'subscribe': 'blocks', 'full': True})
+        await ws.receive_json()
+        child_chain.broadcast('Block', block)
+        return await ws.receive_json()
+
+    event = run(child_chain, session)
+    assert event['number'] == 1000
+    assert event['root'] == block.root.hex()
+    assert event['transaction_count'] == 1
+    assert event['block'] == block.signed_encoded.hex()
+
+
+def test_invalid_subscription(t, child_chain):
+    async def session(ws):
+        await ws.send_json({'subscribe': 'everything'})
+        return await ws.receive_json()
+
+    assert 'error' in run(child_chain, session)
+
+
+def test_slow_client_is_dropped_without_backlog(child_chain):
+    subscriptions = Subscriptions(child_chain, max_pending=2)
+    (slow, other) = (FakeSocket(queue=asyncio.Queue()), FakeSocket(queue=asyncio.Queue()))
+    subscriptions.connections = {slow: [Subscription('blocks')], other: [Subscription('blocks')]}
+    slow['queue'].put_nowait({'number': 1000})
+    slow['queue'].put_nowait({'number': 2000})
+
+    def get_full_event():
+        raise AssertionError('nobody asked for the full block')
+
+    subscriptions._dispatch('blocks', set(), {'number': 3000}, get_full_event)
+    assert slow not in subscriptions.connections
+    assert (slow['queue'].qsize(), slow['queue'].get_nowait()) == (1, None)
+    assert other['queue'].get_nowait() == {'number': 3000}
@@ -30,3 +30,19 @@ def test_transaction(t):
     assert tx.sender1 == oldowner1
     tx.sign2(key2)
     assert tx.sender2 == oldowner2
+
+
+def test_cached_values_invalidated(t):
+    tx = Transaction(1, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a1, 100, NULL_ADDRESS, 0)
+    tx.sign1(t.k1)
+    old_hash, old_merkle_hash = tx.hash, tx.merkle_hash
+    assert tx.sender1 == t.a1
+
+    tx.sign1(t.k2)
+    assert tx.hash == old_hash
+    assert tx.merkle_hash != old_merkle_hash
+    assert tx.sender1 == t.a2
+
+    tx.amount1 = 50
+    assert tx.hash != old_hash
+    assert tx.sender1 != t.a2
@@ -0,0 +1,53 @@
+import threading
+import pytest
+from plasma.child_chain.writer import Writer
+
+
+def test_changes_run_in_order_on_one_thread():
+    threads = []
+    results = []
+
+    def change(i):
+        threads.append(threading.current_thread())
+        results.append(i)
+        return i
+
+    writer = Writer()
+    futures = [writer.submit(change, i) for i in range(10)]
+    assert [future.result() for future in futures] == list(range(10))
+    assert results == list(range(10))
+    assert set(threads) == {writer.thread}
+    writer.stop()
+
+
+def test_call_raises_and_commits():
+    commits = []
+    writer = Writer(lambda: commits.append(threading.current_thread()))
+
+    def fail():
+        raise ValueError('failed')
+
+    with pytest.raises(ValueError):
+        writer.call(fail)
+    assert commits == [writer.thread]
+    writer.stop()
+
+
+def test_nested_call_runs_in_place():
+    writer = Writer()
+    assert writer.call(lambda: writer.call(lambda: 42)) == 42
+    writer.stop()
+
+
+def test_failed_commit_resolves_future():
+    def commit():
+        raise ValueError('failed')
+
+    writer = Writer(commit)
+    with pytest.raises(ValueError):
+        writer.call(lambda: 1)
+
+    # The writer thread survives and runs the next change.
+    writer.on_commit = None
+    assert writer.call(lambda: 2) == 2
+    writer.stop()
@@ -0,0 +1,52 @@
+import asyncio
+import socket
+import threading
+import pytest
+import rlp
+from aiohttp import web
+from jsonrpc import Dispatcher
+from plasma.child_chain.rpc_server import create_app
+from plasma_core.constants import MAX_BLOCK_SPAN, MAX_BLOCK_FILTER_SPAN
+
+
+def get_blocks(start, end):
+    if end - start > MAX_BLOCK_SPAN:
+        raise ValueError('span too large')
+    return (rlp.encode([blknum, bytes(32)]) for blknum in range(start, end))
+
+
+def get_block_filters(start, end):
+    # Like the child chain, only a few block numbers after each child block exist.
+    if end - start > MAX_BLOCK_FILTER_SPAN:
+        raise ValueError('span too large')
+    return [[blknum, bytes([blknum % 256])] for blknum in range(start, end) if blknum % 1000 < 4]
+
+
+@pytest.fixture
+def server_url():
+    dispatcher = Dispatcher()
+    dispatcher["add"] = lambda a, b: a + b
+    dispatcher["fail"] = lambda: 1 // 0
+    dispatcher["get_block_filters"] = lambda start, end: [{'number': blknum, 'filter': block_filter.hex()} for (blknum, block_filter) in get_block_filters(start, end)]
+    rlp_handlers = {
+        ('GET', 'blocks'): lambda params, body: get_blocks(int(params['from']), int(params['to'])),
+        ('GET', 'block_filters'): lambda params, body: rlp.encode(get_block_filters(int(params['from']), int(params['to']))),
+    }
+    app = create_app(dispatcher, rlp_handlers, workers=2)
+
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        port = sock.getsockname()[1]
+
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, 'localhost', port).start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield 'http://localhost:{0}/jsonrpc'.format(port)
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.run_until_complete(runner.cleanup())
@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+import rlp
+from plasma.client.async_child_chain_service import AsyncChildChainService
+from plasma.client.exceptions import ChildChainServiceError
+
+
+def run(coroutine):
+    return asyncio.new_event_loop().run_until_complete(coroutine)
+
+
+def test_send_request(server_url):
+    async def send():
+        service = AsyncChildChainService(server_url, pool_size=2, timeout=5)
+        try:
+            results = await asyncio.gather(*[service.send_request("add", [i, i]) for i in range(20)])
+            with pytest.raises(ChildChainServiceError):
+                await service.send_request("fail", [])
+            return results
+        finally:
+            await service.close()
+
+    assert run(send()) == [2 * i for i in range(20)]
+
+
+def test_send_batch_request(server_url):
+    async def send():
+        service = AsyncChildChainService(server_url)
+        try:
+            return await service.send_batch_request([("add", [1, 2]), ("fail", []), ("add", [3, 4])])
+        finally:
+            await service.close()
+
+    results = run(send())
+    assert results[0] == 3
+    assert isinstance(results[1], ChildChainServiceError)
+    assert results[2] == 7
+
+
+def test_get_blocks(server_url):
+    async def get_blocks():
+        service = AsyncChildChainService(server_url)
+        try:
+            return [encoded_block async for encoded_block in service.get_blocks(1, 50)]
+        finally:
+            await service.close()
+
+    assert [rlp.decode(encoded_block) for encoded_block in run(get_blocks())] == [[rlp.utils.int_to_big_endian(i), bytes(32)] for i in range(1, 50)]
@@ -0,0 +1,55 @@
+import pytest
+import rlp
+from plasma.client.child_chain_service import BlockFileCache, ChildChainService
+from plasma.client.exceptions import ChildChainServiceError
+from plasma_core.constants import MAX_BLOCK_SPAN, MAX_BLOCK_FILTER_SPAN
+
+
+def test_send_request(server_url):
+    service = ChildChainService(server_url, pool_size=2, timeout=5)
+    assert service.send_request("add", [1, 2]) == 3
+    with pytest.raises(ChildChainServiceError):
+        service.send_request("fail", [])
+
+
+def test_send_batch_request(server_url):
+    service = ChildChainService(server_url)
+    results = service.send_batch_request([("add", [1, 2]), ("fail", []), ("add", [3, 4])])
+    assert results[0] == 3
+    assert isinstance(results[1], ChildChainServiceError)
+    assert results[2] == 7
+    assert service.send_batch_request([]) == []
+
+
+def test_get_blocks(server_url):
+    service = ChildChainService(server_url)
+    assert [rlp.decode(encoded_block) for encoded_block in service.get_blocks(1, 50)] == [[rlp.utils.int_to_big_endian(i), bytes(32)] for i in range(1, 50)]
+
+
+def test_get_blocks_in_spans(server_url):
+    service = ChildChainService(server_url)
+    end = MAX_BLOCK_SPAN * 2 + 5
+    assert [rlp.decode(encoded_block)[0] for encoded_block in service.get_blocks(1, end)] == [rlp.utils.int_to_big_endian(i) for i in range(1, end)]
+
+
+def test_get_block_filters(server_url):
+    service = ChildChainService(server_url)
+    expected = [(blknum, bytes([blknum])) for blknum in range(1, 4)]
+    assert service.get_block_filters(1, 4) == expected
+
+    service.binary = False
+    assert service.get_block_filters(1, 4) == expected
+
+
+def test_get_block_filters_in_spans(server_url):
+    service = ChildChainService(server_url)
+    end = MAX_BLOCK_FILTER_SPAN * 2 + 1000
+    block_filters = service.get_block_filters(1, end)
+    assert [blknum for (blknum, _) in block_filters] == [blknum for blknum in range(1, end) if blknum % 1000 < 4]
+
+
+def test_block_file_cache_per_chain(tmpdir):
+    path = str(tmpdir)
+    BlockFileCache(path, '0xA3B2').put(1000, b'block')
+    assert BlockFileCache(path, '0xa3b2').get(1000) == b'block'
+    assert BlockFileCache(path, '0xC3D4').get(1000) is None
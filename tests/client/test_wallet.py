@@ -0,0 +1,193 @@
+import pytest
+from plasma_core.block import Block
+from plasma_core.constants import NULL_ADDRESS
+from plasma_core.transaction import Transaction
+from plasma_core.utils.transactions import encode_utxo_id, get_deposit_tx
+from plasma.client.exceptions import InsufficientFundsException
+from plasma.client.wallet import Wallet, PENDING, CONFIRMED, SPENDING, SPENT, EXITING
+
+
+class FakeClient(object):
+
+    def __init__(self):
+        self.blocks = {}
+        self.current_block = Block(number=1000)
+        self.mempool = []
+        self.exits = []
+        self.fetched = []
+        self.unspent = {}
+
+    def add_deposit(self, owner, amount):
+        blknum = max([n for n in self.blocks if n < self.current_block.number] + [self.current_block.number - 1000]) + 1
+        self.blocks[blknum] = Block([get_deposit_tx(owner, amount)], number=blknum)
+        return blknum
+
+    def seal(self):
+        self.blocks[self.current_block.number] = self.current_block
+        self.current_block = Block(number=self.current_block.number + 1000)
+
+    def apply_transaction(self, tx):
+        self.current_block.add_transaction(tx)
+
+    def queue_transaction(self, tx):
+        self.mempool.append(tx)
+
+    def get_block(self, blknum):
+        self.fetched.append(blknum)
+        return self.blocks[blknum]
+
+    def get_block_filters(self, start, end):
+        return [(n, self.blocks[n].owner_filter) for n in sorted(self.blocks) if start <= n < end]
+
+    def get_current_block_since(self, index, blknum=None):
+        if blknum != self.current_block.number:
+            index = 0
+        return (self.current_block.number, index, list(self.current_block.transaction_set[index:]))
+
+    def get_utxos(self, address):
+        return [{'utxo_id': utxo_id} for utxo_id in self.unspent.get(address, [])]
+
+    def withdraw(self, blknum, txindex, oindex, tx, proof, sigs):
+        self.exits.append((blknum, txindex, oindex, sigs))
+
+    def withdraw_deposit(self, owner, deposit_pos, amount):
+        self.exits.append((owner, deposit_pos, amount))
+
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+
+def test_sync_follows_blocks_incrementally(t, client):
+    wallet = Wallet(client, [t.k1])
+    blknum = client.add_deposit(t.a1, 100)
+    client.add_deposit(t.a2, 50)
+    wallet.sync()
+
+    assert [utxo.utxo_id for utxo in wallet.get_utxos()] == [encode_utxo_id(blknum, 0, 0)]
+    assert wallet.next_blknum == blknum + 2
+
+    tx = Transaction(blknum, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a2, 30, t.a1, 70)
+    tx.sign1(t.k1)
+    client.apply_transaction(tx)
+    wallet.sync()
+
+    change_id = encode_utxo_id(1000, 0, 1)
+    assert wallet.utxos[encode_utxo_id(blknum, 0, 0)].status == SPENT
+    assert wallet.utxos[change_id].status == PENDING
+    assert wallet.get_balance() == 0
+    assert wallet.get_balance(statuses=(PENDING,)) == 70
+
+    client.seal()
+    wallet.sync()
+    assert wallet.utxos[change_id].status == CONFIRMED
+    assert wallet.get_balance() == 70
+    assert wallet.next_blknum == 1001
+
+
+def test_sync_skips_blocks_filtered_out(t, client):
+    wallet = Wallet(client, [t.k1])
+    other = client.add_deposit(t.a2, 50)
+    own = client.add_deposit(t.a1, 100)
+    wallet.sync()
+
+    assert client.fetched == [own]
+    assert wallet.next_blknum == own + 1
+    assert other not in client.fetched
+
+
+def test_cursor_is_persisted(t, client, tmpdir):
+    path = str(tmpdir.join('wallet.rlp'))
+    blknum = client.add_deposit(t.a1, 100)
+    Wallet(client, [t.k1], path).sync()
+
+    wallet = Wallet(client, [t.k1], path)
+    assert wallet.next_blknum == blknum + 1
+    assert wallet.get_balance() == 100
+
+
+def test_select_utxos(t, client):
+    wallet = Wallet(client, [t.k1])
+    for amount in [10, 40, 70]:
+        client.add_deposit(t.a1, amount)
+    wallet.sync()
+
+    assert [utxo.amount for utxo in wallet.select_utxos(35)] == [40]
+    assert sorted(utxo.amount for utxo in wallet.select_utxos(80)) == [10, 70]
+    assert sorted(utxo.amount for utxo in wallet.select_utxos(110)) == [40, 70]
+    with pytest.raises(InsufficientFundsException):
+        wallet.select_utxos(120)
+
+
+def test_send_builds_signed_transaction(t, client):
+    wallet = Wallet(client, [t.k1])
+    first = client.add_deposit(t.a1, 60)
+    second = client.add_deposit(t.a1, 50)
+    wallet.sync()
+
+    tx = wallet.send(t.a2, 100, fee=5)
+
+    assert (tx.sender1, tx.sender2) == (t.a1, t.a1)
+    assert (tx.newowner1, tx.amount1, tx.newowner2, tx.amount2) == (t.a2, 100, t.a1, 5)
+    assert wallet.utxos[encode_utxo_id(first, 0, 0)].status == SPENDING
+    assert client.current_block.transaction_set == [tx]
+
+    wallet.sync()
+    assert wallet.utxos[encode_utxo_id(first, 0, 0)].status == SPENT
+    assert wallet.utxos[encode_utxo_id(second, 0, 0)].status == SPENT
+
+
+def test_start_exit(t, client):
+    wallet = Wallet(client, [t.k1])
+    blknum = client.add_deposit(t.a1, 100)
+    wallet.sync()
+    wallet.send(t.a1, 100)
+    client.seal()
+    wallet.sync()
+
+    utxo_id = encode_utxo_id(1000, 0, 0)
+    wallet.start_exit(utxo_id)
+    assert wallet.utxos[utxo_id].status == EXITING
+    assert client.exits[0][:3] == (1000, 0, 0)
+    assert len(client.exits[0][3]) == 65 * 3
+    assert wallet.get_utxos() == []
+    assert wallet.utxos[encode_utxo_id(blknum, 0, 0)].status == SPENT
+
+
+def test_release_inputs_of_dropped_transaction(t, client):
+    clock = [0]
+    wallet = Wallet(client, [t.k1], spend_timeout=60, clock=lambda: clock[0])
+    blknum = client.add_deposit(t.a1, 100)
+    utxo_id = encode_utxo_id(blknum, 0, 0)
+    client.unspent['0x' + t.a1.hex()] = [utxo_id]
+    wallet.sync()
+
+    # The transaction only made it into the mempool, which later drops it.
+    client.apply_transaction = client.queue_transaction
+    wallet.send(t.a2, 100)
+    wallet.sync()
+    assert wallet.utxos[utxo_id].status == SPENDING
+    assert wallet.get_balance() == 0
+
+    clock[0] = 60
+    wallet.sync()
+    assert wallet.utxos[utxo_id].status == CONFIRMED
+    assert wallet.get_balance() == 100
+
+
+def test_sync_never_merges_another_block(t, client):
+    wallet = Wallet(client, [t.k1])
+    blknum = client.add_deposit(t.a1, 100)
+    tx = Transaction(blknum, 0, 0, 0, 0, 0, NULL_ADDRESS, t.a2, 30, t.a1, 70)
+    tx.sign1(t.k1)
+    client.apply_transaction(tx)
+    wallet.sync()
+    client.seal()
+
+    # A server that skips the transactions the wallet already has, even though the block changed.
+    get_current_block_since = client.get_current_block_since
+    client.get_current_block_since = lambda index, blknum=None: get_current_block_since(index, client.current_block.number if index else None)
+    wallet.sync()
+    assert wallet.current_block.number == 2000
+    assert wallet.current_block.transaction_set == []
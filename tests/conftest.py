@@ -75,3 +75,4 @@ def test_lang():
     t = TestingLanguage()
     yield t
     t.child_chain.event_listener.stop_all()
+    t.child_chain.close()
@@ -0,0 +1,31 @@
+import os
+import pytest
+from plasma_core.utils.bloom import BloomFilter, MIN_SIZE
+
+
+def test_holds_added_items():
+    items = [os.urandom(20) for _ in range(500)]
+    bloom = BloomFilter.create(items)
+    assert all(item in bloom for item in items)
+
+
+def test_false_positive_rate():
+    bloom = BloomFilter.create(os.urandom(20) for _ in range(1000))
+    false_positives = sum(os.urandom(20) in bloom for _ in range(10000))
+    assert false_positives < 300
+
+
+def test_size_grows_with_items():
+    assert len(bytes(BloomFilter.create([]))) == MIN_SIZE
+    assert len(bytes(BloomFilter.create(os.urandom(20) for _ in range(1000)))) == 2048
+
+
+def test_round_trip():
+    bloom = BloomFilter.create([b'\x01' * 20])
+    assert b'\x01' * 20 in BloomFilter(bytes(bloom))
+    assert b'\x02' * 20 not in BloomFilter(bytes(MIN_SIZE))
+
+
+def test_empty_data():
+    with pytest.raises(ValueError):
+        BloomFilter(b'')
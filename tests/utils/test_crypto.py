@@ -0,0 +1,32 @@
+import pytest
+from plasma_core.utils.crypto import EthereumBackend, NativeBackend, set_backend, get_backend
+
+
+@pytest.fixture
+def native():
+    try:
+        return NativeBackend()
+    except ImportError:
+        pytest.skip('native crypto backend is not installed')
+
+
+def test_native_matches_ethereum(t, native):
+    ethereum = EthereumBackend()
+    message = ethereum.sha3(b'plasma')
+    assert native.sha3(b'plasma') == message
+
+    sig = native.sign(message, t.k1)
+    assert sig == ethereum.sign(message, t.k1)
+    assert native.recover(message, sig) == t.a1
+    assert ethereum.recover(message, sig) == t.a1
+
+
+def test_set_backend():
+    previous = get_backend()
+    try:
+        assert set_backend('ethereum').name == 'ethereum'
+        assert get_backend().name == 'ethereum'
+        with pytest.raises(ValueError):
+            set_backend('unknown')
+    finally:
+        set_backend(previous.name)
@@ -76,3 +76,35 @@ def test_non_member():
     merkle = FixedMerkle(2, leaves, True)
     assert merkle.not_member(b'b') is False
     assert merkle.not_member(b'd') is True
+
+
+def test_sparse_initial_state():
+    assert FixedMerkle(2, sparse=True).leaves == []
+    assert FixedMerkle(16, [b'a'], True, sparse=True).leaves == [b'a']
+
+
+def test_sparse_hash_empty_tree():
+    assert FixedMerkle(1, [], True, sparse=True).root == FixedMerkle(1, [], True).root
+    assert FixedMerkle(16, [], True, sparse=True).root == get_empty_merkle_tree_hash(16)
+
+
+def test_sparse_matches_dense():
+    for leaves in [[b'a'], [b'a', b'b', b'c'], [b'a', b'b', b'c', b'd', b'e']]:
+        dense = FixedMerkle(4, leaves)
+        sparse = FixedMerkle(4, leaves, sparse=True)
+        assert sparse.root == dense.root
+        for leaf in leaves:
+            assert sparse.create_membership_proof(leaf) == dense.create_membership_proof(leaf)
+
+
+def test_sparse_full_tree():
+    leaves = [b'a', b'b', b'c', b'd']
+    assert FixedMerkle(2, leaves, sparse=True).root == FixedMerkle(2, leaves).root
+
+
+def test_sparse_check_membership():
+    leaves = [b'a', b'b', b'c']
+    merkle = FixedMerkle(16, leaves, sparse=True)
+    proof = merkle.create_membership_proof(b'c')
+    assert merkle.check_membership(b'c', 2, proof) is True
+    assert merkle.check_membership(b'c', 1, proof) is False
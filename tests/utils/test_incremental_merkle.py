@@ -0,0 +1,29 @@
+import pytest
+from plasma_core.utils.merkle.fixed_merkle import FixedMerkle
+from plasma_core.utils.merkle.incremental_merkle import IncrementalMerkle
+
+
+def test_empty_root():
+    assert IncrementalMerkle(1).root == FixedMerkle(1).root
+    assert IncrementalMerkle(16).root == FixedMerkle(16, sparse=True).root
+
+
+def test_append_matches_fixed_merkle():
+    leaves = [b'a', b'b', b'c', b'd', b'e']
+    merkle = IncrementalMerkle(3)
+    for i, leaf in enumerate(leaves):
+        merkle.append(leaf)
+        assert merkle.size == i + 1
+        assert merkle.root == FixedMerkle(3, leaves[:i + 1]).root
+
+
+def test_full_tree():
+    leaves = [b'a', b'b', b'c', b'd']
+    merkle = IncrementalMerkle(2, leaves)
+    assert merkle.root == FixedMerkle(2, leaves).root
+
+
+def test_append_more_than_depth_permits():
+    merkle = IncrementalMerkle(1, [b'a', b'b'])
+    with pytest.raises(ValueError):
+        merkle.append(b'c')
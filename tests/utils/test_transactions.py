@@ -0,0 +1,6 @@
+from plasma_core.utils.transactions import decode_utxo_id, encode_utxo_id
+
+
+def test_encode_decode_utxo_id():
+    assert decode_utxo_id(encode_utxo_id(1000, 12, 1)) == (1000, 12, 1)
+    assert decode_utxo_id(encode_utxo_id(1, 0, 0)) == (1, 0, 0)